@@ -0,0 +1,251 @@
+import atexit
+import fcntl
+import json
+import logging
+import os
+import queue
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+from flask import g, request
+
+from language import url_lang_code
+
+
+# --- JSON access log, written off the request path ---
+# after_request only builds a dict and puts it on a bounded queue (QueueHandler); a
+# QueueListener thread wakes up every ACCESS_LOG_FLUSH_INTERVAL seconds, turns what has
+# queued up into JSON lines and writes them ACCESS_LOG_BATCH_SIZE lines at a time. When the
+# queue is full the record is dropped and counted (gpa_access_log_dropped_total), the
+# request never waits for the disk.
+#
+# ACCESS_LOG_FILE rotates at ACCESS_LOG_MAX_BYTES (access.log.1 ... .ACCESS_LOG_BACKUP_COUNT).
+# Every gunicorn worker appends to the same file: a batch is written with one O_APPEND
+# write under an flock on <file>.lock, and a worker that finds the file rotated by another
+# one reopens it. Like /metrics, nothing is logged before start() (boot warm-up probes).
+#
+# Measure it: python -m benchmarks.access_log
+
+MAX_USER_AGENT = 256
+STOP_TIMEOUT = 5.0
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds')}
+        entry.update(record.access)
+        return json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+
+
+class DroppingQueueHandler(QueueHandler):
+    def __init__(self, log_queue, on_drop):
+        super().__init__(log_queue)
+        self.on_drop = on_drop
+
+    def prepare(self, record):
+        # Formatting is the listener's job, not the request's
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.on_drop()
+
+
+class BatchFileHandler(logging.Handler):
+    # Size-rotated file shared by several processes, written a batch at a time
+    def __init__(self, path, max_bytes, backup_count):
+        super().__init__()
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock_fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o644)
+        self._fd = None
+        self._open()
+
+    def _open(self):
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+
+    def _rotated_elsewhere(self):
+        try:
+            return os.stat(self.path).st_ino != os.fstat(self._fd).st_ino
+        except FileNotFoundError:
+            return True
+
+    def _rotate(self):
+        for number in range(self.backup_count - 1, 0, -1):
+            source = f'{self.path}.{number}'
+            if os.path.exists(source):
+                os.replace(source, f'{self.path}.{number + 1}')
+        if self.backup_count:
+            os.replace(self.path, f'{self.path}.1')
+        else:
+            os.truncate(self.path, 0)
+        self._open()
+
+    def emit(self, record):
+        self.emit_batch([record])
+
+    def emit_batch(self, records):
+        lines = []
+        for record in records:
+            try:
+                lines.append(self.format(record) + '\n')
+            except Exception:
+                self.handleError(record)
+        data = ''.join(lines).encode('utf-8')
+        if not data:
+            return
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            if self._rotated_elsewhere():
+                self._open()
+            size = os.fstat(self._fd).st_size
+            if self.max_bytes and size and size + len(data) > self.max_bytes:
+                self._rotate()
+            os.write(self._fd, data)
+        except OSError:
+            self.handleError(records[0])
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    def close(self):
+        for fd in (self._fd, self._lock_fd):
+            if fd is not None:
+                os.close(fd)
+        self._fd = self._lock_fd = None
+        super().close()
+
+
+class BatchQueueListener(QueueListener):
+    # QueueListener hands records to its handlers one by one; this one drains the queue
+    # and gives the handler the whole batch (one write, one lock per batch)
+    def __init__(self, log_queue, handler, batch_size, flush_interval):
+        super().__init__(log_queue, handler)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+
+    def _monitor(self):
+        # Wakes up once per flush interval, not once per record: every wake-up takes the
+        # GIL away from the request thread
+        handler = self.handlers[0]
+        stopping = False
+        while not stopping:
+            batch = [self.queue.get()]
+            if batch[0] is not self._sentinel:
+                time.sleep(self.flush_interval)
+            while True:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if self._sentinel in batch:
+                stopping = True
+                batch = [record for record in batch if record is not self._sentinel]
+            for start in range(0, len(batch), self.batch_size):
+                handler.emit_batch(batch[start:start + self.batch_size])
+
+    def enqueue_sentinel(self):
+        # put_nowait would fail on a full queue; the thread is draining it
+        self.queue.put(self._sentinel, timeout=STOP_TIMEOUT)
+
+
+class AccessLog:
+    def __init__(self, app=None):
+        self.app = None
+        self.logger = logging.getLogger('gpa.access')
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.listener = None
+        self.recording = False
+        self.dropped = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ACCESS_LOG_ENABLED', True)
+        app.config.setdefault('ACCESS_LOG_FILE', os.path.join(app.instance_path, 'logs', 'access.log'))
+        app.config.setdefault('ACCESS_LOG_MAX_BYTES', 50 * 1024 * 1024)
+        app.config.setdefault('ACCESS_LOG_BACKUP_COUNT', 5)
+        app.config.setdefault('ACCESS_LOG_QUEUE_SIZE', 10000)
+        app.config.setdefault('ACCESS_LOG_BATCH_SIZE', 500)
+        app.config.setdefault('ACCESS_LOG_FLUSH_INTERVAL', 0.5)
+        self.app = app
+        app.extensions['access_log'] = self
+        # Registered early (like the metrics timer) so redirect table answers are timed too
+        app.before_request(self._start_timer)
+        app.after_request(self._after_request)
+
+    def start(self):
+        config = self.app.config
+        if not config['ACCESS_LOG_ENABLED'] or self.recording:
+            return
+        self.recording = True
+        self._start_listener()
+        atexit.unregister(self.stop)
+        atexit.register(self.stop)
+
+    def _start_listener(self):
+        config = self.app.config
+        log_queue = queue.Queue(config['ACCESS_LOG_QUEUE_SIZE'])
+        handler = BatchFileHandler(config['ACCESS_LOG_FILE'], config['ACCESS_LOG_MAX_BYTES'],
+                                   config['ACCESS_LOG_BACKUP_COUNT'])
+        handler.setFormatter(JsonFormatter())
+        for old in self.logger.handlers[:]:
+            self.logger.removeHandler(old)
+        self.logger.addHandler(DroppingQueueHandler(log_queue, self._dropped))
+        self.listener = BatchQueueListener(log_queue, handler, config['ACCESS_LOG_BATCH_SIZE'],
+                                           config['ACCESS_LOG_FLUSH_INTERVAL'])
+        self.listener.start()
+
+    def after_fork(self):
+        # The listener thread stayed in the master; each worker gets its own
+        if self.recording:
+            self.dropped = 0
+            self._start_listener()
+
+    def stop(self):
+        # Writes what is still queued and stops logging (atexit, benchmarks)
+        self.recording = False
+        listener = self.listener
+        if listener is None or getattr(listener, '_thread', None) is None:
+            return
+        try:
+            listener.stop()
+        except queue.Full:
+            pass
+        listener.handlers[0].close()
+
+    def _dropped(self):
+        self.dropped += 1
+        metrics = self.app.extensions.get('metrics')
+        if metrics is not None and metrics.recording:
+            metrics.inc('gpa_access_log_dropped_total', ())
+
+    def _start_timer(self):
+        g.access_log_start = time.perf_counter()
+
+    def _after_request(self, response):
+        if not self.recording:
+            return response
+        start = g.get('access_log_start')
+        status = response.status_code
+        # makeRecord + handle instead of logger.info(): no caller lookup on the request path
+        logger = self.logger
+        logger.handle(logger.makeRecord(logger.name, logging.INFO, __file__, 0, 'access', None, None, extra={'access': {
+            'endpoint': request.endpoint or 'unmatched',
+            'lang_code': url_lang_code(),
+            'method': request.method,
+            'path': request.path,
+            'status': status,
+            'latency_ms': None if start is None else round((time.perf_counter() - start) * 1000, 2),
+            'bytes': response.content_length,
+            'location': response.headers.get('Location') if 300 <= status < 400 else None,
+            'user_agent': request.headers.get('User-Agent', '')[:MAX_USER_AGENT],
+        }}))
+        return response
@@ -1,21 +1,118 @@
-from flask import Flask, render_template, request, jsonify, url_for, redirect, send_from_directory, Blueprint, session, Response
+from flask import Flask, abort, request, jsonify, url_for, redirect, Blueprint, Response
 from datetime import datetime
+import json
+import math
+
+from access_log import AccessLog
+from assets import init_assets
+from batch_gpa import batch_gpa, non_finite
+from calculator_cache import CalculatorCache
+from compression import Compressor
+from course_io import FORMATS, CourseRowError, iter_courses, iter_export, request_format
+from course_store import create_course_store, get_client_token, set_client_token_cookie
+from freeze import init_freeze
+from grades import CONVERSIONS, GRADE_POINTS, SCALES, SGPA_SCALES, convert
+from grades import sgpa_to_cgpa as cgpa_from_sgpa_records  # sgpa_to_cgpa naam page view ka hai
+from i18n import I18n
+from images import init_images
+from language import get_lang_code, init_language, set_lang_cookie
+from metrics import Metrics
+from page_cache import PageCache
+from ratelimit import RateLimiter
+from planner import ALREADY_MET, FEASIBLE, TOO_HIGH, UNDEFINED, axis_size, grid_to_list, parse_axis, required_gpa_grid
+from profiler import Profiler
+from redirects import RedirectTable
+from sitemap import Sitemap, SitemapUrl
+from warmup import Warmup
 
 # Create a Flask app instance
 app = Flask(__name__)
 app.secret_key = 'your_secret_key_here' # Session ke liye secret key zaroori hai
+# FLASK_* env vars (e.g. FLASK_COURSE_STORE=sqlite) config override karte hain
+app.config.from_prefixed_env()
+app.config.setdefault('BATCH_GPA_MAX_TRANSCRIPTS', 100000)
+app.config.setdefault('BATCH_GPA_STREAM_THRESHOLD', 1000)
+app.config.setdefault('CONVERT_MAX_VALUES', 100000)
+app.config.setdefault('CUMULATIVE_GPA_MAX_TERMS', 1000)
+app.config.setdefault('GPA_PLAN_MAX_CELLS', 10000)
+app.config.setdefault('COURSE_BATCH_MAX_OPERATIONS', 1000)
 
-# Dummy data store (real project mein database use hoga)
-courses_data = [] # For Page 1
+# Har client (anonymous token) ke courses alag store hote hain - memory (LRU+TTL) ya sqlite
+course_store = create_course_store(app)
+
+# /metrics - latency histograms waghera; sab se pehle taake redirect table wali requests bhi time hon
+metrics = Metrics(app)
+
+# Har request ki JSON line (endpoint, lang_code, status, latency, bytes, redirect target);
+# queue + background thread likhta hai, request disk ka wait nahi karti
+access_log = AccessLog(app)
+
+# Templates ka precompile + disk bytecode cache (opt-in) aur /readyz
+warmup = Warmup(app)
 
 # Supported languages list
 SUPPORTED_LANGS = ['en', 'ar', 'es', 'de', 'pt', 'ru', 'fr', 'it', 'tr']
 
 # --- Helper function to get correct template name ---
 def get_template_name(base_path, lang_code):
-    if lang_code == 'en':
-        return f'{base_path}.html'
-    return f'{base_path}_{lang_code}.html'
+    # Migrated page: ek hi template, text translations/ ke catalogs se (i18n.py).
+    # Jo _<lang>.html copy abhi migrate nahi hui, wo file hi serve hoti hai
+    return i18n.template_name(base_path, lang_code)
+
+# --- Page templates (lang_routes endpoint name -> base template path) ---
+PAGE_TEMPLATES = {
+    'index': 'home/index',
+    'gpa_calculator': 'gpacalculator/gpa-calculator',
+    'final_grade_calculator': 'finalgrade/finalgradecalculator',
+    'prior_semester_gpa': 'prior-semester-gpa/prior-semester-gpa',
+    'highschool_gpa': 'highschool/highschool',
+    'grade_calculator': 'gradecalculator/gradecalculator',
+    'gpa_planning': 'gpaplan/gpa-planning-calculator',
+    'semester_grade_calculator': 'samesterGradeCalcuator/samesterGradecalculator',
+    'ez_grader': 'ez/ez',
+    'middle_school_gpa_calculator': 'middleSchool/middleSchool',
+    'sgpa_to_cgpa': 'sgpa_to_gpa/sgpatogpa',
+    'sgpa_to_percentage': 'sgpatopercentage/sgpatopercentage',
+}
+
+# gettext catalogs + `flask i18n migrate` (per-language copies -> ek template), ar ke liye RTL
+i18n = I18n(app, SUPPORTED_LANGS, PAGE_TEMPLATES.values())
+
+# Minified + fingerprinted CSS/JS (static/dist), url_for('static', ...) khud sahi file deta hai
+init_assets(app)
+
+# static/img ke AVIF/WebP variants + {{ picture(...) }} helper (srcset, width/height, lazy)
+init_images(app)
+
+# Legacy/trailing-slash URLs ek hi 301 mein final page par (startup pe compile hota hai)
+redirect_table = RedirectTable(app)
+
+# Language URL prefix / preference cookie / Accept-Language se decide hoti hai, session se nahi
+init_language(app, SUPPORTED_LANGS)
+
+# gzip/brotli + HTML minify; har page ka compressed version ETag ke hisaab se cache hota hai
+compressor = Compressor(app)
+
+# Rendered pages are kept in memory, har request pe Jinja nahi chalta
+page_cache = PageCache(app)
+
+# Pure calculator APIs ke GET forms: ETag inputs se, answer LRU mein
+calculator_cache = CalculatorCache(app)
+
+# /sitemap.xml routes se generate hota hai (neeche sitemap_urls), memory mein gzip ke saath
+sitemap = Sitemap(app)
+
+# Per-client token buckets + load shedding, routing se pehle (WSGI middleware); gunicorn
+# worker start hone par chalu hota hai, dev server / test client pe nahi
+rate_limiter = RateLimiter(app)
+
+# Kuch requests (PROFILE_SAMPLE_RATE ya signed X-Profile header) cProfile ke saath,
+# instance/profiles/<endpoint>/<lang_code>/ mein; `flask profile merge` flamegraph stacks banata hai
+profiler = Profiler(app)
+
+def render_page(page, lang_code):
+    template_name = get_template_name(PAGE_TEMPLATES[page], lang_code)
+    return page_cache.response(template_name, lang_code=lang_code)
 
 # --- Blueprints for better organization ---
 lang_routes = Blueprint('lang_routes', __name__, url_prefix='/<lang_code>')
@@ -29,27 +126,29 @@ redirect_routes = Blueprint('redirect_routes', __name__)
 def check_lang_code():
     lang_code = request.view_args.get('lang_code')
     if lang_code not in SUPPORTED_LANGS:
-        return "Language not supported", 404
+        # /<kuch bhi> bhi unknown URL hai, 404 wala budget
+        return rate_limiter.limit('not_found') or ("Language not supported", 404)
 
 # Home page route for ENGLISH (no lang_code in URL)
 @app.route('/', strict_slashes=False)
 def home():
-    template_name = get_template_name('home/index', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('index', 'en')
 
 # Home page route for other languages (with lang_code in URL)
 @lang_routes.route('/', strict_slashes=False)
 def index(lang_code):
-    template_name = get_template_name('home/index', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('index', lang_code)
 
 # --- NEW 404 Error Handler ---
 @app.errorhandler(404)
 def page_not_found(error):
-    # Session se current language code lein, agar na milay to 'en' default rakhein
-    lang_code = session.get('lang_code', 'en')
+    # Random URLs try karne wale bots ka alag budget; khatam ho to redirect ki jagah 429
+    limited = rate_limiter.limit('not_found')
+    if limited is not None:
+        return limited
+
+    # URL prefix, preference cookie ya Accept-Language se language lein, warna 'en'
+    lang_code = get_lang_code()
     
     if lang_code == 'en':
         # English home page
@@ -62,230 +161,232 @@ def page_not_found(error):
 
 @app.route('/set-language/<lang_code>', strict_slashes=False)
 def set_language(lang_code):
-    if lang_code in SUPPORTED_LANGS:
-        session['lang_code'] = lang_code
     redirect_to = request.args.get('redirect_to')
     if redirect_to:
         if lang_code == 'en':
             # Remove /en from path if it exists
-            return redirect(redirect_to.replace('/en/', '/') if redirect_to.startswith('/en/') else redirect_to)
-        return redirect(f'/{lang_code}{redirect_to}')
-    return redirect(url_for('home'))
+            response = redirect(redirect_to.replace('/en/', '/') if redirect_to.startswith('/en/') else redirect_to)
+        else:
+            response = redirect(f'/{lang_code}{redirect_to}')
+    else:
+        response = redirect(url_for('home'))
+    # Sirf yahi route language preference cookie likhta hai
+    if lang_code in SUPPORTED_LANGS:
+        set_lang_cookie(response, lang_code)
+    return response
 
 # GPA Calculator route for English (no lang_code in URL)
 @app.route('/gpa-calculator', strict_slashes=False)
 def gpa_calculator_en():
-    template_name = get_template_name('gpacalculator/gpa-calculator', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('gpa_calculator', 'en')
 
 # GPA Calculator route for all other languages (with lang_code in URL)
 @lang_routes.route('/gpa-calculator', strict_slashes=False)
 def gpa_calculator(lang_code):
-    template_name = get_template_name('gpacalculator/gpa-calculator', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('gpa_calculator', lang_code)
 
 @app.route('/final-grade-calculator', strict_slashes=False)
 def final_grade_calculator_en():
-    template_name = get_template_name('finalgrade/finalgradecalculator', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('final_grade_calculator', 'en')
 
 @lang_routes.route('/final-grade-calculator', strict_slashes=False)
 def final_grade_calculator(lang_code):
-    template_name = get_template_name('finalgrade/finalgradecalculator', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('final_grade_calculator', lang_code)
     
 # --- Naye routes yahan add kiye gaye hain taake English ka URL theek ho ---
 @app.route('/prior-semester-gpa', strict_slashes=False)
 def prior_semester_gpa_en():
-    template_name = get_template_name('prior-semester-gpa/prior-semester-gpa', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('prior_semester_gpa', 'en')
 
 @lang_routes.route('/prior-semester-gpa', strict_slashes=False)
 def prior_semester_gpa(lang_code):
-    template_name = get_template_name('prior-semester-gpa/prior-semester-gpa', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('prior_semester_gpa', lang_code)
 
 @app.route('/highschool-gpa', strict_slashes=False)
 def highschool_gpa_en():
-    template_name = get_template_name('highschool/highschool', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('highschool_gpa', 'en')
 
 @lang_routes.route('/highschool-gpa', strict_slashes=False)
 def highschool_gpa(lang_code):
-    template_name = get_template_name('highschool/highschool', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('highschool_gpa', lang_code)
 
 @app.route('/grade-calculator', strict_slashes=False)
 def grade_calculator_en():
-    template_name = get_template_name('gradecalculator/gradecalculator', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('grade_calculator', 'en')
 
 @lang_routes.route('/grade-calculator', strict_slashes=False)
 def grade_calculator(lang_code):
-    template_name = get_template_name('gradecalculator/gradecalculator', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('grade_calculator', lang_code)
     
 @app.route('/gpa-planning', strict_slashes=False)
 def gpa_planning_en():
-    template_name = get_template_name('gpaplan/gpa-planning-calculator', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('gpa_planning', 'en')
     
 @lang_routes.route('/gpa-planning', strict_slashes=False)
 def gpa_planning(lang_code):
-    template_name = get_template_name('gpaplan/gpa-planning-calculator', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('gpa_planning', lang_code)
 
 # --- New routes for Semester Grade Calculator ---
 @app.route('/semester-grade-calculator', strict_slashes=False)
 def semester_grade_calculator_en():
-    template_name = get_template_name('samesterGradeCalcuator/samesterGradecalculator', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('semester_grade_calculator', 'en')
 
 @lang_routes.route('/semester-grade-calculator', strict_slashes=False)
 def semester_grade_calculator(lang_code):
-    template_name = get_template_name('samesterGradeCalcuator/samesterGradecalculator', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('semester_grade_calculator', lang_code)
     
 # --- New routes for Ez-Grader ---
 @app.route('/ez-grader', strict_slashes=False)
 def ez_grader_en():
-    template_name = get_template_name('ez/ez', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('ez_grader', 'en')
 
 @lang_routes.route('/ez-grader', strict_slashes=False)
 def ez_grader(lang_code):
-    template_name = get_template_name('ez/ez', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('ez_grader', lang_code)
 
 # --- NEW ROUTES FOR MIDDLE SCHOOL GPA CALCULATOR ---
 @app.route('/middle-school-gpa-calculator', strict_slashes=False)
 def middle_school_gpa_calculator_en():
-    template_name = get_template_name('middleSchool/middleSchool', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('middle_school_gpa_calculator', 'en')
 
 @lang_routes.route('/middle-school-gpa-calculator', strict_slashes=False)
 def middle_school_gpa_calculator(lang_code):
-    template_name = get_template_name('middleSchool/middleSchool', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('middle_school_gpa_calculator', lang_code)
 
 # --- NEW ROUTES FOR SGPA to CGPA Converter ---
 @app.route('/sgpa-to-cgpa-calculator', strict_slashes=False)
 def sgpa_to_cgpa_en():
-    template_name = get_template_name('sgpa_to_gpa/sgpatogpa', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('sgpa_to_cgpa', 'en')
 
 @lang_routes.route('/sgpa-to-cgpa-calculator', strict_slashes=False)
 def sgpa_to_cgpa(lang_code):
-    template_name = get_template_name('sgpa_to_gpa/sgpatogpa', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
+    return render_page('sgpa_to_cgpa', lang_code)
     
 # --- NEW ROUTES FOR SGPA to PERCENTAGE Converter ---
 @app.route('/sgpa-to-percentage-calculator', strict_slashes=False)
 def sgpa_to_percentage_en():
-    template_name = get_template_name('sgpatopercentage/sgpatopercentage', 'en')
-    session['lang_code'] = 'en'
-    return render_template(template_name, lang_code='en')
+    return render_page('sgpa_to_percentage', 'en')
 
 @lang_routes.route('/sgpa-to-percentage-calculator', strict_slashes=False)
 def sgpa_to_percentage(lang_code):
-    template_name = get_template_name('sgpatopercentage/sgpatopercentage', lang_code)
-    session['lang_code'] = lang_code
-    return render_template(template_name, lang_code=lang_code)
-    
-@app.route('/sitemap.xml', strict_slashes=False)
-def sitemap():
-    return send_from_directory(app.root_path, 'sitemap.xml')
+    return render_page('sgpa_to_percentage', lang_code)
+
+# --- Sitemap ---
+# Purani hand-made sitemap.xml wali priorities; baaki pages 0.8
+SITEMAP_PRIORITIES = {
+    'index': 1.0,
+    'final_grade_calculator': 0.64,
+    'prior_semester_gpa': 0.64,
+    'semester_grade_calculator': 0.64,
+}
+
+def page_path(page, lang_code):
+    if lang_code == 'en':
+        return url_for('home' if page == 'index' else f'{page}_en')
+    # Canonical links mein language home '/ar' hai, '/ar/' nahi
+    path = url_for(f'lang_routes.{page}', lang_code=lang_code)
+    return path.rstrip('/')
+
+@sitemap.source
+def sitemap_urls():
+    for page, base_path in PAGE_TEMPLATES.items():
+        alternates = {lang_code: page_path(page, lang_code) for lang_code in SUPPORTED_LANGS}
+        alternates['x-default'] = alternates['en']
+        for lang_code in SUPPORTED_LANGS:
+            yield SitemapUrl(alternates[lang_code], get_template_name(base_path, lang_code),
+                             alternates, SITEMAP_PRIORITIES.get(page, 0.8))
+    # Blogs yahan nahi; jin pages ke template mein robots 'noindex' hai unhein Sitemap
+    # khud nikal deta hai
+    for endpoint, template_name in STATIC_PAGE_TEMPLATES.items():
+        yield SitemapUrl(url_for(endpoint), template_name)
 
 # --- Blog Routes (static) ---
+BLOG_TEMPLATES = {
+    'how-to-improve-your-gpa-effectively': 'blogs/gpa_blog.html',
+    'understanding-different-grading-scales': 'blogs/final_gpa_blog.html',
+    'achieving-your-target-gpa-guide': 'blogs/target_gpa_blog.html'
+}
+
 @blog_routes.route('/', strict_slashes=False)
 def blog_index():
     # Blogs pages mein 'lang_code' pass karne ki zaroorat nahi hai
     # kyunki inki translations nahi hain.
-    lang_code = session.get('lang_code', 'en')
-    return render_template('blogs/blog_index.html', lang_code=lang_code)
+    lang_code = get_lang_code()
+    return page_cache.response('blogs/blog_index.html', lang_code=lang_code)
 
 @blog_routes.route('/<slug>', strict_slashes=False)
 def blog_post(slug):
-    lang_code = session.get('lang_code', 'en')
-    blog_templates = {
-        'how-to-improve-your-gpa-effectively': 'blogs/gpa_blog.html',
-        'understanding-different-grading-scales': 'blogs/final_gpa_blog.html',
-        'achieving-your-target-gpa-guide': 'blogs/target_gpa_blog.html'
-    }
-    
-    template_to_render = blog_templates.get(slug)
+    lang_code = get_lang_code()
+    template_to_render = BLOG_TEMPLATES.get(slug)
     
     if template_to_render:
-        return render_template(template_to_render, slug=slug, lang_code=lang_code)
+        return page_cache.response(template_to_render, slug=slug, lang_code=lang_code)
     else:
         return "Blog Post Not Found", 404
 
 # --- Other Static Pages ---
+STATIC_PAGE_TEMPLATES = {
+    'static_pages.privacy_policy': 'pages/privacy-policy.html',
+    'static_pages.terms_conditions': 'pages/terms-conditions.html',
+    'static_pages.about_us': 'pages/About-us.html',
+    'static_pages.contact': 'pages/Contact.html',
+}
+
 @static_pages.route('/privacy-policy', strict_slashes=False)
 def privacy_policy():
-    lang_code = session.get('lang_code', 'en')
-    return render_template('pages/privacy-policy.html', lang_code=lang_code)
+    lang_code = get_lang_code()
+    return page_cache.response(STATIC_PAGE_TEMPLATES['static_pages.privacy_policy'], lang_code=lang_code)
 
 @static_pages.route('/terms-conditions', strict_slashes=False)
 def terms_conditions():
-    lang_code = session.get('lang_code', 'en')
-    return render_template('pages/terms-conditions.html', lang_code=lang_code)
+    lang_code = get_lang_code()
+    return page_cache.response(STATIC_PAGE_TEMPLATES['static_pages.terms_conditions'], lang_code=lang_code)
 
 @static_pages.route('/about-us', strict_slashes=False)
 def about_us():
-    lang_code = session.get('lang_code', 'en')
-    return render_template('pages/About-us.html', lang_code=lang_code)
+    lang_code = get_lang_code()
+    return page_cache.response(STATIC_PAGE_TEMPLATES['static_pages.about_us'], lang_code=lang_code)
 
 @static_pages.route('/contact', strict_slashes=False)
 def contact():
-    # Yahan 'lang_code' ko session se le kar pass kiya gaya hai
-    lang_code = session.get('lang_code', 'en')
-    return render_template('pages/Contact.html', lang_code=lang_code)
+    # Yahan 'lang_code' ko cookie/Accept-Language se le kar pass kiya gaya hai
+    lang_code = get_lang_code()
+    return page_cache.response(STATIC_PAGE_TEMPLATES['static_pages.contact'], lang_code=lang_code)
 
 # --- API Endpoints ---
-def calculate_gpa_from_courses():
+def calculate_gpa_from_courses(courses):
     total_grade_points = 0
     total_credits = 0
-    grade_map = {
-        'A+': 4.0, 'A': 4.0, 'A-': 3.7,
-        'B+': 3.3, 'B': 3.0, 'B-': 2.7,
-        'C+': 2.3, 'C': 2.0, 'C-': 1.7,
-        'D+': 1.3, 'D': 1.0, 'D-': 0.7,
-        'F': 0.0
-    }
-    for course in courses_data:
-        if 'grade' in course and course['grade'] in grade_map and \
-           'credits' in course and isinstance(course['credits'], (int, float)):
-            grade_points = grade_map[course['grade']] * course['credits']
+    for course in courses:
+        # bool bhi int hai, lekin credits nahi (batch_gpa bhi skip karta hai)
+        if 'grade' in course and course['grade'] in GRADE_POINTS and \
+           'credits' in course and type(course['credits']) in (int, float):
+            grade_points = GRADE_POINTS[course['grade']] * course['credits']
             total_grade_points += grade_points
             total_credits += course['credits']
     if total_credits == 0:
         return 0.0
     return round(total_grade_points / total_credits, 2)
 
+# Full list by default; `delta` (query param ya JSON body) ho to sirf badli hui row wapas jati hai
+def course_response(collection, change):
+    data = request.get_json(silent=True) or {}
+    if request.args.get('delta') in ('1', 'true') or data.get('delta') is True:
+        return jsonify({'status': 'success', 'change': change, 'version': collection.version, 'currentGpa': collection.gpa})
+    return jsonify({'status': 'success', 'courses': collection.courses, 'version': collection.version, 'currentGpa': collection.gpa})
+
+@api_routes.after_request
+def add_client_token_cookie(response):
+    return set_client_token_cookie(response)
+
 @api_routes.route('/get_courses', methods=['GET'], strict_slashes=False)
 def get_courses():
-    return jsonify({'status': 'success', 'courses': courses_data, 'currentGpa': calculate_gpa_from_courses()})
+    collection = course_store.load(get_client_token())
+    response = jsonify({'status': 'success', 'courses': collection.courses, 'version': collection.version, 'currentGpa': collection.gpa})
+    response.set_etag(collection.etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 @api_routes.route('/add_course', methods=['POST'], strict_slashes=False)
 def add_course():
@@ -293,22 +394,30 @@ def add_course():
     course_name = data.get('courseName')
     credits = data.get('credits')
     grade = data.get('grade')
-    grade_map_keys = {'A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F'}
     
     if not course_name or not grade:
         return jsonify({'status': 'error', 'message': 'Course Name and Grade are required.'}), 400
     try:
         credits = float(credits)
+        if not math.isfinite(credits):
+            raise ValueError(credits)
         if credits <= 0:
             return jsonify({'status': 'error', 'message': 'Credits must be a positive number.'}), 400
     except (ValueError, TypeError):
         return jsonify({'status': 'error', 'message': 'Invalid Credits value.'}), 400
     
-    if grade not in grade_map_keys:
+    if not is_grade(grade):
         return jsonify({'status': 'error', 'message': 'Invalid Grade. Allowed grades are A+, A, A-, B+, B, B-', 'C+': 2.3, 'C': 2.0, 'C-': 1.7, 'D+': 1.3, 'D': 1.0, 'D-': 0.7, 'F': 0.0}), 400
-    courses_data.append({'name': course_name, 'credits': credits, 'grade': grade})
+
+    token = get_client_token()
+    collection = course_store.load(token)
+    if len(collection) >= app.config['MAX_COURSES_PER_CLIENT']:
+        return jsonify({'status': 'error', 'message': 'Course limit reached. Please remove a course first.'}), 400
+    course = {'name': course_name, 'credits': credits, 'grade': grade}
+    index = collection.add(course)
+    course_store.save(token, collection)
     
-    return jsonify({'status': 'success', 'courses': courses_data, 'currentGpa': calculate_gpa_from_courses()})
+    return course_response(collection, {'op': 'add', 'index': index, 'course': course})
 
 @api_routes.route('/update_course', methods=['POST'], strict_slashes=False)
 def update_course():
@@ -316,24 +425,31 @@ def update_course():
     index = data.get('index')
     new_credits = data.get('credits')
     new_grade = data.get('grade')
-    grade_map_keys = {'A+', 'A', 'A-', 'B+', 'B', 'B-', 'C+', 'C', 'C-', 'D+', 'D', 'D-', 'F'}
+    token = get_client_token()
+    collection = course_store.load(token)
     
-    if not (0 <= index < len(courses_data)):
+    if not isinstance(index, int) or not (0 <= index < len(collection)):
         return jsonify({'status': 'error', 'message': 'Course not found at specified index.'}), 404
     
     try:
+        changes = {}
         if new_credits is not None:
             new_credits = float(new_credits)
+            if not math.isfinite(new_credits):
+                raise ValueError(new_credits)
             if new_credits <= 0:
                 return jsonify({'status': 'error', 'message': 'Credits must be a positive number.'}), 400
-            courses_data[index]['credits'] = new_credits
+            changes['credits'] = new_credits
         
         if new_grade:
-            if new_grade not in grade_map_keys:
+            if new_grade not in GRADE_POINTS:
                 return jsonify({'status': 'error', 'message': 'Invalid Grade. Allowed grades are A+, A, A-, B+, B, B-', 'C+': 2.3, 'C': 2.0, 'C-': 1.7, 'D+': 1.3, 'D': 1.0, 'D-': 0.7, 'F': 0.0}), 400
-            courses_data[index]['grade'] = new_grade
+            changes['grade'] = new_grade
+
+        course = collection.update(index, **changes)
+        course_store.save(token, collection)
             
-        return jsonify({'status': 'success', 'courses': courses_data, 'currentGpa': calculate_gpa_from_courses()})
+        return course_response(collection, {'op': 'update', 'index': index, 'course': course})
     except (ValueError, TypeError):
         return jsonify({'status': 'error', 'message': 'Invalid data for update.'}), 400
     except Exception as e:
@@ -343,33 +459,194 @@ def update_course():
 def delete_course():
     data = request.json
     index = data.get('index')
+    token = get_client_token()
+    collection = course_store.load(token)
     
-    if not (0 <= index < len(courses_data)):
+    if not isinstance(index, int) or not (0 <= index < len(collection)):
         return jsonify({'status': 'error', 'message': 'Course not found at specified index.'}), 404
     
-    del courses_data[index]
+    collection.delete(index)
+    course_store.save(token, collection)
     
-    return jsonify({'status': 'success', 'courses': courses_data, 'currentGpa': calculate_gpa_from_courses()})
+    return course_response(collection, {'op': 'delete', 'index': index})
 
 @api_routes.route('/reset_courses', methods=['POST'], strict_slashes=False)
 def reset_courses():
-    global courses_data
-    courses_data = []
-    return jsonify({'status': 'success', 'message': 'All courses cleared.', 'currentGpa': 0.0})
+    # Delete ki jagah clear, taake version (aur ETag) aage hi barhta rahe
+    token = get_client_token()
+    collection = course_store.load(token)
+    collection.clear()
+    course_store.save(token, collection)
+    return jsonify({'status': 'success', 'message': 'All courses cleared.', 'version': collection.version, 'currentGpa': 0.0})
+
+# --- Batch course changes (ek request, sab ya kuch nahi) ---
+# {"operations": [{"op": "add", "courseName", "credits", "grade"},
+#                 {"op": "update", "index", "credits"?, "grade"?},
+#                 {"op": "delete", "index"}, ...], "delta": true?}
+# Operations order mein chalti hain, har index us waqt ki list par (JSON Patch jaisa).
+# Pehle saari validate hoti hain; ek bhi ghalat ho to kuch save nahi hota aur error
+# mein uska `operation` number aata hai. If-Match (get_courses ka ETag) do to beech mein
+# kisi aur ne list badli ho tou 412, taake index kisi aur row par na lage.
+def parse_course_credits(value):
+    try:
+        credits = float(value)
+    except (ValueError, TypeError, OverflowError):
+        return None, 'Invalid Credits value.'
+    # float() 'inf', 'nan' aur '1e309' bhi le leta hai
+    if not math.isfinite(credits):
+        return None, 'Invalid Credits value.'
+    if not credits > 0:
+        return None, 'Credits must be a positive number.'
+    return credits, None
+
+def is_grade(value):
+    # list/dict grade par `in GRADE_POINTS` TypeError deta hai (unhashable)
+    return isinstance(value, str) and value in GRADE_POINTS
+
+def apply_course_operation(collection, operation):
+    # -> (change, None) ya (None, (message, status)); collection working copy hai
+    op = operation.get('op') if isinstance(operation, dict) else None
+    if op == 'add':
+        if not operation.get('courseName') or not operation.get('grade'):
+            return None, ('Course Name and Grade are required.', 400)
+        if not isinstance(operation['courseName'], str):
+            return None, ('Course Name must be text.', 400)
+        credits, error = parse_course_credits(operation.get('credits'))
+        if error:
+            return None, (error, 400)
+        if not is_grade(operation['grade']):
+            return None, ('Invalid Grade.', 400)
+        if len(collection) >= app.config['MAX_COURSES_PER_CLIENT']:
+            return None, ('Course limit reached. Please remove a course first.', 400)
+        course = {'name': operation['courseName'], 'credits': credits, 'grade': operation['grade']}
+        return {'op': 'add', 'index': collection.add(course), 'course': course}, None
+    if op not in ('update', 'delete'):
+        return None, ('Unknown operation. Use add, update or delete.', 400)
+
+    index = operation.get('index')
+    if not isinstance(index, int) or isinstance(index, bool) or not (0 <= index < len(collection)):
+        return None, ('Course not found at specified index.', 404)
+    if op == 'delete':
+        collection.delete(index)
+        return {'op': 'delete', 'index': index}, None
+    changes = {}
+    if operation.get('credits') is not None:
+        changes['credits'], error = parse_course_credits(operation['credits'])
+        if error:
+            return None, (error, 400)
+    if operation.get('grade'):
+        if not is_grade(operation['grade']):
+            return None, ('Invalid Grade.', 400)
+        changes['grade'] = operation['grade']
+    return {'op': 'update', 'index': index, 'course': collection.update(index, **changes)}, None
+
+COURSE_BATCH_ATTEMPTS = 3
+
+@api_routes.route('/batch_courses', methods=['POST'], strict_slashes=False)
+def batch_courses():
+    data = request.get_json(silent=True)
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'status': 'error', 'message': 'operations must be a non-empty list.'}), 400
+    if len(operations) > app.config['COURSE_BATCH_MAX_OPERATIONS']:
+        return jsonify({'status': 'error', 'message': f"At most {app.config['COURSE_BATCH_MAX_OPERATIONS']} operations per request."}), 413
+
+    token = get_client_token()
+    # Save tabhi hota hai jab store mein abhi bhi wahi list ho jis par batch chala (doosra
+    # worker/process beech mein likh de to dobara load); If-Match ho to dusri baar 412
+    for _ in range(COURSE_BATCH_ATTEMPTS):
+        stored = course_store.load(token)
+        if request.if_match and not request.if_match.contains(stored.etag):
+            return jsonify({'status': 'error', 'message': 'Courses changed since they were loaded.', 'version': stored.version}), 412
+
+        # memory store live object deta hai, is liye version abhi note kar lo
+        base = (stored.generation, stored.version)
+        collection = stored.copy()
+        changes = []
+        for number, operation in enumerate(operations):
+            change, error = apply_course_operation(collection, operation)
+            if error:
+                message, status = error
+                return jsonify({'status': 'error', 'message': message, 'operation': number}), status
+            changes.append(change)
+        if course_store.save(token, collection, base=base):
+            break
+    else:
+        return jsonify({'status': 'error', 'message': 'Courses changed since they were loaded.', 'version': stored.version}), 412
+
+    if request.args.get('delta') in ('1', 'true') or data.get('delta') is True:
+        response = jsonify({'status': 'success', 'changes': changes, 'version': collection.version, 'currentGpa': collection.gpa})
+    else:
+        response = jsonify({'status': 'success', 'courses': collection.courses, 'version': collection.version, 'currentGpa': collection.gpa})
+    response.set_etag(collection.etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
+
+# --- Transcript import/export (CSV ya NDJSON, streaming) ---
+@api_routes.route('/import_courses', methods=['POST'], strict_slashes=False)
+def import_courses():
+    fmt = request_format(request)
+    if fmt is None:
+        return jsonify({'status': 'error', 'message': 'Unsupported format. Use format=csv or format=ndjson.'}), 415
+
+    token = get_client_token()
+    collection = course_store.load(token)
+    replace = request.args.get('mode') == 'replace'
+    limit = app.config['MAX_COURSES_PER_CLIENT'] - (0 if replace else len(collection))
+    try:
+        # Pehle saari rows validate, phir ek saath apply - ghalat file se aadha import nahi hota
+        courses = list(iter_courses(request.stream, fmt, limit))
+    except CourseRowError as e:
+        return jsonify({'status': 'error', 'message': str(e), 'line': e.line}), 400
+    except UnicodeDecodeError:
+        return jsonify({'status': 'error', 'message': 'File must be UTF-8 encoded.'}), 400
+
+    if replace:
+        collection.clear()
+    for course in courses:
+        collection.add(course)
+    course_store.save(token, collection)
+    return jsonify({'status': 'success', 'imported': len(courses), 'version': collection.version, 'currentGpa': collection.gpa})
+
+@api_routes.route('/export_courses', methods=['GET'], strict_slashes=False)
+def export_courses():
+    fmt = request_format(request) or 'csv'
+    collection = course_store.load(get_client_token())
+    response = Response(iter_export(list(collection.courses), fmt), mimetype=FORMATS[fmt])
+    response.headers['Content-Disposition'] = f'attachment; filename=courses.{fmt}'
+    return response
 
 # --- API Endpoints for Page 2 (Prior Semester / Final GPA Calculator) ---
-@api_routes.route('/calculate_combined_gpa', methods=['POST'], strict_slashes=False)
-def calculate_combined_gpa():
-    data = request.json
+# float() 'nan', 'inf' aur '1e309' bhi le leta hai, jo jsonify mein NaN/Infinity (ghalat
+# JSON) ban jaate hain; ValueError wahi "Invalid input" error deta hai jo baqi ghalat input ko
+def finite_float(value):
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError(value)
+    return number
+
+# Combined aur multi-term CGPA dono isi se validate karte hain
+def credit_gpa_error(credits, gpas):
+    if not all(math.isfinite(v) for v in (*credits, *gpas)):
+        return 'Invalid input: Please provide valid numbers.'
+    if any(c < 0 for c in credits) or any(g < 0 for g in gpas):
+        return 'All credit and GPA values must be non-negative.'
+    if any(g > 4.0 for g in gpas):
+        return 'GPA cannot exceed 4.0.'
+    return None
+
+COMBINED_GPA_PARAMS = ('oldTotalCredits', 'oldGpa', 'newSemesterCredits', 'newSemesterGpa')
+
+def combined_gpa_result(data):
     try:
-        old_total_credits = float(data.get('oldTotalCredits'))
-        old_gpa = float(data.get('oldGpa'))
-        new_semester_credits = float(data.get('newSemesterCredits'))
-        new_semester_gpa = float(data.get('newSemesterGpa'))
-        if old_total_credits < 0 or old_gpa < 0 or new_semester_credits < 0 or new_semester_gpa < 0:
-            return jsonify({'status': 'error', 'message': 'All credit and GPA values must be non-negative.'}), 400
-        if old_gpa > 4.0 or new_semester_gpa > 4.0:
-            return jsonify({'status': 'error', 'message': 'GPA cannot exceed 4.0.'}), 400
+        old_total_credits = finite_float(data.get('oldTotalCredits'))
+        old_gpa = finite_float(data.get('oldGpa'))
+        new_semester_credits = finite_float(data.get('newSemesterCredits'))
+        new_semester_gpa = finite_float(data.get('newSemesterGpa'))
+        error = credit_gpa_error([old_total_credits, new_semester_credits], [old_gpa, new_semester_gpa])
+        if error:
+            return {'status': 'error', 'message': error}, 400
         old_grade_points = old_total_credits * old_gpa
         new_grade_points = new_semester_credits * new_semester_gpa
         
@@ -377,50 +654,147 @@ def calculate_combined_gpa():
         combined_total_grade_points = old_grade_points + new_grade_points
         
         combined_gpa = round(combined_total_grade_points / combined_total_credits, 2) if combined_total_credits > 0 else 0.0
+        if not math.isfinite(combined_gpa):
+            raise OverflowError(combined_gpa)
         
-        return jsonify({'status': 'success', 'combinedGpa': combined_gpa})
-    except (ValueError, TypeError):
-        return jsonify({'status': 'error', 'message': 'Invalid input: Please provide valid numbers.'}), 400
+        return {'status': 'success', 'combinedGpa': combined_gpa}, 200
+    except (ValueError, TypeError, OverflowError):
+        return {'status': 'error', 'message': 'Invalid input: Please provide valid numbers.'}, 400
     except Exception as e:
-        return jsonify({'status': 'error', 'message': f'An unexpected error occurred: {str(e)}'}), 500
+        return {'status': 'error', 'message': f'An unexpected error occurred: {str(e)}'}, 500
 
-@api_routes.route('/calculate_final_cumulative_gpa', methods=['POST'], strict_slashes=False)
-def calculate_final_cumulative_gpa():
-    data = request.json
+@api_routes.route('/calculate_combined_gpa', methods=['GET', 'POST'], strict_slashes=False)
+def calculate_combined_gpa():
+    if request.method == 'GET':
+        return calculator_cache.response('combined', COMBINED_GPA_PARAMS, combined_gpa_result)
+    payload, status = combined_gpa_result(request.json)
+    return jsonify(payload), status
+
+FINAL_CUMULATIVE_GPA_PARAMS = ('totalCredits', 'gpa')
+
+def final_cumulative_gpa_result(data):
     try:
-        total_credits = float(data.get('totalCredits'))
-        gpa = float(data.get('gpa'))
+        total_credits = finite_float(data.get('totalCredits'))
+        gpa = finite_float(data.get('gpa'))
         if total_credits < 0 or gpa < 0:
-            return jsonify({'status': 'error', 'message': 'Credits and GPA must be non-negative.'}), 400
+            return {'status': 'error', 'message': 'Credits and GPA must be non-negative.'}, 400
         if gpa > 4.0:
-            return jsonify({'status': 'error', 'message': 'GPA cannot exceed 4.0.'}), 400
+            return {'status': 'error', 'message': 'GPA cannot exceed 4.0.'}, 400
         final_gpa = round(gpa, 2)
-        return jsonify({'status': 'success', 'finalGpa': final_gpa})
+        return {'status': 'success', 'finalGpa': final_gpa}, 200
     except (ValueError, TypeError):
-        return jsonify({'status': 'error', 'message': 'Invalid input: Please provide valid numbers.'}), 400
+        return {'status': 'error', 'message': 'Invalid input: Please provide valid numbers.'}, 400
     except Exception as e:
-        return jsonify({'status': 'error', 'message': f'An unexpected error occurred: {str(e)}'}), 500
+        return {'status': 'error', 'message': f'An unexpected error occurred: {str(e)}'}, 500
+
+@api_routes.route('/calculate_final_cumulative_gpa', methods=['GET', 'POST'], strict_slashes=False)
+def calculate_final_cumulative_gpa():
+    if request.method == 'GET':
+        return calculator_cache.response('final', FINAL_CUMULATIVE_GPA_PARAMS, final_cumulative_gpa_result)
+    payload, status = final_cumulative_gpa_result(request.json)
+    return jsonify(payload), status
+
+# --- Multi-term CGPA: poori term history ek request mein, ek prefix-sum pass ---
+def parse_terms(terms):
+    credits = [finite_float(term['credits']) for term in terms]
+    gpas = [finite_float(term['gpa']) for term in terms]
+    return credits, gpas
+
+def apply_what_if(credits, gpas, overrides):
+    credits, gpas = list(credits), list(gpas)
+    for override in overrides:
+        term = override['term']
+        if type(term) is not int or not 0 <= term < len(credits):
+            raise IndexError(term)
+        if 'credits' in override:
+            credits[term] = finite_float(override['credits'])
+        if 'gpa' in override:
+            gpas[term] = finite_float(override['gpa'])
+    return credits, gpas
+
+def cumulative_series(credits, gpas, start_credits=0.0, start_gpa=0.0):
+    series = []
+    total_credits = start_credits
+    total_points = start_credits * start_gpa
+    for term_credits, term_gpa in zip(credits, gpas):
+        total_credits += term_credits
+        total_points += term_credits * term_gpa
+        # 1e308 jaise finite credits bhi jod kar inf ho jaate hain (NaN/Infinity ghalat JSON hai)
+        if not (math.isfinite(total_credits) and math.isfinite(total_points)):
+            raise OverflowError('credits too large')
+        series.append({
+            'credits': term_credits,
+            'gpa': term_gpa,
+            'cumulativeCredits': total_credits,
+            'cumulativeGpa': round(total_points / total_credits, 2) if total_credits > 0 else 0.0,
+        })
+    return series
+
+@api_routes.route('/calculate_cumulative_gpa', methods=['POST'], strict_slashes=False)
+def calculate_cumulative_gpa():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'status': 'error', 'message': 'Request body must be a JSON object.'}), 400
+    terms = data.get('terms')
+    overrides = data.get('whatIf') or []
+    if not isinstance(terms, list) or not all(isinstance(t, dict) for t in terms) \
+       or not isinstance(overrides, list) or not all(isinstance(o, dict) for o in overrides):
+        return jsonify({'status': 'error', 'message': 'terms (and whatIf) must be lists of objects.'}), 400
+    if len(terms) > app.config['CUMULATIVE_GPA_MAX_TERMS']:
+        return jsonify({'status': 'error', 'message': 'Too many terms in one request.'}), 413
+    try:
+        start_credits = finite_float(data.get('startCredits', 0))
+        start_gpa = finite_float(data.get('startGpa', 0))
+        credits, gpas = parse_terms(terms)
+        what_if_credits, what_if_gpas = apply_what_if(credits, gpas, overrides)
+    except (KeyError, ValueError, TypeError):
+        return jsonify({'status': 'error', 'message': 'Invalid input: every term needs numeric credits and gpa.'}), 400
+    except IndexError:
+        return jsonify({'status': 'error', 'message': 'whatIf term must be the index of an existing term.'}), 400
+
+    error = credit_gpa_error([start_credits] + credits + what_if_credits, [start_gpa] + gpas + what_if_gpas)
+    if error:
+        return jsonify({'status': 'error', 'message': error}), 400
+
+    try:
+        series = cumulative_series(credits, gpas, start_credits, start_gpa)
+        what_if = cumulative_series(what_if_credits, what_if_gpas, start_credits, start_gpa) if overrides else None
+    except OverflowError:
+        return jsonify({'status': 'error', 'message': 'Invalid input: credits are too large.'}), 400
+    result = {
+        'status': 'success',
+        'series': series,
+        'cumulativeGpa': series[-1]['cumulativeGpa'] if series else round(start_gpa, 2),
+    }
+    if overrides:
+        result['whatIf'] = {
+            'series': what_if,
+            'cumulativeGpa': what_if[-1]['cumulativeGpa'] if what_if else round(start_gpa, 2),
+        }
+    return jsonify(result)
 
 # --- API Endpoints for Page 3 (GPA Planning) ---
-@api_routes.route('/calculate_required_gpa', methods=['POST'], strict_slashes=False)
-def calculate_required_gpa():
-    data = request.json
+REQUIRED_GPA_PARAMS = ('goalGpa', 'currentGpa', 'currentTotalCredits', 'nextSemesterCredits')
+
+def required_gpa_result(data):
     try:
-        goal_gpa = float(data.get('goalGpa'))
-        current_gpa = float(data.get('currentGpa'))
-        current_total_credits = float(data.get('currentTotalCredits'))
-        next_semester_credits = float(data.get('nextSemesterCredits'))
+        goal_gpa = finite_float(data.get('goalGpa'))
+        current_gpa = finite_float(data.get('currentGpa'))
+        current_total_credits = finite_float(data.get('currentTotalCredits'))
+        next_semester_credits = finite_float(data.get('nextSemesterCredits'))
         
         if goal_gpa < 0 or current_gpa < 0 or current_total_credits < 0 or next_semester_credits <= 0:
-            return jsonify({'status': 'error', 'message': 'All credit and GPA values must be non-negative, and Next Semester Credits must be greater than zero.'}), 400
+            return {'status': 'error', 'message': 'All credit and GPA values must be non-negative, and Next Semester Credits must be greater than zero.'}, 400
         if goal_gpa > 4.0 or current_gpa > 4.0:
-            return jsonify({'status': 'error', 'message': 'GPA cannot exceed 4.0.'}), 400
+            return {'status': 'error', 'message': 'GPA cannot exceed 4.0.'}, 400
         desired_total_grade_points = (current_total_credits + next_semester_credits) * goal_gpa
         current_grade_points = current_total_credits * current_gpa
         
         required_grade_points_for_next_semester = desired_total_grade_points - current_grade_points
         
         required_gpa = round(required_grade_points_for_next_semester / next_semester_credits, 2)
+        if not math.isfinite(required_gpa):
+            raise OverflowError(required_gpa)
         
         message = ""
         if required_gpa > 4.0:
@@ -428,97 +802,171 @@ def calculate_required_gpa():
         elif required_gpa < 0.0:
             message = 'The required GPA is negative, meaning you can achieve your goal even with a lower GPA in the next semester.'
         
-        return jsonify({'status': 'success', 'requiredGpa': required_gpa, 'message': message})
-    except (ValueError, TypeError):
-        return jsonify({'status': 'error', 'message': 'Invalid input: Please provide valid numbers.'}), 400
+        return {'status': 'success', 'requiredGpa': required_gpa, 'message': message}, 200
+    except (ValueError, TypeError, OverflowError):
+        return {'status': 'error', 'message': 'Invalid input: Please provide valid numbers.'}, 400
     except Exception as e:
-        return jsonify({'status': 'error', 'message': f'An unexpected error occurred: {str(e)}'}), 500
+        return {'status': 'error', 'message': f'An unexpected error occurred: {str(e)}'}, 500
+
+@api_routes.route('/calculate_required_gpa', methods=['GET', 'POST'], strict_slashes=False)
+def calculate_required_gpa():
+    if request.method == 'GET':
+        return calculator_cache.response('required', REQUIRED_GPA_PARAMS, required_gpa_result)
+    payload, status = required_gpa_result(request.json)
+    return jsonify(payload), status
+
+# --- GPA planning grid: saare scenarios ek request mein ---
+@api_routes.route('/gpa_plan', methods=['POST'], strict_slashes=False)
+def gpa_plan():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'status': 'error', 'message': 'Request body must be a JSON object.'}), 400
+    try:
+        current_gpa = float(data.get('currentGpa'))
+        current_total_credits = float(data.get('currentTotalCredits'))
+        if not (math.isfinite(current_gpa) and math.isfinite(current_total_credits)):
+            return jsonify({'status': 'error', 'message': 'Invalid input: Please provide valid numbers.'}), 400
+        goal_axis = data.get('goalGpa')
+        credits_axis = data.get('nextSemesterCredits')
+        semesters_axis = data.get('semesters', [1])
+        cells = axis_size(goal_axis) * axis_size(credits_axis) * axis_size(semesters_axis)
+        if cells > app.config['GPA_PLAN_MAX_CELLS']:
+            return jsonify({'status': 'error', 'message': 'Too many scenarios in one request.'}), 413
+        goals = parse_axis(goal_axis, 0.0, 4.0)
+        credits = parse_axis(credits_axis, 0.0, float('inf'))
+        semesters = parse_axis(semesters_axis, 1, 100, integer=True)
+    except (KeyError, TypeError, OverflowError):
+        return jsonify({'status': 'error', 'message': 'Invalid input: Please provide valid numbers.'}), 400
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': f'Invalid input: {e}'}), 400
+
+    error = credit_gpa_error([current_total_credits], [current_gpa])
+    if error:
+        return jsonify({'status': 'error', 'message': error}), 400
+    if credits.min() <= 0:
+        return jsonify({'status': 'error', 'message': 'Next Semester Credits must be greater than zero.'}), 400
+
+    required, flags = required_gpa_grid(current_gpa, current_total_credits, goals, credits, semesters)
+    return jsonify({
+        'status': 'success',
+        # required[semester][goal][credits]; flags: 1 = above 4.0, -1 = goal already met, 0 = feasible,
+        # 2 = credits itne extreme ke number nikal hi nahi sakta (requiredGpa null)
+        'axes': {'semesters': semesters.astype(int).tolist(), 'goalGpa': goals.tolist(), 'nextSemesterCredits': credits.tolist()},
+        'requiredGpa': grid_to_list(required, flags),
+        'flags': flags.tolist(),
+        'flagCodes': {'tooHigh': TOO_HIGH, 'alreadyMet': ALREADY_MET, 'feasible': FEASIBLE, 'undefined': UNDEFINED},
+    })
+
+# --- Batch GPA (poori cohort ek request mein) ---
+def iter_batch_gpa_results(transcripts, gpa, total_credits):
+    for i, transcript in enumerate(transcripts):
+        yield {'id': transcript.get('id', i), 'gpa': round(float(gpa[i]), 2), 'totalCredits': float(total_credits[i])}
+
+@api_routes.route('/batch_gpa', methods=['POST'], strict_slashes=False)
+def batch_gpa_endpoint():
+    data = request.get_json(silent=True)
+    transcripts = data.get('transcripts') if isinstance(data, dict) else None
+    if not isinstance(transcripts, list) or not all(isinstance(t, dict) for t in transcripts):
+        return jsonify({'status': 'error', 'message': 'transcripts must be a list of objects.'}), 400
+    if len(transcripts) > app.config['BATCH_GPA_MAX_TRANSCRIPTS']:
+        return jsonify({'status': 'error', 'message': 'Too many transcripts in one request.'}), 413
+
+    try:
+        gpa, total_credits = batch_gpa(transcripts)
+    except (ValueError, TypeError, AttributeError):
+        return jsonify({'status': 'error', 'message': 'Invalid input: each transcript needs a courses list, or grades and credits lists of equal length.'}), 400
+    overflowed = non_finite(gpa, total_credits)
+    if overflowed.size:
+        return jsonify({'status': 'error', 'message': 'Invalid input: credits are too large.', 'transcript': int(overflowed[0])}), 400
+    results = iter_batch_gpa_results(transcripts, gpa, total_credits)
+
+    # Bare batches (ya Accept: application/x-ndjson) NDJSON mein stream hote hain
+    if len(transcripts) > app.config['BATCH_GPA_STREAM_THRESHOLD'] or \
+       request.accept_mimetypes.best == 'application/x-ndjson':
+        def generate():
+            for result in results:
+                yield json.dumps(result, separators=(',', ':')) + '\n'
+        return Response(generate(), mimetype='application/x-ndjson')
+    return jsonify({'status': 'success', 'results': list(results)})
+
+# --- Grading scales aur server-side conversions (poori array ek request mein) ---
+@api_routes.route('/grading_scales', methods=['GET'], strict_slashes=False)
+def grading_scales():
+    return jsonify({
+        'status': 'success',
+        'scales': [scale.describe() for scale in SCALES.values()],
+        'sgpaScales': SGPA_SCALES,
+        'conversions': [{'from': source, 'to': target} for source, target in CONVERSIONS],
+    })
+
+@api_routes.route('/convert', methods=['POST'], strict_slashes=False)
+def convert_values():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'status': 'error', 'message': 'Request body must be a JSON object.'}), 400
+    values = data.get('values')
+    bands = data.get('bands')
+    source, target = data.get('from'), data.get('to')
+    # List from/to unhashable hai, CONVERSIONS lookup TypeError deta
+    if not isinstance(source, str) or not isinstance(target, str) or (source, target) not in CONVERSIONS:
+        return jsonify({'status': 'error', 'message': 'Unknown conversion. See /api/grading_scales for the supported from/to pairs.'}), 400
+    if not isinstance(values, list):
+        return jsonify({'status': 'error', 'message': 'values must be a list.'}), 400
+    if len(values) > app.config['CONVERT_MAX_VALUES']:
+        return jsonify({'status': 'error', 'message': 'Too many values in one request.'}), 413
+    if bands is not None and (not isinstance(bands, dict) or
+                              not all(isinstance(v, (int, float)) for v in bands.values())):
+        return jsonify({'status': 'error', 'message': 'bands must map letter grades to minimum percentages.'}), 400
+    try:
+        results = convert(source, target, values, bands)
+    except TypeError:
+        return jsonify({'status': 'error', 'message': 'Invalid input: values must be numbers or letter grades.'}), 400
+    return jsonify({'status': 'success', 'results': results})
+
+@api_routes.route('/sgpa_to_cgpa', methods=['POST'], strict_slashes=False)
+def sgpa_to_cgpa_endpoint():
+    data = request.get_json(silent=True)
+    if not isinstance(data, dict):
+        return jsonify({'status': 'error', 'message': 'Request body must be a JSON object.'}), 400
+    records = data.get('records')
+    try:
+        scale = float(data.get('scale', 10.0))
+    except (ValueError, TypeError):
+        return jsonify({'status': 'error', 'message': 'Invalid scale.'}), 400
+    if scale not in SGPA_SCALES:
+        return jsonify({'status': 'error', 'message': 'Scale must be one of 4.0, 5.0 or 10.0.'}), 400
+    if not isinstance(records, list) or not all(isinstance(r, list) for r in records):
+        return jsonify({'status': 'error', 'message': 'records must be a list of SGPA lists.'}), 400
+    if sum(len(r) for r in records) > app.config['CONVERT_MAX_VALUES']:
+        return jsonify({'status': 'error', 'message': 'Too many values in one request.'}), 413
+
+    cgpa = cgpa_from_sgpa_records(records, scale)
+    result = {'status': 'success', 'cgpa': cgpa}
+    if scale == 10.0:
+        result['percentage'] = convert('sgpa10', 'percentage', cgpa)
+    return jsonify(result)
 
 # --- NEW GENERIC REDIRECT FOR TRAILING SLASH ---
+# Known pages aur legacy URLs ke slash variants redirect_table (before_request) pehle hi
+# ek hop mein handle kar leta hai. Yahan sirf baqi unknown paths aate hain.
 @redirect_routes.route('/<path:subpath>/', strict_slashes=False)
 def remove_trailing_slash_redirect(subpath):
-    # Check if the path (subpath) has a blueprint prefix, otherwise it is an app.route path.
-    # We try to rebuild the URL without the trailing slash.
-    # Note: url_for requires the function name. This is a generic approach.
-    
+    # strict_slashes=False ki wajah se ye rule bina slash wale URLs bhi match karta hai;
+    # un ko redirect karna loop banata tha (/ar/nope -> /ar/nope), is liye 404
+    if not request.path.endswith('/'):
+        abort(404)
+
     # Simple check for static files that should not be redirected
     if subpath.endswith(('.xml', '.txt')):
-        # XML or other file, do nothing, let it 404 or be handled elsewhere
-        # (Though sitemap.xml is handled by app.route, this is a safety check)
         return "Not Found", 404 
-    
-    # Try to determine the target route:
-    # 1. Check for known Blueprint prefixes (manual checking is safer for generic redirects)
-    if subpath.startswith('api/'):
-        target = subpath.rstrip('/')
-        return redirect(url_for('api_routes.' + target.replace('api/', '').replace('-', '_')), code=301)
-    elif subpath.startswith('blogs/'):
-        target_path = subpath.replace('blogs/', '').rstrip('/')
-        if not target_path: # /blogs/ -> /blogs
-             return redirect(url_for('blog_routes.blog_index'), code=301)
-        else: # /blogs/slug/ -> /blogs/slug
-             return redirect(url_for('blog_routes.blog_post', slug=target_path), code=301)
-    elif subpath in ['privacy-policy', 'terms-conditions', 'about-us', 'contact']:
-        return redirect(url_for('static_pages.' + subpath.replace('-', '_')), code=301)
-    
-    # 2. Check for language routes (/<lang_code>/path)
-    path_parts = subpath.split('/')
-    if len(path_parts) >= 2 and path_parts[0] in SUPPORTED_LANGS:
-        lang_code = path_parts[0]
-        # path is like 'lang_code/path-segment'. We need 'path-segment' for the function name.
-        route_name = path_parts[1].replace('-', '_')
-        
-        # Mapping known route names (to handle hyphenated paths like gpa-calculator)
-        route_map = {
-            'gpa_calculator': 'gpa_calculator',
-            'final_grade_calculator': 'final_grade_calculator',
-            'prior_semester_gpa': 'prior_semester_gpa',
-            'highschool_gpa': 'highschool_gpa',
-            'grade_calculator': 'grade_calculator',
-            'gpa_planning': 'gpa_planning',
-            'semester_grade_calculator': 'semester_grade_calculator',
-            'ez_grader': 'ez_grader',
-            'middle_school_gpa_calculator': 'middle_school_gpa_calculator',
-            'sgpa_to_cgpa_calculator': 'sgpa_to_cgpa',
-            'sgpa_to_percentage_calculator': 'sgpa_to_percentage'
-            # Add other lang_routes routes here
-        }
-        
-        target_func_name = route_map.get(route_name)
-        if target_func_name:
-            # lang_routes.index is for /<lang_code>/
-            return redirect(url_for('lang_routes.' + target_func_name, lang_code=lang_code), code=301)
-        elif not path_parts[1]: # /lang_code/ -> /lang_code
-            return redirect(url_for('lang_routes.index', lang_code=lang_code), code=301)
-
-    # 3. Check for app.route paths (no lang_code or static pages in the path)
-    # path is the same as subpath since it's not a blueprint
-    route_name = subpath.replace('-', '_')
-    app_route_map = {
-        'gpa_calculator': 'gpa_calculator_en',
-        'final_grade_calculator': 'final_grade_calculator_en',
-        'prior_semester_gpa': 'prior_semester_gpa_en',
-        'highschool_gpa': 'highschool_gpa_en',
-        'grade_calculator': 'grade_calculator_en',
-        'gpa_planning': 'gpa_planning_en',
-        'semester_grade_calculator': 'semester_grade_calculator_en',
-        'ez_grader': 'ez_grader_en',
-        'middle_school_gpa_calculator': 'middle_school_gpa_calculator_en',
-        'sgpa_to_cgpa_calculator': 'sgpa_to_cgpa_en',
-        'sgpa_to_percentage_calculator': 'sgpa_to_percentage_en',
-        # Add other app.route function names here
-    }
-    
-    target_func_name = app_route_map.get(route_name)
-    if target_func_name:
-        return redirect(url_for(target_func_name), code=301)
-    
-    # Fallback/Default for unhandled paths in redirect_routes (can be a 404 or a general redirect)
-    # To avoid redirecting known 301s which should go to a specific target without trailing slash,
-    # we can explicitly redirect to the path without the slash, which will be handled by another route.
-    # Example: /old-path/ -> /old-path. If /old-path already redirects, this is safe.
-    # The default behavior is simply redirecting to the same URL without the slash.
-    return redirect(f'/{subpath.rstrip("/")}', code=301)
+
+    # Unknown paths hi yahan aate hain, 404 wala budget lagta hai
+    limited = rate_limiter.limit('not_found')
+    if limited is not None:
+        return limited
+
+    # Slash hata kar redirect karein; agar woh path khud legacy redirect hai to seedha final target
+    return redirect(redirect_table.resolve(f'/{subpath.rstrip("/")}'), code=301)
 
 
 # --- Redirects (Old, broken links) ---
@@ -767,6 +1215,29 @@ app.register_blueprint(api_routes, url_prefix='/api')
 app.register_blueprint(blog_routes)
 app.register_blueprint(redirect_routes)
 
+# `flask freeze` - poori site static files mein export karne ke liye
+# (sitemap.parts build ke baad bharta hai; sitemap split na ho to khali)
+init_freeze(app, {'lang_code': SUPPORTED_LANGS, 'slug': list(BLOG_TEMPLATES), 'part': sitemap.parts})
+
+# Boot warm-up, is order mein:
+#   templates precompile (TEMPLATE_PRECOMPILE, opt-in)
+#   -> saare (page, language) pairs render kar ke page cache mein
+#   -> sitemap build (XML + gzip ek hi baar)
+#   -> redirect table compile (pages warm hone ke baad, saare chains single hop mein)
+#   -> metrics recording + access log shuru (boot ke test-client probes real traffic nahi hain)
+# Phir /readyz 200 deta hai. TEMPLATE_PRECOMPILE='background' ho to ye sab thread mein chalta hai.
+warmup.start(
+    lambda: page_cache.warm(
+        (get_template_name(base_path, lang_code), {'lang_code': lang_code})
+        for base_path in PAGE_TEMPLATES.values()
+        for lang_code in SUPPORTED_LANGS
+    ),
+    sitemap.build,
+    redirect_table.compile,
+    metrics.start,
+    access_log.start,
+)
+
 if __name__ == '__main__':
     # User ne request ki thi:
     # "Jab bhe head section bna'na ha <meta name="robots" content="noindex, nofollow"> Ye section hamesha same rehna chahiyay matlab no index or no nofollow or han agar mein nay asa code dia ha jis mein mein nay khud index of follow kia hua ha tous ko noindex or nofollow ni krna us ko index he rehnay dena ha lekin end pr lazmi bta dena ha mujy"
@@ -0,0 +1,324 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+import tempfile
+from collections import defaultdict
+
+import click
+from flask import current_app, request, send_from_directory
+from flask.cli import AppGroup
+
+try:
+    import brotli
+except ImportError:  # .br files are optional, gzip is always written
+    brotli = None
+
+
+# --- Asset pipeline ---
+# `flask assets extract`  moves <style>/<script> blocks that are byte-identical in two or
+#                         more templates into shared files under static/css/pages and
+#                         static/js/pages, and links them from the templates.
+# `flask assets build`    minifies every .css/.js under static/ into static/dist with a
+#                         content hash in the name, plus .gz/.br siblings and manifest.json.
+# At runtime url_for('static', filename='css/style.css') resolves to the fingerprinted
+# file via the manifest, and static/dist is served precompressed with an immutable
+# Cache-Control header.
+#
+# ASSETS_BUILD_ON_START rebuilds static/dist when a source changed. Only one process may
+# do that: under gunicorn it is the master (preloaded, or on_starting without preload),
+# the workers just read the manifest. A manifest that can't be parsed stops the app.
+
+DIST_DIR = 'dist'
+MANIFEST = 'manifest.json'
+SOURCE_DIRS = ('css', 'js')
+IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+
+INLINE_BLOCK_RE = re.compile(r'<(style|script)(\s[^>]*)?>(.*?)</\1>', re.S)
+JINJA_RE = re.compile(r'\{\{|\{%|\{#')
+
+assets_cli = AppGroup('assets', help='Extract, minify and fingerprint CSS/JS.')
+
+
+# --- Minifiers (conservative: they never reorder or rename anything) ---
+
+def minify_css(css):
+    out = []
+    i, n = 0, len(css)
+    while i < n:
+        c = css[i]
+        if css.startswith('/*', i):
+            end = css.find('*/', i + 2)
+            i = n if end < 0 else end + 2
+            continue
+        if c in '"\'':
+            j = i + 1
+            while j < n and css[j] != c:
+                j += 2 if css[j] == '\\' else 1
+            out.append(css[i:j + 1])
+            i = j + 1
+            continue
+        if c.isspace():
+            while i < n and css[i].isspace():
+                i += 1
+            # Whitespace next to { } ; , carries no meaning
+            if out and out[-1] not in '{};,' and i < n and css[i] not in '{};,':
+                out.append(' ')
+            continue
+        if c == '}' and out and out[-1] == ';':
+            out.pop()
+        out.append(c)
+        i += 1
+    return ''.join(out).strip()
+
+
+def _scan_js_line(line, state):
+    # Updates `state` ('code', 'template' or 'comment') across one line so that
+    # multi-line template literals and block comments are left alone
+    i, n = 0, len(line)
+    quote = None
+    while i < n:
+        c = line[i]
+        if state == 'template':
+            if c == '\\':
+                i += 1
+            elif c == '`':
+                state = 'code'
+        elif state == 'comment':
+            if line.startswith('*/', i):
+                state = 'code'
+                i += 1
+        elif quote:
+            if c == '\\':
+                i += 1
+            elif c == quote:
+                quote = None
+        elif c in '"\'':
+            quote = c
+        elif c == '`':
+            state = 'template'
+        elif line.startswith('//', i):
+            break
+        elif line.startswith('/*', i):
+            state = 'comment'
+            i += 1
+        i += 1
+    return state
+
+
+def minify_js(js):
+    # Drops indentation, blank lines and whole-line // comments; keeps line breaks (ASI)
+    lines = []
+    state = 'code'
+    for line in js.splitlines():
+        if state != 'code':
+            lines.append(line)
+        else:
+            stripped = line.strip()
+            if not stripped or stripped.startswith('//'):
+                continue
+            lines.append(stripped)
+        state = _scan_js_line(line, state)
+    return '\n'.join(lines)
+
+
+MINIFIERS = {'.css': minify_css, '.js': minify_js}
+
+
+# --- Build ---
+
+def _write(path, data):
+    # Temp file + os.replace: a reader (another worker, a request) sees the old file or
+    # the whole new one, never a half-written one
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+
+def _source_files(static_folder):
+    for source_dir in SOURCE_DIRS:
+        for root, _, files in os.walk(os.path.join(static_folder, source_dir)):
+            for name in sorted(files):
+                if os.path.splitext(name)[1] in MINIFIERS:
+                    path = os.path.join(root, name)
+                    yield os.path.relpath(path, static_folder).replace(os.sep, '/')
+
+
+def build_assets(static_folder):
+    dist = os.path.join(static_folder, DIST_DIR)
+    manifest = {}
+    for logical in _source_files(static_folder):
+        base, ext = os.path.splitext(logical)
+        with open(os.path.join(static_folder, logical), encoding='utf-8') as f:
+            data = MINIFIERS[ext](f.read()).encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()[:10]
+        target = f'{DIST_DIR}/{base}.{digest}.min{ext}'
+        path = os.path.join(static_folder, target)
+        if not os.path.exists(path):
+            _write(path, data)
+            _write(path + '.gz', gzip.compress(data, 9, mtime=0))
+            if brotli is not None:
+                _write(path + '.br', brotli.compress(data))
+        manifest[logical] = target
+    _write(os.path.join(dist, MANIFEST), json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+class ManifestError(RuntimeError):
+    pass
+
+
+def read_manifest(path):
+    # No manifest yet -> {}; one that exists but can't be read is an error, not "no assets"
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        raise ManifestError(f'{path}: {e} (run `flask assets build` / `flask assets images`)') from e
+
+
+def load_manifest(static_folder):
+    return read_manifest(os.path.join(static_folder, DIST_DIR, MANIFEST))
+
+
+def assets_stale(static_folder):
+    manifest_path = os.path.join(static_folder, DIST_DIR, MANIFEST)
+    if not os.path.exists(manifest_path):
+        return True
+    try:
+        manifest = load_manifest(static_folder)
+    except ManifestError:
+        return True  # rebuilt, never served
+    built = os.path.getmtime(manifest_path)
+    sources = list(_source_files(static_folder))
+    if set(sources) != set(manifest):
+        return True
+    return any(os.path.getmtime(os.path.join(static_folder, logical)) > built for logical in sources)
+
+
+# --- Inline block extraction ---
+
+def extract_inline_blocks(template_folder, static_folder, min_count=2):
+    templates = {}
+    for root, _, files in os.walk(template_folder):
+        for name in sorted(files):
+            if name.endswith('.html'):
+                path = os.path.join(root, name)
+                with open(path, encoding='utf-8') as f:
+                    templates[path] = f.read()
+
+    # Identical block bodies -> templates that contain them
+    usage = defaultdict(list)
+    for path, html in templates.items():
+        for match in INLINE_BLOCK_RE.finditer(html):
+            kind, attrs, body = match.groups()
+            if 'src=' in (attrs or '') or 'ld+json' in (attrs or '') or JINJA_RE.search(body):
+                continue
+            if body.strip():
+                usage[(kind, body)].append(path)
+
+    shared = {}
+    for (kind, body), paths in usage.items():
+        if len(set(paths)) < min_count:
+            continue
+        ext = 'css' if kind == 'style' else 'js'
+        page = os.path.basename(os.path.dirname(paths[0]))
+        digest = hashlib.sha1(body.encode('utf-8')).hexdigest()[:8]
+        logical = f'{ext}/pages/{page}-{digest}.{ext}'
+        _write(os.path.join(static_folder, logical), body.strip().encode('utf-8') + b'\n')
+        shared[(kind, body)] = logical
+
+    def replace(match):
+        kind, attrs, body = match.groups()
+        logical = shared.get((kind, body))
+        if logical is None:
+            return match.group(0)
+        href = "{{ url_for('static', filename='%s') }}" % logical
+        if kind == 'style':
+            return f'<link rel="stylesheet" href="{href}"{attrs or ""}>'
+        return f'<script src="{href}"{attrs or ""}></script>'
+
+    changed = 0
+    for path, html in templates.items():
+        new_html = INLINE_BLOCK_RE.sub(replace, html)
+        if new_html != html:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(new_html)
+            changed += 1
+    return len(shared), changed
+
+
+# --- Runtime ---
+
+def init_assets(app):
+    app.config.setdefault('ASSETS_BUILD_ON_START', True)
+    static_folder = app.static_folder
+    if app.config['ASSETS_BUILD_ON_START'] and assets_stale(static_folder):
+        try:
+            build_assets(static_folder)
+        except OSError as e:
+            # Read-only deploys still work, just without fingerprinted files
+            app.logger.warning('Asset build skipped: %s', e)
+    manifest = load_manifest(static_folder)
+    app.extensions['asset_manifest'] = manifest
+
+    @app.url_defaults
+    def fingerprint_static(endpoint, values):
+        if endpoint == 'static':
+            target = manifest.get(values.get('filename'))
+            if target:
+                values['filename'] = target
+
+    app.add_url_rule(f'{app.static_url_path}/{DIST_DIR}/<path:filename>',
+                     endpoint='dist_asset', view_func=dist_asset)
+    app.cli.add_command(assets_cli)
+
+
+def dist_asset(filename):
+    dist = os.path.join(current_app.static_folder, DIST_DIR)
+    mimetype = mimetypes.guess_type(filename)[0]
+    encoding = None
+    for name, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[name] and os.path.isfile(os.path.join(dist, filename + suffix)):
+            encoding = name
+            filename += suffix
+            break
+    response = send_from_directory(dist, filename, mimetype=mimetype, max_age=IMMUTABLE_MAX_AGE)
+    # send_file names the file it sent (style.<hash>.min.css.gz); the client doesn't need it
+    del response.headers['Content-Disposition']
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+
+@assets_cli.command('extract')
+@click.option('--min-count', default=2, show_default=True,
+              help='Only extract blocks that appear in at least this many templates.')
+def extract_command(min_count):
+    """Move duplicated inline <style>/<script> blocks into shared static files."""
+    template_folder = os.path.join(current_app.root_path, current_app.template_folder)
+    bundles, changed = extract_inline_blocks(template_folder, current_app.static_folder, min_count)
+    click.echo(f'Wrote {bundles} shared files, updated {changed} templates')
+
+
+@assets_cli.command('build')
+def build_command():
+    """Minify, fingerprint and precompress static CSS/JS into static/dist."""
+    manifest = build_assets(current_app.static_folder)
+    for logical, target in sorted(manifest.items()):
+        click.echo(f'{logical} -> {target}')
@@ -0,0 +1,57 @@
+from itertools import chain, repeat
+
+import numpy as np
+
+from grades import GRADE_POINTS, as_float_array
+
+
+# --- Columnar GPA for many transcripts at once ---
+# A transcript is either {"courses": [{"grade": "A", "credits": 3}, ...]} or, cheaper to
+# parse, columnar: {"grades": ["A", ...], "credits": [3, ...]}. Everything is flattened
+# into (transcript index, grade points, credits) arrays and summed with np.bincount.
+# Courses with an unknown grade or non-numeric credits (bools included) are skipped, same
+# as calculate_gpa_from_courses. Credits near the float limit overflow the sums: such a
+# transcript comes back as NaN/inf and the caller rejects it (invalid JSON otherwise).
+
+def transcript_columns(transcript):
+    if 'courses' in transcript:
+        courses = transcript['courses'] or ()
+        return [c.get('grade') for c in courses], [c.get('credits') for c in courses]
+    grades = transcript.get('grades') or []
+    credits = transcript.get('credits') or []
+    if len(grades) != len(credits):
+        raise ValueError('grades and credits must have the same length')
+    return grades, credits
+
+
+def flatten_transcripts(transcripts):
+    columns = [transcript_columns(t) for t in transcripts]
+    counts = np.fromiter((len(grades) for grades, _ in columns), dtype=np.intp, count=len(columns))
+    grades = list(chain.from_iterable(grades for grades, _ in columns))
+    credits = list(chain.from_iterable(credits for _, credits in columns))
+
+    # dict.get via map() keeps the grade lookup in C; unknown grades become NaN
+    points = np.fromiter(map(GRADE_POINTS.get, grades, repeat(np.nan)), dtype=np.float64, count=len(grades))
+    credits = as_float_array(credits)
+
+    owners = np.repeat(np.arange(len(columns), dtype=np.intp), counts)
+    valid = ~(np.isnan(points) | np.isnan(credits))
+    return owners[valid], points[valid], credits[valid]
+
+
+def batch_gpa(transcripts):
+    # Returns unrounded (gpa, total_credits) arrays, one entry per transcript.
+    # Callers round with Python's round() so results match calculate_gpa_from_courses exactly.
+    owners, points, credits = flatten_transcripts(transcripts)
+    size = len(transcripts)
+    with np.errstate(over='ignore', invalid='ignore'):
+        total_points = np.bincount(owners, weights=points * credits, minlength=size)
+        total_credits = np.bincount(owners, weights=credits, minlength=size)
+        gpa = np.zeros(size)
+        np.divide(total_points, total_credits, out=gpa, where=total_credits != 0)
+    return gpa, total_credits
+
+
+def non_finite(gpa, total_credits):
+    # Indexes of the transcripts whose sums overflowed
+    return np.flatnonzero(~(np.isfinite(gpa) & np.isfinite(total_credits)))
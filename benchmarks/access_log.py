@@ -0,0 +1,126 @@
+# Access log overhead per request: no log vs queued (QueueHandler + batching listener) vs
+# the same JSON file written synchronously inside the request, through the whole WSGI
+# stack. The modes take turns for --rounds rounds and the best round of each is shown,
+# so a noisy neighbour doesn't decide the result. A last run puts a slow disk behind a
+# small queue: records are dropped and counted, requests don't wait.
+#
+#     python -m benchmarks.access_log --requests 5000
+import argparse
+import os
+import queue
+import statistics
+import tempfile
+import time
+
+from access_log import BatchFileHandler, BatchQueueListener, DroppingQueueHandler, JsonFormatter
+from app import access_log, app
+
+URLS = ('/', '/de/gpa-calculator', '/en/gpa-calculator', '/api/grading_scales')
+
+
+class SlowDiskHandler(BatchFileHandler):
+    delay = 0.05
+
+    def emit_batch(self, records):
+        time.sleep(self.delay)
+        super().emit_batch(records)
+
+
+def timed(client, count):
+    timings = []
+    for i in range(count):
+        url = URLS[i % len(URLS)]
+        start = time.perf_counter()
+        response = client.get(url)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code in (200, 301), (url, response.status_code)
+    return timings
+
+
+def count_lines(path):
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f)
+
+
+def file_handler(path, handler_class=BatchFileHandler):
+    handler = handler_class(path, app.config['ACCESS_LOG_MAX_BYTES'], 0)
+    handler.setFormatter(JsonFormatter())
+    return handler
+
+
+def run_queued(client, count, path, queue_size, handler_class=BatchFileHandler):
+    # What AccessLog.start() sets up, with the file handler chosen here
+    log_queue = queue.Queue(queue_size)
+    handler = file_handler(path, handler_class)
+    listener = BatchQueueListener(log_queue, handler, app.config['ACCESS_LOG_BATCH_SIZE'],
+                                  app.config['ACCESS_LOG_FLUSH_INTERVAL'])
+    access_log.logger.handlers = [DroppingQueueHandler(log_queue, access_log._dropped)]
+    listener.start()
+    access_log.recording = True
+    try:
+        return timed(client, count)
+    finally:
+        access_log.recording = False
+        listener.stop()
+        handler.close()
+
+
+def run_sync(client, count, path):
+    handler = file_handler(path)
+    access_log.logger.handlers = [handler]
+    access_log.recording = True
+    try:
+        return timed(client, count)
+    finally:
+        access_log.recording = False
+        handler.close()
+
+
+def summary(timings):
+    return statistics.mean(timings), statistics.quantiles(timings, n=100)[98]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=3)
+    parser.add_argument('--small-queue', type=int, default=100, help='queue size for the slow disk run')
+    args = parser.parse_args()
+
+    access_log.stop()  # started by the boot warm-up, writing to instance/logs
+    client = app.test_client()
+    timed(client, 200)  # page cache, compressor variants, ...
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {'queued': os.path.join(tmp, 'queued.log'), 'synchronous': os.path.join(tmp, 'sync.log')}
+        modes = {
+            'no log': lambda: timed(client, args.requests),
+            'queued': lambda: run_queued(client, args.requests, paths['queued'], app.config['ACCESS_LOG_QUEUE_SIZE']),
+            'synchronous': lambda: run_sync(client, args.requests, paths['synchronous']),
+        }
+        best = {}
+        for _ in range(args.rounds):
+            for name, run in modes.items():
+                result = summary(run())
+                if name not in best or result[0] < best[name][0]:
+                    best[name] = result
+
+        print(f'{args.requests} requests over {", ".join(URLS)}, best of {args.rounds} rounds')
+        baseline = best['no log'][0]
+        for name, (mean, p99) in best.items():
+            print(f'  {name:12} mean {mean * 1e6:8.1f} us  p99 {p99 * 1e6:8.1f} us'
+                  f'  (+{(mean - baseline) * 1e6:6.1f} us/request)')
+        for name, path in paths.items():
+            print(f'  {name}: {count_lines(path)} lines written')
+
+        path = os.path.join(tmp, 'slow.log')
+        access_log.dropped = 0
+        mean, p99 = summary(run_queued(client, args.requests, path, args.small_queue, SlowDiskHandler))
+        print(f'slow disk ({SlowDiskHandler.delay * 1000:.0f} ms per write), queue of {args.small_queue}')
+        print(f'  mean {mean * 1e6:8.1f} us  p99 {p99 * 1e6:8.1f} us, '
+              f'{count_lines(path)} written, {access_log.dropped} dropped')
+
+
+if __name__ == '__main__':
+    main()
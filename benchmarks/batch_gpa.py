@@ -0,0 +1,63 @@
+# Batch GPA throughput: NumPy batch_gpa vs calculate_gpa_from_courses per transcript.
+#
+#     python -m benchmarks.batch_gpa --transcripts 20000 --courses 40
+import argparse
+import random
+import time
+
+from app import calculate_gpa_from_courses
+from batch_gpa import batch_gpa
+from grades import GRADE_POINTS
+
+
+def make_transcripts(count, courses, seed=0):
+    rng = random.Random(seed)
+    grades = list(GRADE_POINTS)
+    return [
+        {'id': i, 'courses': [{'grade': rng.choice(grades), 'credits': rng.choice((1, 2, 3, 4, 4.5))}
+                              for _ in range(rng.randint(1, courses))]}
+        for i in range(count)
+    ]
+
+
+def best_of(repeat, func):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--transcripts', type=int, default=10000)
+    parser.add_argument('--courses', type=int, default=40, help='max courses per transcript')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    transcripts = make_transcripts(args.transcripts, args.courses)
+    total_courses = sum(len(t['courses']) for t in transcripts)
+
+    loop_time, expected = best_of(args.repeat, lambda: [calculate_gpa_from_courses(t['courses']) for t in transcripts])
+
+    columnar = [{'id': t['id'], 'grades': [c['grade'] for c in t['courses']],
+                 'credits': [c['credits'] for c in t['courses']]} for t in transcripts]
+
+    def vectorized(data):
+        gpa, _ = batch_gpa(data)
+        return [round(float(x), 2) for x in gpa]
+    rows_time, rows_result = best_of(args.repeat, lambda: vectorized(transcripts))
+    columnar_time, columnar_result = best_of(args.repeat, lambda: vectorized(columnar))
+
+    assert rows_result == expected, 'batch_gpa (courses) disagrees with calculate_gpa_from_courses'
+    assert columnar_result == expected, 'batch_gpa (grades/credits) disagrees with calculate_gpa_from_courses'
+    print(f'{args.transcripts} transcripts, {total_courses} courses (best of {args.repeat})')
+    for name, elapsed in (('python loop', loop_time), ('numpy rows', rows_time),
+                          ('numpy columns', columnar_time)):
+        print(f'  {name:14} {elapsed * 1000:9.1f} ms  {total_courses / elapsed:14,.0f} courses/s'
+              f'  {loop_time / elapsed:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
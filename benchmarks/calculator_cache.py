@@ -0,0 +1,71 @@
+# Calculator GET cache: POST vs GET miss vs GET hit vs conditional GET (304), through the
+# whole WSGI stack and for the cached handler alone.
+#
+#     python -m benchmarks.calculator_cache --requests 5000
+import argparse
+import statistics
+import time
+
+from app import REQUIRED_GPA_PARAMS, app, calculator_cache, required_gpa_result
+
+URL = '/api/calculate_required_gpa'
+
+
+def params(i):
+    # Distinct inputs per i, so every miss request really misses
+    return {'goalGpa': 3.5, 'currentGpa': 3.0, 'currentTotalCredits': 60 + i, 'nextSemesterCredits': 15}
+
+
+def timed(count, send):
+    timings = []
+    for i in range(count):
+        start = time.perf_counter()
+        response = send(i)
+        timings.append(time.perf_counter() - start)
+        assert response.status_code in (200, 304), response.status_code
+    return timings
+
+
+def timed_handler(count, offset):
+    # Only the cache + calculator, without request parsing and the rest of the stack
+    timings = []
+    for i in range(count):
+        with app.test_request_context(URL, query_string=params(offset + i)):
+            start = time.perf_counter()
+            calculator_cache.response('required', REQUIRED_GPA_PARAMS, required_gpa_result)
+            timings.append(time.perf_counter() - start)
+    return timings
+
+
+def report(name, timings):
+    print(f'  {name:12} mean {statistics.mean(timings) * 1e6:8.1f} us'
+          f'  p50 {statistics.median(timings) * 1e6:8.1f} us')
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    client = app.test_client()
+    calculator_cache.clear()
+    app.config['CALCULATOR_CACHE_SIZE'] = max(app.config['CALCULATOR_CACHE_SIZE'], 3 * args.requests)
+    etag = client.get(URL, query_string=params(-1)).headers['ETag']
+
+    cases = (
+        ('POST', lambda i: client.post(URL, json=params(i))),
+        ('GET miss', lambda i: client.get(URL, query_string=params(i))),
+        ('GET hit', lambda i: client.get(URL, query_string=params(i))),
+        ('GET 304', lambda i: client.get(URL, query_string=params(-1), headers={'If-None-Match': etag})),
+    )
+    print(f'{args.requests} requests per case against {URL}')
+    for name, send in cases:
+        report(name, timed(args.requests, send))
+    print('handler only')
+    report('miss', timed_handler(args.requests, args.requests))
+    report('hit', timed_handler(args.requests, args.requests))
+    print(f'  cache: {calculator_cache.hits} hits, {calculator_cache.misses} misses, {len(calculator_cache)} entries')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,351 @@
+# Load test: every page rule x SUPPORTED_LANGS, every legacy/trailing-slash redirect and
+# the /api endpoints with realistic payloads. Reports req/s and p50/p95/p99 per endpoint
+# and can save/compare JSON baselines (exit code 1 on a regression).
+#
+#     python -m benchmarks.load                                  # in-process test client
+#     python -m benchmarks.load --gunicorn --workers 4 -c 16     # local gunicorn
+#     python -m benchmarks.load --server http://127.0.0.1:8000   # already running server
+#     python -m benchmarks.load --save benchmarks/baselines/client.json
+#     python -m benchmarks.load --compare benchmarks/baselines/client.json
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from urllib.parse import urlsplit
+
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import RequestRedirect
+
+from app import app, redirect_table
+
+GUNICORN_START_TIMEOUT = 30
+
+
+class Target:
+    __slots__ = ('name', 'method', 'url', 'body', 'headers')
+
+    def __init__(self, name, method, url, body=None, headers=None):
+        self.name = name
+        self.method = method
+        self.url = url
+        self.body = body
+        self.headers = headers or {}
+
+
+def json_target(method, url, payload=None, token=None):
+    headers = {'Content-Type': 'application/json'} if payload is not None else {}
+    if token:
+        headers['X-Client-Token'] = token
+    body = json.dumps(payload).encode('utf-8') if payload is not None else None
+    return Target(f'{method} {urlsplit(url).path}', method, url, body, headers)
+
+
+def endpoint_name(adapter, url):
+    try:
+        endpoint, _ = adapter.match(url, method='GET')
+    except RequestRedirect:
+        return 'werkzeug slash redirect'
+    except HTTPException:
+        return 'unmatched'
+    return f'GET {endpoint}'
+
+
+def page_targets():
+    # Pages from url_map x SUPPORTED_LANGS plus every URL that redirects (legacy routes,
+    # trailing-slash twins), grouped by the endpoint that answers them
+    adapter = app.url_map.bind('localhost')
+    urls = sorted(set(redirect_table.candidate_urls()) | set(redirect_table.table))
+    return [Target(endpoint_name(adapter, url), 'GET', url) for url in urls]
+
+
+def api_targets(round_id):
+    # Returns (course session, independent calls). The session is one client's course list
+    # and always runs in order on one thread; its token is unique per round so the
+    # per-client course limit is never hit.
+    token = f'load-test-round-{round_id:06d}'
+    transcript = {'grades': ['A', 'B+', 'A-', 'C', 'B'], 'credits': [3, 4, 3, 2, 3]}
+    csv_body = b'name,credits,grade\nCalculus,4,A\nPhysics,3,B+\nHistory,3,A-\n'
+    required = 'goalGpa=3.5&currentGpa=3.1&currentTotalCredits=60&nextSemesterCredits=15'
+    session = [
+        json_target('POST', '/api/add_course', {'courseName': 'Calculus', 'credits': 4, 'grade': 'A'}, token),
+        json_target('POST', '/api/add_course', {'courseName': 'Physics', 'credits': 3, 'grade': 'B+'}, token),
+        json_target('POST', '/api/update_course', {'index': 0, 'credits': 3, 'grade': 'A-'}, token),
+        json_target('GET', '/api/get_courses', token=token),
+        json_target('POST', '/api/delete_course', {'index': 1}, token),
+        json_target('POST', '/api/batch_courses', {'operations': [
+            {'op': 'add', 'courseName': 'Chemistry', 'credits': 4, 'grade': 'B'},
+            {'op': 'update', 'index': 0, 'grade': 'A'},
+            {'op': 'add', 'courseName': 'Art', 'credits': 2, 'grade': 'A-'},
+            {'op': 'delete', 'index': 1},
+        ]}, token),
+        Target('POST /api/import_courses', 'POST', '/api/import_courses?format=csv&mode=replace', csv_body,
+               {'Content-Type': 'text/csv', 'X-Client-Token': token}),
+        json_target('GET', '/api/export_courses?format=csv', token=token),
+        json_target('POST', '/api/reset_courses', {}, token),
+    ]
+    calls = [
+        json_target('POST', '/api/calculate_combined_gpa',
+                    {'oldTotalCredits': 60, 'oldGpa': 3.2, 'newSemesterCredits': 15, 'newSemesterGpa': 3.7}),
+        json_target('POST', '/api/calculate_final_cumulative_gpa', {'totalCredits': 75, 'gpa': 3.31}),
+        json_target('POST', '/api/calculate_required_gpa',
+                    {'goalGpa': 3.5, 'currentGpa': 3.1, 'currentTotalCredits': 60, 'nextSemesterCredits': 15}),
+        json_target('GET', f'/api/calculate_required_gpa?{required}'),
+        json_target('POST', '/api/calculate_cumulative_gpa',
+                    {'terms': [{'credits': 15, 'gpa': 3.2}, {'credits': 16, 'gpa': 3.6}, {'credits': 12, 'gpa': 3.9}],
+                     'whatIf': [{'term': 2, 'gpa': 3.0}]}),
+        json_target('POST', '/api/gpa_plan',
+                    {'currentGpa': 3.1, 'currentTotalCredits': 60,
+                     'goalGpa': {'start': 3.0, 'stop': 4.0, 'step': 0.1},
+                     'nextSemesterCredits': [12, 15, 18], 'semesters': [1, 2, 3, 4]}),
+        json_target('POST', '/api/batch_gpa', {'transcripts': [transcript] * 50}),
+        json_target('GET', '/api/grading_scales'),
+        json_target('POST', '/api/convert', {'from': 'percentage', 'to': 'gpa4', 'values': [91, 84.5, 77, 68, 99]}),
+        json_target('POST', '/api/sgpa_to_cgpa', {'scale': 10, 'records': [[8.1, 7.9, 8.6], [9.2, 8.8]]}),
+    ]
+    return session, calls
+
+
+def build_plan(rounds, include_pages=True, include_api=True):
+    # A plan is a list of steps; each step is a list of targets sent in order by one client
+    pages = [[target] for target in page_targets()] if include_pages else []
+    plan = []
+    for round_id in range(rounds):
+        plan.extend(pages)
+        if include_api:
+            session, calls = api_targets(round_id)
+            plan.append(session)
+            plan.extend([target] for target in calls)
+    return plan
+
+
+# --- Drivers: each returns a send(target) -> status callable ---
+
+def client_driver():
+    client = app.test_client()
+
+    def send(target):
+        response = client.open(target.url, method=target.method, data=target.body, headers=target.headers)
+        response.close()
+        return response.status_code
+    return send
+
+
+def http_driver(base_url):
+    parts = urlsplit(base_url)
+    local = threading.local()
+
+    def send(target):
+        conn = getattr(local, 'conn', None)
+        if conn is None:
+            conn = local.conn = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=30)
+        headers = dict(target.headers, **{'Accept-Encoding': 'gzip'})
+        try:
+            conn.request(target.method, target.url, body=target.body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            # Sync workers close idle connections; retry once on a fresh one
+            conn.close()
+            conn.request(target.method, target.url, body=target.body, headers=headers)
+            response = conn.getresponse()
+            response.read()
+        return response.status
+    return send
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(workers, app_import, course_store_path):
+    port = free_port()
+    # The memory course store is per worker, so a course session spread over several
+    # workers would see 404s; the shared SQLite store is what multi-worker deploys use
+    env = dict(os.environ, FLASK_COURSE_STORE='sqlite', FLASK_COURSE_STORE_PATH=course_store_path)
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'gunicorn', '--bind', f'127.0.0.1:{port}', '--workers', str(workers),
+         '--log-level', 'warning', app_import],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+    )
+    deadline = time.monotonic() + GUNICORN_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f'gunicorn exited with code {process.returncode}')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return process, f'http://127.0.0.1:{port}'
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise SystemExit('gunicorn did not start in time')
+
+
+# --- Run + report ---
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(p / 100 * len(sorted_values)) - 1)]
+
+
+def run(plan, send, concurrency):
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    lock = threading.Lock()
+
+    def one(step):
+        for target in step:
+            start = time.perf_counter()
+            try:
+                status = send(target)
+            except Exception as e:  # Connection errors count as failures, the run goes on
+                status = type(e).__name__
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies[target.name].append(elapsed)
+                statuses[target.name][str(status)] += 1
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(one, plan))
+    else:
+        for step in plan:
+            one(step)
+    return time.perf_counter() - start, latencies, statuses
+
+
+def summarize(mode, wall, latencies, statuses):
+    endpoints = {}
+    for name in sorted(latencies):
+        values = sorted(latencies[name])
+        errors = sum(count for status, count in statuses[name].items()
+                     if not status.isdigit() or int(status) >= 500)
+        endpoints[name] = {
+            'count': len(values),
+            'rps': round(len(values) / sum(values), 1) if sum(values) else 0.0,
+            'p50_ms': round(percentile(values, 50) * 1000, 3),
+            'p95_ms': round(percentile(values, 95) * 1000, 3),
+            'p99_ms': round(percentile(values, 99) * 1000, 3),
+            'max_ms': round(values[-1] * 1000, 3),
+            'statuses': dict(sorted(statuses[name].items())),
+            'errors': errors,
+        }
+    total = sum(e['count'] for e in endpoints.values())
+    return {
+        'mode': mode,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'requests': total,
+        'wall_s': round(wall, 3),
+        'rps': round(total / wall, 1) if wall else 0.0,
+        'endpoints': endpoints,
+    }
+
+
+def print_report(summary):
+    print(f"{summary['mode']}: {summary['requests']} requests in {summary['wall_s']:.2f}s "
+          f"({summary['rps']:,.0f} req/s)")
+    width = max((len(name) for name in summary['endpoints']), default=10)
+    print(f"  {'endpoint':{width}}  {'n':>6} {'req/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  statuses")
+    for name, e in summary['endpoints'].items():
+        codes = ' '.join(f'{status}x{count}' for status, count in e['statuses'].items())
+        print(f"  {name:{width}}  {e['count']:6} {e['rps']:9,.0f} {e['p50_ms']:8.2f} {e['p95_ms']:8.2f} "
+              f"{e['p99_ms']:8.2f}  {codes}")
+
+
+def compare(summary, baseline, tolerance, min_delta_ms):
+    # A regression is a slower p95 (relative *and* absolute), new errors, or a change in
+    # the status codes an endpoint answers with (e.g. a page that started redirecting)
+    problems = []
+    for name, old in baseline['endpoints'].items():
+        new = summary['endpoints'].get(name)
+        if new is None:
+            problems.append(f'{name}: missing from this run')
+            continue
+        if new['p95_ms'] > old['p95_ms'] * (1 + tolerance) and new['p95_ms'] - old['p95_ms'] > min_delta_ms:
+            problems.append(f"{name}: p95 {old['p95_ms']:.2f} -> {new['p95_ms']:.2f} ms")
+        if new['errors'] > old['errors']:
+            problems.append(f"{name}: errors {old['errors']} -> {new['errors']}")
+        if set(new['statuses']) != set(old['statuses']):
+            problems.append(f"{name}: statuses {sorted(old['statuses'])} -> {sorted(new['statuses'])}")
+    for name in summary['endpoints'].keys() - baseline['endpoints'].keys():
+        print(f'  note: {name} is new (not in baseline)')
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rounds', type=int, default=5, help='passes over every URL and API call')
+    parser.add_argument('-c', '--concurrency', type=int, default=1, help='client threads (HTTP modes)')
+    parser.add_argument('--gunicorn', action='store_true', help='start a local gunicorn and load it over HTTP')
+    parser.add_argument('--workers', type=int, default=2, help='gunicorn workers')
+    parser.add_argument('--app-import', default='app:app', help='WSGI app for gunicorn')
+    parser.add_argument('--server', help='base URL of an already running server')
+    parser.add_argument('--no-pages', action='store_true')
+    parser.add_argument('--no-api', action='store_true')
+    parser.add_argument('--save', metavar='PATH', help='write the results as a JSON baseline')
+    parser.add_argument('--compare', metavar='PATH', help='fail if slower than this baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='allowed relative p95 slowdown')
+    parser.add_argument('--min-delta-ms', type=float, default=1.0, help='ignore p95 changes smaller than this')
+    args = parser.parse_args()
+
+    plan = build_plan(args.rounds, not args.no_pages, not args.no_api)
+    process = None
+    tmp_dir = tempfile.TemporaryDirectory()
+    try:
+        if args.gunicorn:
+            process, base_url = start_gunicorn(args.workers, args.app_import,
+                                               os.path.join(tmp_dir.name, 'courses.sqlite3'))
+            mode, send = f'gunicorn ({args.workers} workers, {args.concurrency} clients)', http_driver(base_url)
+        elif args.server:
+            mode, send = f'server {args.server} ({args.concurrency} clients)', http_driver(args.server)
+        else:
+            # The test client is not thread-safe; in-process runs are always serial
+            mode, send, args.concurrency = 'test client', client_driver(), 1
+        # One untimed pass so lazy caches don't count against the first round
+        run(plan[:len(plan) // args.rounds], send, args.concurrency)
+        wall, latencies, statuses = run(plan, send, args.concurrency)
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        tmp_dir.cleanup()
+
+    summary = summarize(mode, wall, latencies, statuses)
+    print_report(summary)
+
+    if args.save:
+        os.makedirs(os.path.dirname(os.path.abspath(args.save)), exist_ok=True)
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2, sort_keys=True)
+        print(f'Baseline written to {args.save}')
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        problems = compare(summary, baseline, args.tolerance, args.min_delta_ms)
+        for problem in problems:
+            print(f'  REGRESSION {problem}', file=sys.stderr)
+        print(f"Compared with {args.compare} ({baseline['mode']}, {baseline['created']}): {len(problems)} regressions")
+        if problems:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
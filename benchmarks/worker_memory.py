@@ -0,0 +1,115 @@
+# Worker memory with and without preload: RSS, PSS, shared and private memory per gunicorn
+# worker, read from /proc/<pid>/smaps_rollup (Linux only).
+#
+#     python -m benchmarks.worker_memory --workers 4
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+
+from benchmarks.load import free_port
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+START_TIMEOUT = 60
+# Touched on every worker before measuring, so lazily built state is counted too
+WARM_URLS = ('/', '/gpa-calculator', '/ar/gpa-calculator', '/blogs', '/api/grading_scales')
+
+
+def smaps(pid):
+    # kB values from smaps_rollup
+    values = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 3 and parts[2] == 'kB':
+                values[parts[0].rstrip(':')] = int(parts[1])
+    return {
+        'rss': values.get('Rss', 0),
+        'pss': values.get('Pss', 0),
+        'shared': values.get('Shared_Clean', 0) + values.get('Shared_Dirty', 0),
+        'private': values.get('Private_Clean', 0) + values.get('Private_Dirty', 0),
+    }
+
+
+def children(pid):
+    with open(f'/proc/{pid}/task/{pid}/children') as f:
+        return [int(child) for child in f.read().split()]
+
+
+def wait_ready(base_url, deadline):
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(f'{base_url}/readyz', timeout=2) as response:
+                if response.status == 200:
+                    return
+        except (urllib.error.URLError, OSError):
+            pass
+        time.sleep(0.3)
+    raise SystemExit(f'{base_url} did not become ready')
+
+
+def measure(preload, workers, requests_per_url):
+    port = free_port()
+    base_url = f'http://127.0.0.1:{port}'
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, GUNICORN_PRELOAD='1' if preload else '0',
+                   FLASK_COURSE_STORE_PATH=os.path.join(tmp, 'courses.sqlite3'),
+                   FLASK_METRICS_DIR=os.path.join(tmp, 'metrics'), FLASK_RATELIMIT_ENABLED='0')
+        process = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', '--config', 'gunicorn.conf.py', '--bind', f'127.0.0.1:{port}',
+             '--workers', str(workers), '--log-level', 'warning', 'app:app'],
+            cwd=ROOT, env=env)
+        try:
+            deadline = time.monotonic() + START_TIMEOUT
+            wait_ready(base_url, deadline)
+            while len(children(process.pid)) < workers and time.monotonic() < deadline:
+                time.sleep(0.2)
+            # Every worker must have booted (non-preload) and served some pages
+            for _ in range(requests_per_url * workers):
+                for url in WARM_URLS:
+                    with urllib.request.urlopen(base_url + url, timeout=10) as response:
+                        response.read()
+            time.sleep(1)
+            master = smaps(process.pid)
+            worker_stats = [(pid, smaps(pid)) for pid in children(process.pid)]
+        finally:
+            process.terminate()
+            process.wait()
+    return master, worker_stats
+
+
+def report(name, master, worker_stats):
+    print(f'{name}')
+    print(f"  {'process':14} {'RSS MB':>8} {'PSS MB':>8} {'shared MB':>10} {'private MB':>11}")
+    rows = [('master', master)] + [(f'worker {pid}', stats) for pid, stats in worker_stats]
+    for label, stats in rows:
+        print(f"  {label:14} {stats['rss'] / 1024:8.1f} {stats['pss'] / 1024:8.1f} "
+              f"{stats['shared'] / 1024:10.1f} {stats['private'] / 1024:11.1f}")
+    total_pss = sum(stats['pss'] for _, stats in rows)
+    print(f'  total PSS (what the server actually uses): {total_pss / 1024:.1f} MB')
+    return total_pss
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--requests', type=int, default=5, help='warm-up requests per URL and worker')
+    args = parser.parse_args()
+    if not os.path.exists('/proc/self/smaps_rollup'):
+        raise SystemExit('Needs Linux /proc/<pid>/smaps_rollup')
+
+    totals = {}
+    for preload in (False, True):
+        name = f"{'preload' if preload else 'no preload'} ({args.workers} workers)"
+        master, worker_stats = measure(preload, args.workers, args.requests)
+        totals[preload] = report(name, master, worker_stats)
+    saved = totals[False] - totals[True]
+    print(f'preload saves {saved / 1024:.1f} MB PSS ({saved / totals[False]:.0%})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+import hashlib
+import json
+import math
+import threading
+from collections import OrderedDict
+
+from flask import Response, request
+
+
+# --- GET forms of the pure calculator APIs ---
+# calculate_combined_gpa & co. only depend on their inputs, so the GET variants read the
+# known query parameters, normalise them (3.50 == 3.5, unknown params dropped, order
+# ignored) and derive the ETag from that normalised form. A matching If-None-Match is
+# answered before anything is computed; otherwise the JSON body comes from an in-process
+# LRU keyed by the same normalised inputs.
+
+# Bump when a formula changes so old ETags stop matching
+CALCULATOR_VERSION = 1
+
+
+def canonical_value(raw):
+    # Numbers are normalised; anything else (missing, text, nan/inf) becomes None,
+    # which the calculator rejects like a bad POST body
+    try:
+        value = float(raw)
+    except (TypeError, ValueError):
+        return None
+    return value if math.isfinite(value) else None
+
+
+class CalculatorCache:
+    def __init__(self, app=None):
+        self.app = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('CALCULATOR_CACHE_SIZE', 4096)
+        app.config.setdefault('CALCULATOR_CACHE_MAX_AGE', 7 * 24 * 60 * 60)
+        self.app = app
+        app.extensions['calculator_cache'] = self
+
+    def __len__(self):
+        return len(self._cache)
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def _compute(self, key, compute, data):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return entry
+        payload, status = compute(data)
+        entry = (json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8'), status)
+        with self._lock:
+            self.misses += 1
+            self._cache[key] = entry
+            while len(self._cache) > self.app.config['CALCULATOR_CACHE_SIZE']:
+                self._cache.popitem(last=False)
+        return entry
+
+    def response(self, name, params, compute):
+        # compute(data) -> (payload dict, status code), same function the POST route uses
+        args = request.args
+        values = tuple(canonical_value(args.get(param)) for param in params)
+        key = (name, values)
+        etag = hashlib.sha1(json.dumps([CALCULATOR_VERSION, name, values]).encode('utf-8')).hexdigest()
+        # Headers are written as plain strings, the cache_control setters re-parse on every call
+        headers = {
+            'ETag': f'"{etag}"',
+            'Cache-Control': f'public, max-age={self.app.config["CALCULATOR_CACHE_MAX_AGE"]}, immutable',
+        }
+
+        # Same inputs always give the same answer, so a known ETag needs no work at all
+        if request.if_none_match.contains_weak(etag):
+            return Response(status=304, headers=headers)
+        body, status = self._compute(key, compute, dict(zip(params, values)))
+        if status != 200:
+            return Response(body, status=status, mimetype='application/json')
+        return Response(body, status=status, headers=headers, mimetype='application/json')
@@ -0,0 +1,139 @@
+import gzip
+import re
+import threading
+from collections import OrderedDict
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+# --- Response compression + HTML minification ---
+# after_request hook: HTML is whitespace-minified (outside <pre>/<textarea>/<script>/<style>)
+# and text responses are gzip/brotli encoded per Accept-Encoding. When the response has an
+# ETag (cached pages) the finished bytes are kept in an LRU keyed by (ETag, encoding), so
+# the same page is never minified or compressed twice. Only responses any client may get
+# (Cache-Control: public, no cookie) go into the LRU: per-client ETags like the course
+# list's are not unique across clients. Minified or compressed bodies get a weak ETag;
+# If-None-Match uses weak comparison, so 304s keep working, and 304s carry the same
+# Vary: Accept-Encoding as the 200 they stand for.
+
+COMPRESSIBLE_TYPES = {
+    'text/html', 'text/css', 'text/plain', 'text/xml', 'text/csv',
+    'application/json', 'application/javascript', 'application/xml',
+}
+PROTECTED_RE = re.compile(r'<(pre|textarea|script|style)\b.*?</\1\s*>', re.S | re.I)
+COMMENT_RE = re.compile(r'<!--(?!\[if).*?-->', re.S)
+WHITESPACE_RE = re.compile(r'\s+')
+
+
+def _collapse(text):
+    text = COMMENT_RE.sub('', text)
+    # A run that contained a newline stays a newline, anything else becomes one space
+    return WHITESPACE_RE.sub(lambda m: '\n' if '\n' in m.group(0) else ' ', text)
+
+
+def minify_html(html):
+    out = []
+    pos = 0
+    for match in PROTECTED_RE.finditer(html):
+        out.append(_collapse(html[pos:match.start()]))
+        out.append(match.group(0))
+        pos = match.end()
+    out.append(_collapse(html[pos:]))
+    return ''.join(out)
+
+
+def _encode(data, encoding):
+    if encoding == 'br':
+        return brotli.compress(data, quality=5)
+    return gzip.compress(data, 6, mtime=0)
+
+
+class Compressor:
+    def __init__(self, app=None):
+        self.app = None
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('COMPRESS_ENABLED', True)
+        app.config.setdefault('COMPRESS_MIN_SIZE', 1024)
+        app.config.setdefault('COMPRESS_CACHE_SIZE', 512)
+        app.config.setdefault('COMPRESS_MINIFY_HTML', True)
+        self.app = app
+        app.extensions['compressor'] = self
+        app.after_request(self.after_request)
+
+    def negotiate(self):
+        accept = request.accept_encodings
+        if brotli is not None and accept['br']:
+            return 'br'
+        if accept['gzip']:
+            return 'gzip'
+        return None
+
+    def _transform(self, data, mimetype, encoding):
+        if mimetype == 'text/html' and self.app.config['COMPRESS_MINIFY_HTML']:
+            data = minify_html(data.decode('utf-8')).encode('utf-8')
+        if encoding:
+            data = _encode(data, encoding)
+        return data
+
+    def _shared(self, response):
+        cache_control = response.cache_control
+        return cache_control.public and not cache_control.private and not cache_control.no_store \
+            and 'Set-Cookie' not in response.headers
+
+    def after_request(self, response):
+        config = self.app.config
+        if config['COMPRESS_ENABLED'] and response.status_code == 304 \
+           and response.mimetype in COMPRESSIBLE_TYPES:
+            response.vary.add('Accept-Encoding')
+            return response
+        if not config['COMPRESS_ENABLED'] or response.status_code != 200 \
+           or response.direct_passthrough or response.is_streamed \
+           or 'Content-Encoding' in response.headers \
+           or response.mimetype not in COMPRESSIBLE_TYPES:
+            return response
+        if response.content_length is not None and response.content_length < config['COMPRESS_MIN_SIZE']:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate()
+        etag, _ = response.get_etag()
+        key = (etag, encoding, response.mimetype)
+        cacheable = etag and self._shared(response)
+
+        data = None
+        if cacheable:
+            with self._lock:
+                data = self._cache.get(key)
+                if data is not None:
+                    self._cache.move_to_end(key)
+        if data is None:
+            self.misses += 1
+            data = self._transform(response.get_data(), response.mimetype, encoding)
+            if cacheable:
+                with self._lock:
+                    self._cache[key] = data
+                    while len(self._cache) > config['COMPRESS_CACHE_SIZE']:
+                        self._cache.popitem(last=False)
+        else:
+            self.hits += 1
+
+        minified = response.mimetype == 'text/html' and config['COMPRESS_MINIFY_HTML']
+        response.set_data(data)
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        if etag and (encoding or minified):
+            # Not the bytes the strong ETag was computed for any more
+            response.set_etag(etag, weak=True)
+        return response
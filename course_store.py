@@ -0,0 +1,325 @@
+import json
+import math
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from flask import g, request
+
+from grades import GRADE_POINTS
+
+
+# --- Per-client course storage ---
+# Courses belong to an anonymous client token (cookie `course_token`, or the
+# `X-Client-Token` header for API integrations) instead of one global list.
+# `memory` keeps an LRU+TTL dict per worker, `sqlite` is shared by all gunicorn workers.
+
+TOKEN_COOKIE = 'course_token'
+TOKEN_HEADER = 'X-Client-Token'
+TOKEN_RE = re.compile(r'^[A-Za-z0-9_-]{16,64}$')
+
+
+class CourseCollection:
+    # Keeps running grade-point/credit totals so add/update/delete don't rescan the list.
+    # `version` goes up on every change; `generation` changes when a fresh collection is
+    # created, so (generation, version) is a safe ETag even after a store expiry.
+    __slots__ = ('courses', 'total_points', 'total_credits', 'version', 'generation')
+
+    def __init__(self, courses=(), version=0, generation=None):
+        self.courses = []
+        self.total_points = 0.0
+        self.total_credits = 0.0
+        self.version = version
+        self.generation = generation or secrets.token_hex(16)
+        for course in courses:
+            self.courses.append(course)
+            self._count(course, 1)
+
+    def __len__(self):
+        return len(self.courses)
+
+    @staticmethod
+    def _weight(course):
+        # -> (grade points, credits), or None for a course the totals can't hold (unknown
+        # grade, nan/inf credits): it isn't counted on the way in nor subtracted on the way out
+        grade = course.get('grade')
+        points = GRADE_POINTS.get(grade) if isinstance(grade, str) else None
+        credits = course.get('credits')
+        if points is None or not isinstance(credits, (int, float)) or not math.isfinite(credits):
+            return None
+        return points, credits
+
+    def _count(self, course, sign):
+        weight = self._weight(course)
+        if weight is not None:
+            self.total_points += sign * weight[0] * weight[1]
+            self.total_credits += sign * weight[1]
+            if not (math.isfinite(self.total_points) and math.isfinite(self.total_credits)):
+                # inf - inf stays nan forever; start again from the list
+                self._recount()
+
+    def _recount(self):
+        self.total_points = self.total_credits = 0.0
+        for points, credits in filter(None, map(self._weight, self.courses)):
+            self.total_points += points * credits
+            self.total_credits += credits
+
+    @property
+    def gpa(self):
+        if not (math.isfinite(self.total_points) and math.isfinite(self.total_credits)):
+            # Credits near the float limit overflow even a fresh sum; scaled down they
+            # give the same GPA
+            weights = list(filter(None, map(self._weight, self.courses)))
+            scale = max(credits for _, credits in weights)
+            return round(sum(points * (credits / scale) for points, credits in weights)
+                         / sum(credits / scale for _, credits in weights), 2)
+        if self.total_credits <= 1e-9:
+            return 0.0
+        return round(self.total_points / self.total_credits, 2)
+
+    @property
+    def etag(self):
+        return f'{self.generation}-{self.version}'
+
+    def add(self, course):
+        self.courses.append(course)
+        self._count(course, 1)
+        self.version += 1
+        return len(self.courses) - 1
+
+    def update(self, index, **changes):
+        course = self.courses[index]
+        self._count(course, -1)
+        course.update(changes)
+        self._count(course, 1)
+        self.version += 1
+        return course
+
+    def delete(self, index):
+        course = self.courses.pop(index)
+        self._count(course, -1)
+        if not self.courses:
+            # Drop any float drift once the list is empty
+            self.total_points = self.total_credits = 0.0
+        self.version += 1
+        return course
+
+    def clear(self):
+        self.courses = []
+        self.total_points = self.total_credits = 0.0
+        self.version += 1
+
+    def copy(self):
+        # Working copy for all-or-nothing batches; the stored collection stays untouched
+        return CourseCollection([dict(course) for course in self.courses], self.version, self.generation)
+
+    def to_dict(self):
+        return {'courses': self.courses, 'version': self.version, 'generation': self.generation}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['courses'], data['version'], data['generation'])
+
+
+class CourseStore:
+    # True when every gunicorn worker sees the same clients
+    shared = False
+
+    def __init__(self, ttl, max_clients):
+        self.ttl = ttl
+        self.max_clients = max_clients
+        self.evictions = 0
+        self.expirations = 0
+
+    def load(self, token):
+        raise NotImplementedError
+
+    def save(self, token, collection, base=None):
+        # With `base` ((generation, version) of the collection the change started from) this
+        # is a compare-and-swap: returns False and writes nothing when the stored courses
+        # have moved on since
+        raise NotImplementedError
+
+    def delete(self, token):
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    @staticmethod
+    def _unchanged(current, base):
+        if current is None:
+            # Expired or never saved; fine only if the change started from a fresh list too
+            return base[1] == 0
+        return (current.generation, current.version) == base
+
+    def after_fork(self):
+        # Called in each gunicorn worker when the app was preloaded in the master
+        self.evictions = 0
+        self.expirations = 0
+
+    def stats(self):
+        return {
+            'backend': self.backend,
+            'clients': len(self),
+            'maxClients': self.max_clients,
+            'ttl': self.ttl,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+        }
+
+
+class MemoryCourseStore(CourseStore):
+    backend = 'memory'
+
+    def __init__(self, ttl, max_clients):
+        super().__init__(ttl, max_clients)
+        self._data = OrderedDict()  # token -> (expires_at, CourseCollection)
+        self._lock = threading.Lock()
+
+    def load(self, token):
+        with self._lock:
+            return self._get(token) or CourseCollection()
+
+    def _get(self, token):
+        entry = self._data.get(token)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._data[token]
+            self.expirations += 1
+            return None
+        self._data.move_to_end(token)
+        return entry[1]
+
+    def save(self, token, collection, base=None):
+        with self._lock:
+            if base is not None and not self._unchanged(self._get(token), base):
+                return False
+            self._data[token] = (time.monotonic() + self.ttl, collection)
+            self._data.move_to_end(token)
+            while len(self._data) > self.max_clients:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return True
+
+    def delete(self, token):
+        with self._lock:
+            self._data.pop(token, None)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class SQLiteCourseStore(CourseStore):
+    backend = 'sqlite'
+    shared = True
+    PURGE_EVERY = 100  # writes between expiry/eviction sweeps
+
+    def __init__(self, path, ttl, max_clients):
+        super().__init__(ttl, max_clients)
+        self.path = path
+        self._local = threading.local()
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS courses ('
+                         'token TEXT PRIMARY KEY, data TEXT NOT NULL, updated_at REAL NOT NULL)')
+            conn.execute('CREATE INDEX IF NOT EXISTS courses_updated_at ON courses (updated_at)')
+
+    def _connect(self):
+        # One connection per thread and per process (connections must not cross a fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def after_fork(self):
+        super().after_fork()
+        # The master's connection is left alone (closing it here would touch the master's
+        # file locks); this worker opens its own on first use
+        self._inherited = self._local
+        self._local = threading.local()
+        self._writes = 0
+
+    def load(self, token):
+        return self._get(self._connect(), token) or CourseCollection()
+
+    def _get(self, conn, token):
+        row = conn.execute(
+            'SELECT data FROM courses WHERE token = ? AND updated_at >= ?',
+            (token, time.time() - self.ttl)).fetchone()
+        return CourseCollection.from_dict(json.loads(row[0])) if row else None
+
+    def save(self, token, collection, base=None):
+        with self._connect() as conn:
+            if base is not None:
+                # Write lock before the read: another worker process can't save in between
+                conn.execute('BEGIN IMMEDIATE')
+                if not self._unchanged(self._get(conn, token), base):
+                    return False
+            conn.execute('INSERT OR REPLACE INTO courses (token, data, updated_at) VALUES (?, ?, ?)',
+                         (token, json.dumps(collection.to_dict()), time.time()))
+        self._writes += 1
+        if self._writes % self.PURGE_EVERY == 0:
+            self.purge()
+        return True
+
+    def delete(self, token):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM courses WHERE token = ?', (token,))
+
+    def purge(self):
+        with self._connect() as conn:
+            self.expirations += conn.execute(
+                'DELETE FROM courses WHERE updated_at < ?', (time.time() - self.ttl,)).rowcount
+            self.evictions += conn.execute(
+                'DELETE FROM courses WHERE token IN ('
+                'SELECT token FROM courses ORDER BY updated_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_clients,)).rowcount
+
+    def __len__(self):
+        return self._connect().execute('SELECT COUNT(*) FROM courses').fetchone()[0]
+
+
+def create_course_store(app):
+    app.config.setdefault('COURSE_STORE', 'memory')
+    app.config.setdefault('COURSE_STORE_PATH', os.path.join(app.instance_path, 'courses.sqlite3'))
+    app.config.setdefault('COURSE_STORE_TTL', 7 * 24 * 60 * 60)
+    app.config.setdefault('COURSE_STORE_MAX_CLIENTS', 10000)
+    app.config.setdefault('MAX_COURSES_PER_CLIENT', 200)
+
+    ttl = app.config['COURSE_STORE_TTL']
+    max_clients = app.config['COURSE_STORE_MAX_CLIENTS']
+    if app.config['COURSE_STORE'] == 'sqlite':
+        os.makedirs(os.path.dirname(app.config['COURSE_STORE_PATH']), exist_ok=True)
+        store = SQLiteCourseStore(app.config['COURSE_STORE_PATH'], ttl, max_clients)
+    else:
+        store = MemoryCourseStore(ttl, max_clients)
+    app.extensions['course_store'] = store
+    return store
+
+
+def get_client_token():
+    token = request.headers.get(TOKEN_HEADER) or request.cookies.get(TOKEN_COOKIE)
+    if token and TOKEN_RE.match(token):
+        return token
+    if 'new_client_token' not in g:
+        g.new_client_token = secrets.token_urlsafe(24)
+    return g.new_client_token
+
+
+def set_client_token_cookie(response):
+    # Only set when the token was created during this request
+    token = g.get('new_client_token')
+    if token:
+        response.set_cookie(TOKEN_COOKIE, token, max_age=365 * 24 * 60 * 60,
+                            httponly=True, samesite='Lax')
+    return response
@@ -0,0 +1,183 @@
+import itertools
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import click
+from flask import current_app, url_for
+from werkzeug.utils import import_string
+
+
+# --- Static-site export ---
+# `flask freeze` renders every page route (app, lang_routes, blog_routes, static_pages)
+# into a directory tree and writes the legacy redirects as a Netlify/Cloudflare
+# `_redirects` file and an nginx map. Only /api has to stay on gunicorn after that.
+#
+# nginx example:
+#     map $uri $redirect_to { include /srv/site/redirects.map; }
+#     if ($redirect_to) { return 301 $redirect_to; }
+#     location / { try_files $uri $uri.html $uri/index.html =404; }
+#
+# The export is rendered into a temporary sibling directory and swapped in at the end, so
+# a failed run leaves the previous build alone. An existing OUT_DIR is only replaced if a
+# previous freeze wrote it (MARKER_FILE): `flask freeze .` refuses instead of deleting the repo.
+
+# Endpoints that only make sense with a live server
+SKIPPED_ENDPOINTS = {'static', 'set_language', 'metrics', 'readyz'}
+MAX_REDIRECT_HOPS = 10
+MARKER_FILE = '.flask-freeze'
+
+_worker_app = None
+
+
+def init_freeze(app, path_args):
+    # path_args: {'lang_code': [...], 'slug': [...]} - values used to expand rule arguments
+    app.extensions['freeze_path_args'] = path_args
+    app.cli.add_command(freeze_command)
+
+
+def iter_urls(app):
+    path_args = app.extensions['freeze_path_args']
+    seen = set()
+    for rule in app.url_map.iter_rules():
+        if rule.endpoint in SKIPPED_ENDPOINTS or rule.rule.startswith('/api'):
+            continue
+        if 'GET' not in rule.methods:
+            continue
+        if any(arg not in path_args for arg in rule.arguments):
+            # Catch-all <path:...> rules can't be enumerated
+            continue
+        args = sorted(rule.arguments)
+        for values in itertools.product(*(path_args[arg] for arg in args)):
+            with app.test_request_context('/'):
+                url = url_for(rule.endpoint, **dict(zip(args, values)))
+            if url not in seen:
+                seen.add(url)
+                yield url
+
+
+def output_path(url):
+    path = url.lstrip('/')
+    if not path or path.endswith('/'):
+        return os.path.join(path, 'index.html')
+    if os.path.splitext(path)[1]:
+        return path
+    return path + '.html'
+
+
+def _init_worker(app_import):
+    global _worker_app
+    _worker_app = import_string(app_import)
+
+
+def _resolve(client, url):
+    # Follows a redirect chain and returns (first status, final target)
+    response = client.get(url)
+    status = response.status_code
+    target = None
+    for _ in range(MAX_REDIRECT_HOPS):
+        if response.status_code not in (301, 302, 307, 308):
+            break
+        target = response.headers['Location']
+        if '://' in target:
+            break
+        response = client.get(target)
+    return status, target, response
+
+
+def _freeze_url(url, out_dir):
+    client = _worker_app.test_client()
+    start = time.perf_counter()
+    status, target, response = _resolve(client, url)
+    results = []
+    if status == 200:
+        path = output_path(url)
+        full_path = os.path.join(out_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        with open(full_path, 'wb') as f:
+            f.write(response.get_data())
+        results.append((url, 'page', path, time.perf_counter() - start))
+        if not url.endswith('/') and not os.path.splitext(url)[1]:
+            # Trailing-slash variant, e.g. /gpa-calculator/ -> /gpa-calculator
+            slash_status, slash_target, _ = _resolve(client, url + '/')
+            if slash_status == 301 and slash_target:
+                results.append((url + '/', 'redirect', slash_target, 0.0))
+    elif status == 301 and target:
+        results.append((url, 'redirect', target, time.perf_counter() - start))
+    else:
+        results.append((url, 'skipped', str(status), time.perf_counter() - start))
+    return results
+
+
+@click.command('freeze')
+@click.argument('out_dir', default='build', type=click.Path(file_okay=False))
+@click.option('--workers', '-j', default=os.cpu_count() or 1, show_default=True,
+              help='Number of processes used for rendering.')
+@click.option('--app-import', default='app:app', show_default=True,
+              help='Import string of the Flask app, used by the worker processes.')
+def freeze_command(out_dir, workers, app_import):
+    """Export all pages and legacy redirects to OUT_DIR."""
+    app = current_app._get_current_object()
+    start = time.perf_counter()
+    target_dir = os.path.abspath(out_dir)
+    if os.path.isdir(target_dir) and os.listdir(target_dir) and \
+            not os.path.isfile(os.path.join(target_dir, MARKER_FILE)):
+        raise click.ClickException(f'{out_dir} is not empty and was not written by freeze, '
+                                   f'refusing to replace it')
+    parent = os.path.dirname(target_dir)
+    os.makedirs(parent, exist_ok=True)
+    build_dir = tempfile.mkdtemp(prefix=f'.{os.path.basename(target_dir)}-', dir=parent)
+    # mkdtemp is 0700, the web server has to read the swapped-in tree
+    os.chmod(build_dir, 0o755)
+    try:
+        pages, redirects = _freeze_into(app, build_dir, workers, app_import)
+        _swap_in(build_dir, target_dir)
+    except BaseException:
+        shutil.rmtree(build_dir, ignore_errors=True)
+        raise
+
+    click.echo(f'Exported {pages} pages and {len(redirects)} redirects to {out_dir} '
+               f'in {time.perf_counter() - start:.2f}s')
+
+
+def _swap_in(build_dir, target_dir):
+    # A directory can't be os.replace'd over a non-empty one: move the old build aside first
+    if not os.path.exists(target_dir):
+        os.replace(build_dir, target_dir)
+        return
+    old_dir = build_dir + '.old'
+    os.replace(target_dir, old_dir)
+    os.replace(build_dir, target_dir)
+    shutil.rmtree(old_dir)
+
+
+def _freeze_into(app, out_dir, workers, app_import):
+    with open(os.path.join(out_dir, MARKER_FILE), 'w'):
+        pass
+    urls = list(iter_urls(app))
+    redirects = {}
+    pages = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(app_import,)) as pool:
+        futures = [pool.submit(_freeze_url, url, out_dir) for url in urls]
+        for future in futures:
+            for url, kind, detail, elapsed in future.result():
+                if kind == 'page':
+                    pages += 1
+                    click.echo(f'{elapsed * 1000:8.1f} ms  {url} -> {detail}')
+                elif kind == 'redirect':
+                    redirects[url] = detail
+                else:
+                    click.echo(f'{"":8} --  {url} skipped (status {detail})')
+
+    shutil.copytree(app.static_folder, os.path.join(out_dir, 'static'))
+
+    with open(os.path.join(out_dir, '_redirects'), 'w') as f:
+        for source, target in sorted(redirects.items()):
+            f.write(f'{source} {target} 301\n')
+    with open(os.path.join(out_dir, 'redirects.map'), 'w') as f:
+        for source, target in sorted(redirects.items()):
+            f.write(f'"{source}" "{target}";\n')
+    return pages, redirects
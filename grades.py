@@ -0,0 +1,140 @@
+from itertools import repeat
+
+import numpy as np
+
+
+# --- Grading scale registry ---
+# Every scale used by the calculators lives here once and is compiled into NumPy lookup
+# arrays at import time, so the convert APIs work on whole arrays of values per request.
+
+NUMERIC_TYPES = {int, float}
+
+
+def as_float_array(values, low=-np.inf, high=np.inf):
+    # Non-numeric or out-of-range values become NaN
+    if set(map(type, values)) <= NUMERIC_TYPES:
+        array = np.array(values, dtype=np.float64)
+    else:
+        array = np.array([v if type(v) in NUMERIC_TYPES else np.nan for v in values], dtype=np.float64)
+    array[(array < low) | (array > high)] = np.nan
+    return array
+
+
+class LetterScale:
+    # Letter grade -> grade points
+    def __init__(self, name, label, points):
+        self.name = name
+        self.label = label
+        self.points = dict(points)
+        self.letters = list(points)
+        self.max = max(self.points.values())
+        self._index = {letter: i for i, letter in enumerate(self.letters)}
+        self._values = np.array(list(self.points.values()), dtype=np.float64)
+
+    def to_points(self, letters):
+        index = np.fromiter(map(self._index.get, letters, repeat(-1)), dtype=np.intp, count=len(letters))
+        result = np.full(len(index), np.nan)
+        known = index >= 0
+        result[known] = self._values[index[known]]
+        return result
+
+    def describe(self):
+        return {'name': self.name, 'label': self.label, 'type': 'letter', 'points': self.points}
+
+
+class BandScale:
+    # Percentage -> letter grade, using the minimum percentage of each letter
+    def __init__(self, name, label, bands):
+        self.name = name
+        self.label = label
+        self.bands = dict(bands)
+        ordered = sorted(self.bands.items(), key=lambda item: item[1])
+        self._bounds = np.array([minimum for _, minimum in ordered], dtype=np.float64)
+        self._letters = np.array([letter for letter, _ in ordered], dtype=object)
+
+    def to_letters(self, percentages):
+        index = np.searchsorted(self._bounds, percentages, side='right') - 1
+        result = np.full(len(index), None, dtype=object)
+        valid = (index >= 0) & ~np.isnan(percentages)
+        result[valid] = self._letters[index[valid]]
+        return result
+
+    def describe(self):
+        return {'name': self.name, 'label': self.label, 'type': 'percentage-bands', 'bands': self.bands}
+
+
+GPA_4 = LetterScale('gpa4', '4.0 scale', {
+    'A+': 4.0, 'A': 4.0, 'A-': 3.7,
+    'B+': 3.3, 'B': 3.0, 'B-': 2.7,
+    'C+': 2.3, 'C': 2.0, 'C-': 1.7,
+    'D+': 1.3, 'D': 1.0, 'D-': 0.7,
+    'F': 0.0
+})
+
+GPA_43 = LetterScale('gpa43', '4.3 scale', {
+    'A+': 4.3, 'A': 4.0, 'A-': 3.7,
+    'B+': 3.3, 'B': 3.0, 'B-': 2.7,
+    'C+': 2.3, 'C': 2.0, 'C-': 1.7,
+    'D+': 1.3, 'D': 1.0, 'D-': 0.7,
+    'F': 0.0
+})
+
+# Ez-Grader default minimum percentages (templates/ez)
+EZ_GRADER = BandScale('ez', 'Ez-Grader percentage bands', {
+    'A+': 97, 'A': 93, 'A-': 90,
+    'B+': 87, 'B': 83, 'B-': 80,
+    'C+': 77, 'C': 73, 'C-': 70,
+    'D+': 67, 'D': 63, 'D-': 60,
+    'F': 0
+})
+
+# SGPA scales offered by the SGPA -> CGPA converter
+SGPA_SCALES = (4.0, 5.0, 10.0)
+
+SCALES = {scale.name: scale for scale in (GPA_4, GPA_43, EZ_GRADER)}
+
+# Letter grade -> grade points (4.0 scale), used by the course API
+GRADE_POINTS = GPA_4.points
+
+
+def sgpa10_to_percentage(sgpa):
+    # Same formula as the SGPA to percentage page: (SGPA x 10) - 7.5
+    return sgpa * 10 - 7.5
+
+
+def _percentage_to_letter(values, bands=None):
+    scale = BandScale('custom', 'Custom bands', bands) if bands else EZ_GRADER
+    return scale.to_letters(as_float_array(values, 0, 100))
+
+
+# (from, to) -> function(values, bands) returning a float or object array
+CONVERSIONS = {
+    ('letter', 'gpa4'): lambda values, bands: GPA_4.to_points(values),
+    ('letter', 'gpa43'): lambda values, bands: GPA_43.to_points(values),
+    ('percentage', 'letter'): _percentage_to_letter,
+    ('percentage', 'gpa4'): lambda values, bands: GPA_4.to_points(_percentage_to_letter(values, bands)),
+    ('percentage', 'gpa43'): lambda values, bands: GPA_43.to_points(_percentage_to_letter(values, bands)),
+    ('sgpa10', 'percentage'): lambda values, bands: sgpa10_to_percentage(as_float_array(values, 0, 10)),
+}
+
+
+def convert(source, target, values, bands=None):
+    # Returns a list with None for values that could not be converted.
+    # Raises KeyError for an unknown conversion.
+    result = CONVERSIONS[(source, target)](values, bands)
+    if result.dtype == object:
+        return result.tolist()
+    return [None if np.isnan(x) else round(x, 2) for x in result.tolist()]
+
+
+def sgpa_to_cgpa(records, scale):
+    # records: list of SGPA lists. A record with any SGPA outside 0..scale gets None,
+    # like the page which refuses to calculate in that case.
+    counts = np.fromiter((len(r) for r in records), dtype=np.intp, count=len(records))
+    sgpa = as_float_array([x for record in records for x in record], 0, scale)
+    owners = np.repeat(np.arange(len(records), dtype=np.intp), counts)
+    invalid = np.bincount(owners, weights=np.isnan(sgpa), minlength=len(records)) > 0
+    totals = np.bincount(owners, weights=np.nan_to_num(sgpa), minlength=len(records))
+    cgpa = np.full(len(records), np.nan)
+    np.divide(totals, counts, out=cgpa, where=(counts > 0) & ~invalid)
+    return [None if np.isnan(x) else round(x, 2) for x in cgpa.tolist()]
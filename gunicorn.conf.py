@@ -0,0 +1,106 @@
+import gc
+import json
+import os
+import shutil
+import tempfile
+
+# --- gunicorn config (Procfile: gunicorn --config gunicorn.conf.py app:app) ---
+# Preload mode: the master imports app.py once - routes, compiled templates, the page
+# cache, the redirect table - and the workers are forked from it, so all of that is
+# shared copy-on-write instead of being built again (and held again) by every worker.
+# gc.freeze() right before each fork moves those objects out of the GC's reach, so the
+# collector never writes to their pages and they stay shared.
+#
+# GUNICORN_PRELOAD=0 goes back to every worker importing the app on its own.
+# Bind/worker count come from gunicorn's usual $PORT / $WEB_CONCURRENCY.
+#
+# Rate limiting (ratelimit.py) starts in each worker once it is up, with buckets shared
+# between the workers through an mmap'd file.
+#
+# Measure preload: python -m benchmarks.worker_memory --workers 4
+
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1').lower() not in ('0', 'false', 'no')
+
+# static/dist (assets.py, images.py) is built by one process only: the master, which
+# imports the app when preloading, or builds it in on_starting before any worker imports
+# the app on its own. FLASK_ASSETS_BUILD_ON_START=false leaves it to the deploy.
+_build_static_in_master = not preload_app and 'FLASK_ASSETS_BUILD_ON_START' not in os.environ
+
+if preload_app:
+    # Compile every template in the master too; a background warm-up thread would only
+    # exist in the master and the forked workers would never become ready
+    if os.environ.get('FLASK_TEMPLATE_PRECOMPILE', 'background') == 'background':
+        os.environ['FLASK_TEMPLATE_PRECOMPILE'] = 'true'
+else:
+    os.environ.setdefault('FLASK_ASSETS_BUILD_ON_START', 'false')
+    os.environ.setdefault('FLASK_IMAGES_BUILD_ON_START', 'false')
+
+# Worker memory is not shared after the fork: courses go to the SQLite store and /metrics
+# adds up the workers through a metrics directory
+os.environ.setdefault('FLASK_COURSE_STORE', 'sqlite')
+_default_metrics_dir = os.path.join(tempfile.gettempdir(), f'gpa-metrics-{os.getpid()}')
+os.environ.setdefault('FLASK_METRICS_DIR', _default_metrics_dir)
+# Rate limit buckets in a shared mmap file, so a client gets one budget, not one per worker
+os.environ.setdefault('FLASK_RATELIMIT_STORAGE', 'shared')
+_default_ratelimit_path = os.path.join(tempfile.gettempdir(), f'gpa-ratelimit-{os.getpid()}.bin')
+os.environ.setdefault('FLASK_RATELIMIT_SHARED_PATH', _default_ratelimit_path)
+# The Procfile runs behind Heroku's router: REMOTE_ADDR is the router, the client is the
+# last X-Forwarded-For hop. Set FLASK_RATELIMIT_TRUST_FORWARDED=false when gunicorn is
+# reachable directly (the header could be forged then).
+os.environ.setdefault('FLASK_RATELIMIT_TRUST_FORWARDED', 'true')
+
+
+def _build_static(server):
+    from assets import assets_stale, build_assets
+    from images import DEFAULT_WIDTHS, build_images, images_stale
+    static_folder = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static')
+    widths = json.loads(os.environ.get('FLASK_IMAGE_WIDTHS', 'null')) or DEFAULT_WIDTHS
+    try:
+        if assets_stale(static_folder):
+            build_assets(static_folder)
+        if images_stale(static_folder, widths):
+            build_images(static_folder, widths)
+    except OSError as e:
+        # Read-only deploys still work, just without fingerprinted files
+        server.log.warning('Static build skipped: %s', e)
+
+
+def on_starting(server):
+    # Buckets left over from an earlier master (crash, kill -9) start from scratch
+    try:
+        os.remove(os.environ['FLASK_RATELIMIT_SHARED_PATH'])
+    except FileNotFoundError:
+        pass
+    if _build_static_in_master:
+        _build_static(server)
+
+
+def pre_fork(server, worker):
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if not server.cfg.preload_app:
+        return
+    # Per-process resources the worker must not share with the master
+    from app import app
+    for extension in app.extensions.values():
+        after_fork = getattr(extension, 'after_fork', None)
+        if callable(after_fork):
+            after_fork()
+
+
+def post_worker_init(worker):
+    # Only serving workers limit; the master's boot probes and warm-up never do
+    from app import app
+    app.extensions['rate_limiter'].start()
+
+
+def on_exit(server):
+    if os.environ.get('FLASK_METRICS_DIR') == _default_metrics_dir:
+        shutil.rmtree(_default_metrics_dir, ignore_errors=True)
+    if os.environ.get('FLASK_RATELIMIT_SHARED_PATH') == _default_ratelimit_path:
+        try:
+            os.remove(_default_ratelimit_path)
+        except FileNotFoundError:
+            pass
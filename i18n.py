@@ -0,0 +1,264 @@
+import gettext
+import os
+import re
+import struct
+
+import click
+from flask import current_app
+from flask.cli import AppGroup
+from jinja2 import pass_context
+from markupsafe import Markup
+
+
+# --- Single-source page templates + gettext catalogs ---
+# A migrated page is one template (e.g. gpacalculator/gpa-calculator.html) rendered for
+# every lang_code; its strings are looked up in translations/<lang>/LC_MESSAGES/messages.mo.
+# `flask i18n migrate` builds that template and the catalogs from the old per-language
+# copies (gpa-calculator_de.html, ...). A copy that doesn't line up with the English
+# page is left on disk, and template_name() keeps serving it until it's fixed by hand.
+#
+# Catalog entries are keyed by template: {{ _('Calculate GPA') }} in
+# gpacalculator/gpa-calculator.html has msgctxt "gpacalculator/gpa-calculator.html", so
+# the same English text can have a different translation on another page. Where one page
+# needs two translations of the same text the template says {{ pgettext('2', '...') }},
+# msgctxt "<template>#2". Strings are HTML source (entities, <br> ...) and are not escaped
+# again, same as the text they replaced.
+#
+# <html lang dir> and data-lang say {{ content_lang() }}: the lang_code when its catalog
+# has entries for this template, 'en' otherwise - a page nobody translated yet is served
+# in English and has to say so (lang="en" dir="ltr"), whatever the URL prefix.
+#
+#   flask i18n migrate --all      per-language copies -> single template + .po catalogs
+#   flask i18n compile            .po -> .mo (migrate does this too)
+
+RTL_LANGS = {'ar'}
+DOMAIN = 'messages'
+
+PO_ESCAPE_RE = re.compile(r'\\(.)')
+PO_ESCAPES = {'n': '\n', 't': '\t', 'r': '\r'}
+
+i18n_cli = AppGroup('i18n', help='Translation catalogs and template migration.')
+
+
+def text_direction(lang_code):
+    return 'rtl' if lang_code in RTL_LANGS else 'ltr'
+
+
+def catalog_path(directory, lang_code, extension='.po'):
+    return os.path.join(directory, lang_code, 'LC_MESSAGES', DOMAIN + extension)
+
+
+class I18n:
+    def __init__(self, app=None, supported_langs=(), pages=()):
+        self.app = None
+        self.supported_langs = []
+        self.pages = []
+        self.translations = {}
+        # lang_code -> templates its catalog has entries for
+        self.translated = {}
+        self._templates = None
+        if app is not None:
+            self.init_app(app, supported_langs, pages)
+
+    def init_app(self, app, supported_langs, pages=()):
+        app.config.setdefault('TRANSLATIONS_DIR', os.path.join(app.root_path, 'translations'))
+        self.app = app
+        # pages: base template paths (without _<lang>.html) that `flask i18n migrate --all` covers
+        self.supported_langs = list(supported_langs)
+        self.pages = list(pages)
+        app.extensions['i18n'] = self
+        env = app.jinja_env
+        env.add_extension('jinja2.ext.i18n')
+        env.install_gettext_callables(self._gettext, self._ngettext, newstyle=False,
+                                      pgettext=self._pgettext, npgettext=self._npgettext)
+        env.globals['text_direction'] = text_direction
+        env.globals['content_lang'] = self._content_lang
+        app.cli.add_command(i18n_cli)
+        self.load()
+
+    # --- Catalogs ---
+
+    def load(self):
+        directory = self.app.config['TRANSLATIONS_DIR']
+        translations = {}
+        translated = {}
+        for lang_code in self.supported_langs:
+            po, mo = catalog_path(directory, lang_code), catalog_path(directory, lang_code, '.mo')
+            if os.path.exists(po) and (not os.path.exists(mo) or os.path.getmtime(po) > os.path.getmtime(mo)):
+                self.app.logger.warning('%s is newer than its .mo, run `flask i18n compile`', po)
+            translations[lang_code] = gettext.translation(DOMAIN, directory, languages=[lang_code], fallback=True)
+            translated[lang_code] = {msgctxt.partition('#')[0] for msgctxt, _ in read_po(po) if msgctxt}
+        self.translations = translations
+        self.translated = translated
+
+    def _catalog(self, context):
+        return self.translations.get(context.get('lang_code')) or gettext.NullTranslations()
+
+    @pass_context
+    def _gettext(self, context, message):
+        return Markup(self._catalog(context).pgettext(context.name, message))
+
+    @pass_context
+    def _ngettext(self, context, singular, plural, n):
+        return Markup(self._catalog(context).npgettext(context.name, singular, plural, n))
+
+    @pass_context
+    def _pgettext(self, context, msgctxt, message):
+        return Markup(self._catalog(context).pgettext(f'{context.name}#{msgctxt}', message))
+
+    @pass_context
+    def _npgettext(self, context, msgctxt, singular, plural, n):
+        return Markup(self._catalog(context).npgettext(f'{context.name}#{msgctxt}', singular, plural, n))
+
+    @pass_context
+    def _content_lang(self, context):
+        lang_code = context.get('lang_code')
+        return lang_code if context.name in self.translated.get(lang_code, ()) else 'en'
+
+    # --- Templates ---
+
+    def template_name(self, base_path, lang_code):
+        # Old per-language copy while it exists, otherwise the single-source template
+        if self._templates is None:
+            self._templates = set(self.app.jinja_env.list_templates())
+        legacy = f'{base_path}_{lang_code}.html'
+        if lang_code != 'en' and legacy in self._templates:
+            return legacy
+        return f'{base_path}.html'
+
+
+# --- .po / .mo files ---
+
+def _po_escape(text):
+    return (text.replace('\\', '\\\\').replace('"', '\\"')
+            .replace('\n', '\\n').replace('\t', '\\t'))
+
+
+def _po_unescape(text):
+    return PO_ESCAPE_RE.sub(lambda m: PO_ESCAPES.get(m.group(1), m.group(1)), text)
+
+
+def read_po(path):
+    # -> {(msgctxt or None, msgid): msgstr}; fuzzy and untranslated entries are skipped
+    entries = {}
+    if not os.path.exists(path):
+        return entries
+    entry, field, flags = {}, None, ''
+
+    def finish():
+        if entry.get('msgid') and entry.get('msgstr') and 'fuzzy' not in flags:
+            entries[(entry.get('msgctxt'), entry['msgid'])] = entry['msgstr']
+
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith('#'):
+                if 'msgstr' in entry:
+                    finish()
+                    entry, flags = {}, ''
+                if line.startswith('#,'):
+                    flags += line
+                continue
+            if line.startswith('"'):
+                entry[field] += _po_unescape(line[1:-1])
+                continue
+            keyword, _, value = line.partition(' ')
+            if keyword in ('msgctxt', 'msgid') and 'msgstr' in entry:
+                finish()
+                entry, flags = {}, ''
+            field = keyword
+            entry[field] = _po_unescape(value.strip()[1:-1])
+    finish()
+    return entries
+
+
+def write_po(path, lang_code, entries):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    lines = [
+        'msgid ""',
+        'msgstr ""',
+        '"Content-Type: text/plain; charset=UTF-8\\n"',
+        f'"Language: {lang_code}\\n"',
+        '',
+    ]
+    # entries: in catalog order (page by page, in template order)
+    for (msgctxt, msgid), msgstr in entries.items():
+        if msgctxt is not None:
+            lines.append(f'msgctxt "{_po_escape(msgctxt)}"')
+        lines.append(f'msgid "{_po_escape(msgid)}"')
+        lines.append(f'msgstr "{_po_escape(msgstr)}"')
+        lines.append('')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+
+
+def write_mo(path, entries):
+    # GNU .mo: header, two (length, offset) tables, then the NUL-terminated strings
+    messages = {b'': b'Content-Type: text/plain; charset=UTF-8\n'}
+    for (msgctxt, msgid), msgstr in entries.items():
+        key = msgid if msgctxt is None else f'{msgctxt}\x04{msgid}'
+        messages[key.encode('utf-8')] = msgstr.encode('utf-8')
+    keys = sorted(messages)
+    offset = 7 * 4 + 16 * len(keys)
+    ids = strs = b''
+    id_table, str_table = [], []
+    for key in keys:
+        id_table += [len(key), len(ids)]
+        ids += key + b'\0'
+    for key in keys:
+        str_table += [len(messages[key]), len(strs)]
+        strs += messages[key] + b'\0'
+    id_table = [v if i % 2 == 0 else v + offset for i, v in enumerate(id_table)]
+    str_table = [v if i % 2 == 0 else v + offset + len(ids) for i, v in enumerate(str_table)]
+    header = struct.pack('<7I', 0x950412de, 0, len(keys), 7 * 4, 7 * 4 + 8 * len(keys), 0, 0)
+    with open(path, 'wb') as f:
+        f.write(header + struct.pack(f'<{len(id_table)}I', *id_table)
+                + struct.pack(f'<{len(str_table)}I', *str_table) + ids + strs)
+
+
+def compile_catalogs(directory, lang_codes):
+    compiled = []
+    for lang_code in lang_codes:
+        po = catalog_path(directory, lang_code)
+        if os.path.exists(po):
+            entries = read_po(po)
+            write_mo(catalog_path(directory, lang_code, '.mo'), entries)
+            compiled.append((lang_code, len(entries)))
+    return compiled
+
+
+@i18n_cli.command('compile')
+def compile_command():
+    """Compile translations/<lang>/LC_MESSAGES/messages.po into .mo files."""
+    i18n = current_app.extensions['i18n']
+    for lang_code, count in compile_catalogs(current_app.config['TRANSLATIONS_DIR'], i18n.supported_langs):
+        click.echo(f'{lang_code}: {count} messages')
+
+
+@i18n_cli.command('migrate')
+@click.argument('base_paths', nargs=-1)
+@click.option('--all', 'migrate_all', is_flag=True, help='Every page template the app knows.')
+@click.option('--dry-run', is_flag=True, help='Only report which languages would be migrated.')
+@click.option('--keep-legacy', is_flag=True, help="Don't delete the migrated per-language copies.")
+def migrate_command(base_paths, migrate_all, dry_run, keep_legacy):
+    """Merge per-language copies of a page (BASE_PATH_<lang>.html) into one template + catalogs."""
+    from i18n_migrate import migrate_page
+
+    i18n = current_app.extensions['i18n']
+    base_paths = list(base_paths) or (i18n.pages if migrate_all else [])
+    if not base_paths:
+        raise click.UsageError('Give template base paths (e.g. gpacalculator/gpa-calculator) or --all')
+    directory = current_app.config['TRANSLATIONS_DIR']
+    lang_codes = [lang_code for lang_code in i18n.supported_langs if lang_code != 'en']
+    template_dir = os.path.join(current_app.root_path, current_app.template_folder)
+    for base_path in base_paths:
+        result = migrate_page(template_dir, directory, base_path, lang_codes, dry_run=dry_run,
+                              keep_legacy=keep_legacy)
+        migrated = ', '.join(result.migrated) or '-'
+        click.echo(f'{base_path}: migrated {migrated} ({result.messages} strings)')
+        for lang_code, reason in result.failed.items():
+            click.echo(f'  {lang_code}: kept {base_path}_{lang_code}.html - {reason}', err=True)
+    if not dry_run:
+        compile_catalogs(directory, lang_codes)
@@ -0,0 +1,286 @@
+import os
+import re
+
+from i18n import catalog_path, read_po, write_po
+
+
+# --- `flask i18n migrate`: per-language copies -> one template + catalog entries ---
+# Every copy is split into tokens (text, tags, Jinja, comments, <script>/<style>) and lined
+# up with the English page token by token. A copy only migrates when the two have the same
+# structure: same tags and attribute names, same Jinja, same scripts. Then the English text
+# and differing attribute values become {{ _('...') }} calls and the copy's text becomes
+# the translation. Comments, dir= and the data-translate* hooks are ignored; lang= and
+# data-lang= turn into {{ content_lang() }}, and <html> gets
+# dir="{{ text_direction(content_lang()) }}" (English until a catalog translates the page).
+#
+# Already migrated pages can be migrated again (e.g. after a copy was fixed by hand): the
+# template is first turned back into the English source, and languages without a copy
+# keep the translations from their catalog.
+
+TOKEN_RE = re.compile(
+    r'\{\{.*?\}\}|\{%.*?%\}|\{#.*?#\}|<!--.*?-->|<script\b.*?</script\s*>|<style\b.*?</style\s*>'
+    r'|<(?:[^>{]|\{\{.*?\}\}|\{%.*?%\}|\{(?![{%]))*>',
+    re.S | re.I)
+TAG_NAME_RE = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9:-]*)')
+ATTR_RE = re.compile(r'''([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>"']+)))?''', re.S)
+CODE_RE = re.compile(r'\{\{|\{%')
+
+LANG_ATTRS = {'lang', 'data-lang'}
+LANG_VALUE = '{{ content_lang() }}'
+DIR_ATTR = ' dir="{{ text_direction(content_lang()) }}"'
+# What migrate writes (and wrote before content_lang(): lang_code), so it can be turned
+# back into the English source
+WRAPPED_RE = re.compile(
+    r"""\{\{ (?:_\(|pgettext\('([^']*)', )'((?:[^'\\]|\\.)*)'\) \}\}"""
+    r'|(\s(?:lang|data-lang)\s*=\s*")\{\{ (?:lang_code|content_lang\(\)) \}\}"'
+    r'|\sdir="\{\{ text_direction\((?:lang_code|content_lang\(\))\) \}\}"')
+
+
+class AlignmentError(Exception):
+    pass
+
+
+class Token:
+    __slots__ = ('kind', 'text', 'start', 'name', 'attrs')
+
+    def __init__(self, kind, text, start, name=None, attrs=()):
+        # kind: text, tag, code ({{ }}/{% %}), comment, raw (<script>, <style>, <!DOCTYPE>)
+        self.kind = kind
+        self.text = text
+        self.start = start
+        self.name = name
+        # [(name, value or None, value start, value end, quote)] - offsets in the source
+        self.attrs = attrs
+
+
+class MigrationResult:
+    def __init__(self):
+        self.migrated = []
+        self.failed = {}
+        self.messages = 0
+
+
+def _markup_token(text, start):
+    if text.startswith(('{#', '<!--')):
+        return Token('comment', text, start)
+    if text.startswith(('{{', '{%')):
+        return Token('code', text, start)
+    match = TAG_NAME_RE.match(text)
+    if match is None or text[:7].lower() in ('<script', '<style>', '<style '):
+        return Token('raw', text, start)
+    attrs = []
+    body_end = len(text) - (2 if text.endswith('/>') else 1)
+    for attr in ATTR_RE.finditer(text, match.end(), body_end):
+        if attr.group(2) is not None:
+            group, quote = 2, '"'
+        elif attr.group(3) is not None:
+            group, quote = 3, "'"
+        elif attr.group(4) is not None:
+            group, quote = 4, ''
+        else:
+            attrs.append((attr.group(1).lower(), None, None, None, None))
+            continue
+        attrs.append((attr.group(1).lower(), attr.group(group),
+                      start + attr.start(group), start + attr.end(group), quote))
+    return Token('tag', text, start, match.group(1) + match.group(2).lower(), attrs)
+
+
+def tokenize(source):
+    tokens = []
+    pos = 0
+    for match in TOKEN_RE.finditer(source):
+        if match.start() > pos:
+            tokens.append(Token('text', source[pos:match.start()], pos))
+        tokens.append(_markup_token(match.group(0), match.start()))
+        pos = match.end()
+    if pos < len(source):
+        tokens.append(Token('text', source[pos:], pos))
+    return tokens
+
+
+def _ignored(name):
+    return name == 'dir' or name.startswith('data-translate')
+
+
+def _significant(token):
+    # Comments and whitespace between tags don't have to line up
+    return token.kind != 'comment' and (token.kind != 'text' or token.text.strip())
+
+
+def _has_code(value):
+    return value is not None and CODE_RE.search(value) is not None
+
+
+def _core_start(token):
+    return token.start + len(token.text) - len(token.text.lstrip())
+
+
+def _describe(token, source):
+    line = source.count('\n', 0, token.start) + 1
+    text = ' '.join(token.text.split())
+    return f'line {line}: {text[:60]!r}'
+
+
+def align(en_tokens, en_source, tokens, source):
+    # -> {(en token index, attribute name or None): text in this language}
+    en = [(i, t) for i, t in enumerate(en_tokens) if _significant(t)]
+    other = [t for t in tokens if _significant(t)]
+    translations = {}
+    for (i, a), b in zip(en, other):
+        mismatch = a.kind != b.kind
+        if not mismatch and a.kind == 'text':
+            translations[(i, None)] = b.text.strip()
+        elif not mismatch and a.kind == 'tag':
+            a_attrs = {name: value for name, value, *_ in a.attrs if not _ignored(name)}
+            b_attrs = {name: value for name, value, *_ in b.attrs if not _ignored(name)}
+            mismatch = a.name != b.name or a_attrs.keys() != b_attrs.keys()
+            for name, value in a_attrs.items():
+                if mismatch:
+                    break
+                other_value = b_attrs[name]
+                if name in LANG_ATTRS or value == other_value:
+                    continue
+                mismatch = value is None or other_value is None or _has_code(value) or _has_code(other_value)
+                translations[(i, name)] = other_value
+        elif not mismatch:
+            mismatch = a.text != b.text
+        if mismatch:
+            raise AlignmentError(f'{_describe(b, source)} does not match English {_describe(a, en_source)}')
+    if len(en) != len(other):
+        extra = other[len(en)] if len(other) > len(en) else None
+        raise AlignmentError(f'{_describe(extra, source)} has no English counterpart' if extra
+                             else 'ends before the English page does')
+    return translations
+
+
+def quote(text):
+    return "'" + text.replace('\\', '\\\\').replace("'", "\\'") + "'"
+
+
+def unquote(literal):
+    return re.sub(r'\\(.)', r'\1', literal)
+
+
+def unwrap(source):
+    # Migrated template -> English source, plus {offset of msgid: pgettext context or None}
+    out, wrapped = [], {}
+    pos = length = 0
+    for match in WRAPPED_RE.finditer(source):
+        out.append(source[pos:match.start()])
+        length += match.start() - pos
+        if match.group(2) is not None:
+            replacement = unquote(match.group(2))
+            wrapped[length] = match.group(1)
+        elif match.group(3) is not None:
+            replacement = match.group(3) + 'en"'
+        else:
+            replacement = ''
+        out.append(replacement)
+        length += len(replacement)
+        pos = match.end()
+    out.append(source[pos:])
+    return ''.join(out), wrapped
+
+
+def find_units(tokens):
+    # -> [(key, msgid, msgid start, msgid end, quote)] for every text / attribute value
+    units = []
+    for i, token in enumerate(tokens):
+        if token.kind == 'text':
+            core = token.text.strip()
+            if core:
+                start = _core_start(token)
+                units.append(((i, None), core, start, start + len(core), None))
+        elif token.kind == 'tag':
+            for name, value, start, end, quote_char in token.attrs:
+                if value and not _ignored(name) and name not in LANG_ATTRS and not _has_code(value):
+                    units.append(((i, name), value, start, end, quote_char))
+    return units
+
+
+def _context(template_name, suffix):
+    return template_name if suffix is None else f'{template_name}#{suffix}'
+
+
+def migrate_page(template_dir, catalog_dir, base_path, lang_codes, dry_run=False, keep_legacy=False):
+    result = MigrationResult()
+    template_name = f'{base_path}.html'
+    template_file = os.path.join(template_dir, *template_name.split('/'))
+    with open(template_file, encoding='utf-8') as f:
+        en_source, wrapped = unwrap(f.read())
+    en_tokens = tokenize(en_source)
+    units = find_units(en_tokens)
+
+    catalogs = {}
+    translations = {}
+    for lang_code in lang_codes:
+        legacy_file = os.path.join(template_dir, *f'{base_path}_{lang_code}.html'.split('/'))
+        catalogs[lang_code] = read_po(catalog_path(catalog_dir, lang_code))
+        if os.path.exists(legacy_file):
+            with open(legacy_file, encoding='utf-8') as f:
+                legacy_source = f.read()
+            try:
+                translations[lang_code] = align(en_tokens, en_source, tokenize(legacy_source), legacy_source)
+            except AlignmentError as e:
+                result.failed[lang_code] = str(e)
+                continue
+            result.migrated.append(lang_code)
+        else:
+            # Migrated earlier: the catalog has its translations
+            catalog = catalogs[lang_code]
+            translations[lang_code] = {
+                key: catalog.get((_context(template_name, wrapped[start]), msgid), msgid)
+                for key, msgid, start, _, _ in units if start in wrapped
+            }
+    if not result.migrated:
+        return result
+
+    # Units that differ in any language get wrapped; one context per distinct translation set
+    done = [lang_code for lang_code in lang_codes if lang_code in translations]
+    contexts = {}
+    edits = []
+    messages = {}
+    for key, msgid, start, end, quote_char in units:
+        values = tuple(translations[lang_code].get(key, msgid) for lang_code in done)
+        if start not in wrapped and all(value == msgid for value in values):
+            continue
+        variants = contexts.setdefault(msgid, [])
+        if values not in variants:
+            variants.append(values)
+        suffix = None if variants.index(values) == 0 else str(variants.index(values) + 1)
+        messages[(_context(template_name, suffix), msgid)] = values
+        call = f'{{{{ _({quote(msgid)}) }}}}' if suffix is None else f'{{{{ pgettext({quote(suffix)}, {quote(msgid)}) }}}}'
+        if quote_char == '':
+            call = f'"{call}"'
+        edits.append((start, end, call))
+    for token in en_tokens:
+        if token.kind != 'tag':
+            continue
+        for name, value, start, end, quote_char in token.attrs:
+            if name in LANG_ATTRS and value == 'en' and quote_char == '"':
+                edits.append((start, end, LANG_VALUE))
+        if token.name == 'html' and not any(name == 'dir' for name, *_ in token.attrs):
+            end = token.start + len(token.text) - 1
+            edits.append((end, end, DIR_ATTR))
+    output = en_source
+    for start, end, replacement in sorted(edits, reverse=True):
+        output = output[:start] + replacement + output[end:]
+    result.messages = len(messages)
+    if dry_run:
+        return result
+
+    with open(template_file, 'w', encoding='utf-8') as f:
+        f.write(output)
+    for index, lang_code in enumerate(done):
+        entries = {key: value for key, value in catalogs[lang_code].items()
+                   if key[0] != template_name and not (key[0] or '').startswith(template_name + '#')}
+        for key, values in messages.items():
+            if values[index] != key[1]:
+                entries[key] = values[index]
+        if entries == catalogs[lang_code]:
+            continue
+        write_po(catalog_path(catalog_dir, lang_code), lang_code, entries)
+    if not keep_legacy:
+        for lang_code in result.migrated:
+            os.remove(os.path.join(template_dir, *f'{base_path}_{lang_code}.html'.split('/')))
+    return result
@@ -0,0 +1,213 @@
+import hashlib
+import io
+import json
+import os
+import re
+import struct
+
+import click
+from flask import current_app, url_for
+from markupsafe import Markup, escape
+
+from assets import DIST_DIR, ManifestError, _write, assets_cli, read_manifest
+
+try:
+    from PIL import Image, features
+except ImportError:  # no resized variants, images keep their fingerprinted original
+    Image = features = None
+
+
+# --- Responsive images ---
+# `flask assets images` (and app start, when static/img changed) writes every image under
+# static/img to static/dist/img: the original with a content hash in its name, and with
+# Pillow installed AVIF/WebP variants at IMAGE_WIDTHS (never wider than the original).
+# static/dist/images.json records width/height and the variants of each image.
+#
+# In templates:
+#   {{ picture('img/College 1.png', 'Step 1', width=700) }}
+# -> <picture> with an AVIF and a WebP srcset and an <img> fallback that has width/height
+# (the browser reserves the space, no layout shift) and loading="lazy" decoding="async".
+# Images above the fold (the header logo) pass lazy=False.
+
+SOURCE_DIR = 'img'
+IMAGE_MANIFEST = 'images.json'
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg')
+# format -> (mimetype, Pillow save options); AVIF first, <picture> takes the first match
+VARIANT_FORMATS = {
+    'avif': ('image/avif', {'quality': 55, 'speed': 6}),
+    'webp': ('image/webp', {'quality': 80, 'method': 6}),
+}
+DEFAULT_WIDTHS = (64, 128, 320, 640, 960, 1280)
+
+NAME_RE = re.compile(r'[^a-z0-9/._-]+')
+
+
+def available_formats():
+    if Image is None:
+        return []
+    return [name for name in VARIANT_FORMATS if features.check(name)]
+
+
+def png_size(path):
+    # Width/height straight from the IHDR chunk, so the manifest doesn't need Pillow
+    with open(path, 'rb') as f:
+        header = f.read(24)
+    if header[:8] != b'\x89PNG\r\n\x1a\n':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+def image_size(path):
+    if path.endswith('.png'):
+        return png_size(path)
+    if Image is None:
+        return None
+    with Image.open(path) as image:
+        return image.size
+
+
+def _source_images(static_folder):
+    for root, _, files in os.walk(os.path.join(static_folder, SOURCE_DIR)):
+        for name in sorted(files):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                yield os.path.relpath(os.path.join(root, name), static_folder).replace(os.sep, '/')
+
+
+def _target(logical, suffix, data, ext):
+    # img/College 1.png -> dist/img/college-1-640.<hash>.webp (no spaces inside srcset)
+    base = NAME_RE.sub('-', os.path.splitext(logical)[0].lower())
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    return f'{DIST_DIR}/{base}{suffix}.{digest}{ext}'
+
+
+def _write_once(static_folder, target, data):
+    path = os.path.join(static_folder, target)
+    if not os.path.exists(path):
+        _write(path, data)
+
+
+def _encode(image, width, fmt):
+    height = round(image.height * width / image.width)
+    resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+    buffer = io.BytesIO()
+    resized.save(buffer, fmt.upper(), **VARIANT_FORMATS[fmt][1])
+    return buffer.getvalue()
+
+
+def build_images(static_folder, widths=DEFAULT_WIDTHS):
+    formats = available_formats()
+    images = {}
+    for logical in _source_images(static_folder):
+        path = os.path.join(static_folder, logical)
+        size = image_size(path)
+        if size is None:
+            continue
+        with open(path, 'rb') as f:
+            data = f.read()
+        original = _target(logical, '', data, os.path.splitext(logical)[1].lower())
+        _write_once(static_folder, original, data)
+        entry = {'width': size[0], 'height': size[1], 'src': original, 'bytes': len(data), 'variants': {}}
+        if formats:
+            with Image.open(path) as image:
+                image.load()
+                if image.mode not in ('RGB', 'RGBA'):
+                    image = image.convert('RGBA')
+                variant_widths = sorted({w for w in widths if w < image.width} | {image.width})
+                for fmt in formats:
+                    variants = []
+                    for width in variant_widths:
+                        encoded = _encode(image, width, fmt)
+                        target = _target(logical, f'-{width}', encoded, f'.{fmt}')
+                        _write_once(static_folder, target, encoded)
+                        variants.append([target, width, len(encoded)])
+                    entry['variants'][VARIANT_FORMATS[fmt][0]] = variants
+        images[logical] = entry
+    manifest = {'formats': formats, 'widths': list(widths), 'images': images}
+    _write(os.path.join(static_folder, DIST_DIR, IMAGE_MANIFEST),
+           json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8'))
+    return manifest
+
+
+def load_image_manifest(static_folder):
+    return read_manifest(os.path.join(static_folder, DIST_DIR, IMAGE_MANIFEST))
+
+
+def images_stale(static_folder, widths):
+    manifest_path = os.path.join(static_folder, DIST_DIR, IMAGE_MANIFEST)
+    try:
+        manifest = load_image_manifest(static_folder)
+    except ManifestError:
+        return True
+    if not manifest:
+        return True
+    # Pillow installed (or upgraded to AVIF) since the last build, or other widths
+    if manifest['formats'] != available_formats() or manifest['widths'] != list(widths):
+        return True
+    built = os.path.getmtime(manifest_path)
+    sources = list(_source_images(static_folder))
+    if set(sources) != set(manifest['images']):
+        return True
+    return any(os.path.getmtime(os.path.join(static_folder, logical)) > built for logical in sources)
+
+
+# --- Template helper ---
+
+def _attrs(values):
+    return ''.join(f' {name}="{escape(value)}"' for name, value in values.items() if value is not None)
+
+
+def picture(filename, alt, width=None, sizes=None, lazy=True, **attrs):
+    # attrs: extra <img> attributes (style, class_ ...)
+    attrs = {name.rstrip('_'): value for name, value in attrs.items()}
+    entry = current_app.extensions['image_manifest'].get(filename)
+    img = {'src': url_for('static', filename=filename), 'alt': alt}
+    if entry is None:
+        img['width'] = width
+        return Markup(f'<img{_attrs(img)}{_attrs(attrs)}>')
+
+    width = width or entry['width']
+    img['width'] = width
+    img['height'] = round(entry['height'] * width / entry['width'])
+    if lazy:
+        img['loading'] = 'lazy'
+        img['decoding'] = 'async'
+    sizes = sizes or f'(max-width: {width}px) 100vw, {width}px'
+    sources = []
+    for mimetype, variants in entry['variants'].items():
+        srcset = ', '.join(f"{url_for('static', filename=target)} {w}w" for target, w, _ in variants)
+        sources.append(f'<source{_attrs({"type": mimetype, "srcset": srcset, "sizes": sizes})}>')
+    return Markup(f'<picture>{"".join(sources)}<img{_attrs(img)}{_attrs(attrs)}></picture>')
+
+
+# --- Runtime ---
+
+def init_images(app):
+    app.config.setdefault('IMAGES_BUILD_ON_START', True)
+    app.config.setdefault('IMAGE_WIDTHS', DEFAULT_WIDTHS)
+    static_folder = app.static_folder
+    widths = app.config['IMAGE_WIDTHS']
+    if app.config['IMAGES_BUILD_ON_START'] and images_stale(static_folder, widths):
+        try:
+            build_images(static_folder, widths)
+        except OSError as e:
+            app.logger.warning('Image build skipped: %s', e)
+    images = load_image_manifest(static_folder).get('images', {})
+    app.extensions['image_manifest'] = images
+    # url_for('static', filename='img/logo.png') -> the fingerprinted copy (immutable cache)
+    asset_manifest = app.extensions.get('asset_manifest')
+    if asset_manifest is not None:
+        asset_manifest.update({logical: entry['src'] for logical, entry in images.items()})
+    app.jinja_env.globals['picture'] = picture
+
+
+@assets_cli.command('images')
+def images_command():
+    """Fingerprint static/img and write AVIF/WebP variants (with Pillow) into static/dist."""
+    manifest = build_images(current_app.static_folder, current_app.config['IMAGE_WIDTHS'])
+    if not manifest['formats']:
+        click.echo('Pillow with WebP/AVIF support is not installed: only fingerprinted originals', err=True)
+    for logical, entry in sorted(manifest['images'].items()):
+        full_width = {mimetype: variants[-1][2] for mimetype, variants in entry['variants'].items()}
+        sizes = ', '.join(f'{mimetype.split("/")[1]} {size:,} B' for mimetype, size in full_width.items())
+        click.echo(f"{logical} ({entry['width']}x{entry['height']}, {entry['bytes']:,} B)"
+                   f"{' -> full width ' + sizes if sizes else ''}")
@@ -0,0 +1,54 @@
+from flask import g, request
+
+
+# --- Language negotiation ---
+# Order: URL prefix (/<lang_code>/...) -> `lang_code` preference cookie (only written
+# by set_language) -> Accept-Language -> default. Nothing here touches the session, so
+# pages don't get a Set-Cookie, and `Vary` is only sent for the inputs actually read.
+
+LANG_COOKIE = 'lang_code'
+LANG_COOKIE_MAX_AGE = 365 * 24 * 60 * 60
+
+_supported_langs = []
+_default_lang = 'en'
+
+
+def init_language(app, supported_langs, default='en'):
+    global _supported_langs, _default_lang
+    _supported_langs = list(supported_langs)
+    _default_lang = default
+    app.after_request(_add_vary_headers)
+
+
+def get_lang_code():
+    # view_args is empty for unmatched URLs (404), so fall back to the first path segment
+    lang_code = (request.view_args or {}).get('lang_code') or request.path.split('/')[1]
+    if lang_code in _supported_langs:
+        return lang_code
+
+    vary = g.setdefault('lang_vary', set())
+    vary.add('Cookie')
+    lang_code = request.cookies.get(LANG_COOKIE)
+    if lang_code in _supported_langs:
+        return lang_code
+
+    vary.add('Accept-Language')
+    return request.accept_languages.best_match(_supported_langs) or _default_lang
+
+
+def url_lang_code():
+    # Supported lang_code from the matched URL, or '' (unknown codes are never echoed back)
+    lang_code = (request.view_args or {}).get('lang_code')
+    return lang_code if lang_code in _supported_langs else ''
+
+
+def set_lang_cookie(response, lang_code):
+    response.set_cookie(LANG_COOKIE, lang_code, max_age=LANG_COOKIE_MAX_AGE, samesite='Lax')
+    return response
+
+
+def _add_vary_headers(response):
+    vary = g.get('lang_vary')
+    if vary:
+        response.vary.update(vary)
+    return response
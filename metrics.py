@@ -0,0 +1,336 @@
+import fcntl
+import glob
+import json
+import os
+import threading
+import time
+
+from flask import Response, abort, before_render_template, g, request, template_rendered
+
+from language import url_lang_code
+
+
+# --- Prometheus-style /metrics ---
+# before/after_request time every request (by endpoint and lang_code), Jinja's
+# before_render_template/template_rendered signals time template renders, and redirects
+# are counted by source. Everything lives in plain dicts per process.
+#
+# With several gunicorn workers set METRICS_DIR (FLASK_METRICS_DIR): every worker writes
+# its numbers to METRICS_DIR/metrics-<pid>.json every METRICS_FLUSH_INTERVAL seconds and
+# /metrics adds up all files, so the answer doesn't depend on which worker was scraped.
+# Files of dead workers are folded into metrics-archive.json so counters never go down.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+REDIRECT_CODES = (301, 302, 303, 307, 308)
+ARCHIVE = 'metrics-archive.json'
+
+# name -> (type, help, buckets)
+METRICS = {
+    'gpa_http_request_duration_seconds': ('histogram', 'Request latency by endpoint and lang_code.', LATENCY_BUCKETS),
+    'gpa_http_responses_total': ('counter', 'Responses by endpoint and status code.', None),
+    'gpa_http_response_size_bytes': ('histogram', 'Response body size by endpoint.', SIZE_BUCKETS),
+    'gpa_template_render_seconds': ('histogram', 'Jinja render time by template.', LATENCY_BUCKETS),
+    'gpa_redirects_total': ('counter', 'Redirects by source path and status code.', None),
+    'gpa_course_store_clients': ('gauge', 'Clients with a saved course list.', None),
+    'gpa_access_log_dropped_total': ('counter', 'Access log records dropped because the queue was full.', None),
+    'gpa_ratelimit_decisions_total': ('counter', 'Rate limiter decisions by budget and outcome.', None),
+}
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(pairs, extra=()):
+    pairs = list(pairs) + list(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in pairs) + '}'
+
+
+def _format(value):
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class Metrics:
+    def __init__(self, app=None):
+        self.app = None
+        self.recording = False
+        self._lock = threading.Lock()
+        self._reset()
+        if app is not None:
+            self.init_app(app)
+
+    def _reset(self):
+        self._pid = os.getpid()
+        self._last_flush = 0.0
+        self.counters = {}
+        # (name, labels) -> [bucket counts..., sum, count]
+        self.histograms = {}
+
+    def init_app(self, app):
+        app.config.setdefault('METRICS_ENABLED', True)
+        app.config.setdefault('METRICS_DIR', None)
+        app.config.setdefault('METRICS_FLUSH_INTERVAL', 5.0)
+        # When set, /metrics needs "Authorization: Bearer <token>"
+        app.config.setdefault('METRICS_TOKEN', None)
+        self.app = app
+        app.extensions['metrics'] = self
+        # Registered early so the timer starts before the redirect table can answer
+        app.before_request(self._start_timer)
+        app.after_request(self._after_request)
+        before_render_template.connect(self._template_started, app)
+        template_rendered.connect(self._template_finished, app)
+        app.add_url_rule('/metrics', endpoint='metrics', view_func=self.view)
+
+    def start(self):
+        # Called once boot is done: the page cache warm-up and redirect table probes
+        # are not traffic, so nothing is recorded (or written to METRICS_DIR) before this
+        with self._lock:
+            self._reset()
+            self.recording = True
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+
+    def after_fork(self):
+        # Workers start from zero, not with a copy of the master's numbers
+        self.clear()
+
+    # --- Recording ---
+
+    def _check_fork(self):
+        # Preloaded gunicorn workers start with a copy of the master's numbers
+        if os.getpid() != self._pid:
+            self._reset()
+
+    def inc(self, name, labels, amount=1):
+        key = (name, labels)
+        with self._lock:
+            self._check_fork()
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def observe(self, name, labels, value):
+        buckets = METRICS[name][2]
+        key = (name, labels)
+        with self._lock:
+            self._check_fork()
+            data = self.histograms.get(key)
+            if data is None:
+                data = self.histograms[key] = [0] * len(buckets) + [0.0, 0]
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    data[i] += 1
+                    break
+            data[-2] += value
+            data[-1] += 1
+
+    def _start_timer(self):
+        g.metrics_start = time.perf_counter()
+
+    def _after_request(self, response):
+        config = self.app.config
+        if not config['METRICS_ENABLED'] or not self.recording:
+            return response
+        start = g.get('metrics_start')
+        endpoint = request.endpoint or 'unmatched'
+        lang_code = url_lang_code()
+        status = response.status_code
+        if start is not None:
+            self.observe('gpa_http_request_duration_seconds',
+                         (('endpoint', endpoint), ('lang_code', lang_code), ('method', request.method)),
+                         time.perf_counter() - start)
+        self.inc('gpa_http_responses_total', (('endpoint', endpoint), ('status', str(status))))
+        if response.content_length is not None:
+            self.observe('gpa_http_response_size_bytes', (('endpoint', endpoint),), response.content_length)
+        if status in REDIRECT_CODES:
+            # Known redirect paths keep their own label; anything else (catch-all routes)
+            # is grouped by endpoint so random URLs can't blow up the label count
+            table = self.app.extensions.get('redirect_table')
+            rule = request.url_rule
+            if (rule is not None and not rule.arguments) or (table is not None and request.path in table.table):
+                source = request.path
+            else:
+                source = endpoint
+            self.inc('gpa_redirects_total', (('source', source), ('status', str(status))))
+        if config['METRICS_DIR'] and time.monotonic() - self._last_flush > config['METRICS_FLUSH_INTERVAL']:
+            self.flush()
+        return response
+
+    def _template_started(self, sender, template, context, **extra):
+        g.setdefault('metrics_templates', []).append(time.perf_counter())
+
+    def _template_finished(self, sender, template, context, **extra):
+        starts = g.get('metrics_templates')
+        if starts and self.recording:
+            self.observe('gpa_template_render_seconds', (('template', template.name),),
+                         time.perf_counter() - starts.pop())
+
+    # --- Gauges (read when scraped or flushed) ---
+
+    def gauges(self):
+        store = self.app.extensions.get('course_store')
+        if store is None:
+            return {}
+        return {('gpa_course_store_clients', (('backend', store.backend),)): len(store)}
+
+    def _shared_gauges(self):
+        # Gauges that every worker sees the same value for (e.g. the SQLite course store)
+        store = self.app.extensions.get('course_store')
+        return {'gpa_course_store_clients'} if store is not None and store.shared else set()
+
+    # --- Multiprocess files ---
+
+    def snapshot(self):
+        gauges = self.gauges()
+        with self._lock:
+            self._check_fork()
+            return {
+                'pid': self._pid,
+                'counters': [[name, labels, value] for (name, labels), value in self.counters.items()],
+                'histograms': [[name, labels, data] for (name, labels), data in self.histograms.items()],
+                'gauges': [[name, labels, value] for (name, labels), value in gauges.items()],
+            }
+
+    def flush(self):
+        directory = self.app.config['METRICS_DIR']
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f'metrics-{os.getpid()}.json')
+        tmp = f'{path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp, path)
+        self._last_flush = time.monotonic()
+
+    def _read(self, path):
+        try:
+            with open(path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _collect_files(self, directory):
+        # Folds dead workers into the archive (under a lock, one scraper at a time)
+        # and returns the snapshots to add up
+        with open(os.path.join(directory, '.lock'), 'w') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            archive_path = os.path.join(directory, ARCHIVE)
+            archive = self._read(archive_path) or {'counters': [], 'histograms': [], 'gauges': []}
+            live = []
+            dead = []
+            for path in glob.glob(os.path.join(directory, 'metrics-*.json')):
+                if path == archive_path:
+                    continue
+                snapshot = self._read(path)
+                if snapshot is None:
+                    continue
+                if snapshot['pid'] == os.getpid() or _pid_alive(snapshot['pid']):
+                    live.append(snapshot)
+                else:
+                    dead.append((path, snapshot))
+            if dead:
+                counters, histograms, _ = merge([archive] + [s for _, s in dead])
+                archive = _dump(counters, histograms)
+                tmp = f'{archive_path}.tmp'
+                with open(tmp, 'w', encoding='utf-8') as f:
+                    json.dump(archive, f)
+                os.replace(tmp, archive_path)
+                for path, _ in dead:
+                    os.remove(path)
+        return [archive] + live
+
+    # --- Exposition ---
+
+    def collect(self):
+        directory = self.app.config['METRICS_DIR']
+        if not directory:
+            with self._lock:
+                self._check_fork()
+                counters, histograms = dict(self.counters), {k: list(v) for k, v in self.histograms.items()}
+            return counters, histograms, self.gauges()
+        self.flush()
+        counters, histograms, gauges = merge(self._collect_files(directory))
+        # Shared gauges come from this worker only, adding them up would count them N times
+        shared = self._shared_gauges()
+        gauges = {k: v for k, v in gauges.items() if k[0] not in shared}
+        gauges.update({k: v for k, v in self.gauges().items() if k[0] in shared})
+        return counters, histograms, gauges
+
+    def render(self):
+        counters, histograms, gauges = self.collect()
+        series = {name: [] for name in METRICS}
+        for (name, labels), value in sorted(counters.items()):
+            series[name].append(f'{name}{_labels(labels)} {_format(value)}')
+        for (name, labels), value in sorted(gauges.items()):
+            series[name].append(f'{name}{_labels(labels)} {_format(value)}')
+        for (name, labels), data in sorted(histograms.items()):
+            buckets = METRICS[name][2]
+            cumulative = 0
+            for bound, count in zip(buckets, data):
+                cumulative += count
+                series[name].append(f'{name}_bucket{_labels(labels, [("le", _format(bound))])} {cumulative}')
+            series[name].append(f'{name}_bucket{_labels(labels, [("le", "+Inf")])} {data[-1]}')
+            series[name].append(f'{name}_sum{_labels(labels)} {data[-2]!r}')
+            series[name].append(f'{name}_count{_labels(labels)} {data[-1]}')
+        lines = []
+        for name, (kind, help_text, _) in METRICS.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {kind}')
+            lines.extend(series[name])
+        return '\n'.join(lines) + '\n'
+
+    def view(self):
+        config = self.app.config
+        if not config['METRICS_ENABLED']:
+            abort(404)
+        token = config['METRICS_TOKEN']
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            abort(401)
+        response = Response(self.render(), mimetype='text/plain')
+        response.headers['Content-Type'] = 'text/plain; version=0.0.4; charset=utf-8'
+        response.cache_control.no_store = True
+        return response
+
+
+def _key(name, labels):
+    return name, tuple(tuple(pair) for pair in labels)
+
+
+def merge(snapshots):
+    counters, histograms, gauges = {}, {}, {}
+    for snapshot in snapshots:
+        for name, labels, value in snapshot.get('counters', []):
+            key = _key(name, labels)
+            counters[key] = counters.get(key, 0) + value
+        for name, labels, data in snapshot.get('histograms', []):
+            key = _key(name, labels)
+            if key in histograms:
+                histograms[key] = [a + b for a, b in zip(histograms[key], data)]
+            else:
+                histograms[key] = list(data)
+        for name, labels, value in snapshot.get('gauges', []):
+            key = _key(name, labels)
+            gauges[key] = gauges.get(key, 0) + value
+    return counters, histograms, gauges
+
+
+def _dump(counters, histograms):
+    return {
+        'counters': [[name, labels, value] for (name, labels), value in counters.items()],
+        'histograms': [[name, labels, data] for (name, labels), data in histograms.items()],
+        'gauges': [],
+    }
@@ -0,0 +1,107 @@
+import hashlib
+import os
+import threading
+import time
+
+from flask import Response, render_template, request
+from jinja2 import meta
+
+
+# --- Pre-rendered page cache ---
+# Calculator pages only vary by lang_code, so we render every (template, lang_code)
+# pair once and keep the bytes around with a strong ETag. In dev (auto reload on)
+# a page is re-rendered when its template or any template it includes changes.
+
+class CachedPage:
+    __slots__ = ('body', 'etag', 'sources')
+
+    def __init__(self, body, sources):
+        self.body = body
+        self.etag = hashlib.sha1(body).hexdigest()
+        # [(filename, mtime), ...] of the template and its includes
+        self.sources = sources
+
+    def is_stale(self):
+        for filename, mtime in self.sources:
+            try:
+                if os.path.getmtime(filename) != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+
+class PageCache:
+    def __init__(self, app=None):
+        self.app = None
+        self._pages = {}
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PAGE_CACHE_ENABLED', True)
+        # Pages carry no cookies, so shared caches/CDNs may store them
+        app.config.setdefault('PAGE_CACHE_MAX_AGE', 300)
+        self.app = app
+        app.extensions['page_cache'] = self
+
+    def __len__(self):
+        return len(self._pages)
+
+    def clear(self):
+        with self._lock:
+            self._pages.clear()
+
+    def _source_files(self, template_name):
+        # Template file plus everything reachable through include/extends/import
+        env = self.app.jinja_env
+        sources = {}
+        pending = [template_name]
+        while pending:
+            name = pending.pop()
+            if name in sources:
+                continue
+            source, filename, _ = env.loader.get_source(env, name)
+            sources[name] = filename
+            for ref in meta.find_referenced_templates(env.parse(source)):
+                if ref:
+                    pending.append(ref)
+        return [(filename, os.path.getmtime(filename)) for filename in sources.values() if filename]
+
+    def _render(self, template_name, context):
+        sources = self._source_files(template_name) if self.app.jinja_env.auto_reload else []
+        body = render_template(template_name, **context).encode('utf-8')
+        return CachedPage(body, sources)
+
+    def get(self, template_name, **context):
+        key = (template_name, tuple(sorted(context.items())))
+        page = self._pages.get(key)
+        if page is None or (self.app.jinja_env.auto_reload and page.is_stale()):
+            page = self._render(template_name, context)
+            with self._lock:
+                self._pages[key] = page
+        return page
+
+    def response(self, template_name, **context):
+        if not self.app.config['PAGE_CACHE_ENABLED']:
+            return render_template(template_name, **context)
+        page = self.get(template_name, **context)
+        resp = Response(page.body, mimetype='text/html')
+        resp.set_etag(page.etag)
+        resp.cache_control.public = True
+        resp.cache_control.max_age = self.app.config['PAGE_CACHE_MAX_AGE']
+        # Answers If-None-Match with an empty 304
+        return resp.make_conditional(request)
+
+    def warm(self, pages):
+        # pages: iterable of (template_name, context) pairs, rendered outside of any real request
+        start = time.perf_counter()
+        count = 0
+        with self.app.test_request_context('/'):
+            for template_name, context in pages:
+                self.get(template_name, **context)
+                count += 1
+        elapsed = time.perf_counter() - start
+        self.app.logger.info('Page cache warmed: %d pages in %.2fs', count, elapsed)
+        return count
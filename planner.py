@@ -0,0 +1,83 @@
+import math
+
+import numpy as np
+
+
+# --- Scenario grid for the GPA planning page ---
+# Same formula as calculate_required_gpa, but for every (semesters, goal GPA, credits per
+# semester) combination at once via broadcasting:
+#   required = ((current credits + n * credits) * goal - current credits * current GPA) / (n * credits)
+# Cells above 4.0 are out of reach, cells below 0 mean the goal is already safe. Extreme
+# credit ratios (1e-300 upcoming credits against 1e300 done) overflow to inf/NaN; those
+# cells get their own flag and no number.
+
+MAX_GPA = 4.0
+TOO_HIGH = 1
+ALREADY_MET = -1
+FEASIBLE = 0
+UNDEFINED = 2
+# Axis values are rounded to 4 places, a finer step only repeats them
+MIN_STEP = 1e-4
+# axis_size never counts past this, whatever the range (the cell limit is far lower)
+MAX_AXIS_SIZE = 10 ** 6
+
+
+def parse_range(value):
+    start, stop, step = (float(value[key]) for key in ('start', 'stop', 'step'))
+    # float() takes 'nan', 'inf' and '1e309'
+    if not all(math.isfinite(v) for v in (start, stop, step)):
+        raise ValueError('start, stop and step must be finite numbers')
+    return start, stop, step
+
+
+def parse_axis(value, low, high, integer=False):
+    # A list of numbers, or {"start": 2.5, "stop": 4.0, "step": 0.1} (stop inclusive)
+    if isinstance(value, dict):
+        start, stop, step = parse_range(value)
+        if step < MIN_STEP or stop < start:
+            raise ValueError(f'step must be at least {MIN_STEP} and stop >= start')
+        count = int(np.floor((stop - start) / step + 1e-9)) + 1
+        axis = np.round(start + step * np.arange(count), 4)
+    elif isinstance(value, list) and value:
+        if not all(type(v) in (int, float) for v in value):
+            raise ValueError('axis values must be numbers')
+        axis = np.array(value, dtype=np.float64)
+        if not np.isfinite(axis).all():
+            raise ValueError('axis values must be finite numbers')
+    else:
+        raise ValueError('axis must be a list or a range')
+    if (axis < low).any() or (axis > high).any():
+        raise ValueError(f'axis values must be between {low} and {high}')
+    if integer and (axis != np.floor(axis)).any():
+        raise ValueError('semesters must be whole numbers')
+    return axis
+
+
+def axis_size(value):
+    # Cell count check before anything is allocated
+    if isinstance(value, dict):
+        start, stop, step = parse_range(value)
+        if step < MIN_STEP:
+            return 0  # parse_axis rejects it
+        # Capped before int(): a huge range over a small step is still a float, not a count
+        return int(min(max((stop - start) / step, 0), MAX_AXIS_SIZE)) + 1
+    return len(value) if isinstance(value, list) else 0
+
+
+def required_gpa_grid(current_gpa, current_credits, goals, credits, semesters):
+    # Shape (len(semesters), len(goals), len(credits))
+    n = semesters[:, None, None]
+    goal = goals[None, :, None]
+    upcoming = n * credits[None, None, :]
+    with np.errstate(over='ignore', invalid='ignore'):
+        required = ((current_credits + upcoming) * goal - current_credits * current_gpa) / upcoming
+    # Flags come from the rounded value, like calculate_required_gpa's message
+    required = np.round(required, 2)
+    flags = np.where(required > MAX_GPA, TOO_HIGH, np.where(required < 0, ALREADY_MET, FEASIBLE))
+    flags[~np.isfinite(required)] = UNDEFINED
+    return required, flags
+
+
+def grid_to_list(required, flags):
+    # NaN/Infinity are not valid JSON: undefined cells are serialized as null
+    return np.where(flags == UNDEFINED, None, required).tolist()
@@ -0,0 +1,207 @@
+import cProfile
+import hashlib
+import hmac
+import os
+import pstats
+import random
+import sys
+import time
+from collections import defaultdict
+
+import click
+from flask import current_app, g, request
+from flask.cli import AppGroup
+
+from language import url_lang_code
+
+
+# --- Request profiling in production ---
+# A sampled request runs under cProfile from before_request to teardown_request, and the
+# profile lands in PROFILE_DIR/<endpoint>/<lang_code>/<time>-<pid>.prof. Each of those
+# directories keeps its newest PROFILE_MAX_FILES profiles. Which requests get profiled:
+#   - PROFILE_SAMPLE_RATE of all requests (0.01 = 1 in 100; default 0 = none)
+#   - any request with "X-Profile: <token>", token from `flask profile token`
+#     (HMAC of an expiry time with PROFILE_SECRET; without a secret the header is ignored).
+#     The response says which file it was written to (X-Profile-File).
+# Not sampling costs a random() call and a header lookup; a profiled request runs ~2x slower.
+#
+#   flask profile token --ttl 3600            value for the X-Profile header
+#   flask profile merge gpa_calculator ...    profiles -> <endpoint>.folded stacks for
+#                                             flamegraph.pl / speedscope
+
+PROFILE_HEADER = 'X-Profile'
+FILE_HEADER = 'X-Profile-File'
+# Frames below this many microseconds are left out of the folded stacks
+MIN_STACK_MICROSECONDS = 1
+
+profile_cli = AppGroup('profile', help='Request profiles: debug tokens and flamegraph stacks.')
+
+
+def sign(secret, expires):
+    return hmac.new(secret.encode(), f'profile:{expires}'.encode(), hashlib.sha256).hexdigest()
+
+
+def make_token(secret, ttl):
+    expires = int(time.time()) + ttl
+    return f'{expires}.{sign(secret, expires)}'
+
+
+def check_token(secret, token):
+    expires, _, signature = token.partition('.')
+    if not expires.isdigit() or int(expires) < time.time():
+        return False
+    return hmac.compare_digest(signature, sign(secret, int(expires)))
+
+
+class Profiler:
+    def __init__(self, app=None):
+        self.app = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('PROFILE_SAMPLE_RATE', 0.0)
+        app.config.setdefault('PROFILE_SECRET', None)
+        app.config.setdefault('PROFILE_DIR', os.path.join(app.instance_path, 'profiles'))
+        app.config.setdefault('PROFILE_MAX_FILES', 50)
+        self.app = app
+        app.extensions['profiler'] = self
+        app.before_request(self._start)
+        app.after_request(self._add_header)
+        app.teardown_request(self._finish)
+        app.cli.add_command(profile_cli)
+
+    def _wanted(self):
+        config = self.app.config
+        rate = config['PROFILE_SAMPLE_RATE']
+        if rate and random.random() < rate:
+            return True
+        token = request.headers.get(PROFILE_HEADER)
+        return bool(token and config['PROFILE_SECRET'] and check_token(config['PROFILE_SECRET'], token))
+
+    def _start(self):
+        if not self._wanted():
+            return
+        # URLs without a /<lang_code> prefix are the English pages (and the API)
+        directory = os.path.join(self.app.config['PROFILE_DIR'], request.endpoint or 'unmatched',
+                                 url_lang_code() or 'en')
+        filename = f'{time.time_ns()}-{os.getpid()}.prof'
+        profile = cProfile.Profile()
+        g.profile = (profile, directory, filename)
+        profile.enable()
+
+    def _add_header(self, response):
+        if 'profile' in g and PROFILE_HEADER in request.headers:
+            _, directory, filename = g.profile
+            response.headers[FILE_HEADER] = os.path.relpath(os.path.join(directory, filename),
+                                                            self.app.config['PROFILE_DIR'])
+        return response
+
+    def _finish(self, exc):
+        if 'profile' not in g:
+            return
+        profile, directory, filename = g.pop('profile')
+        profile.disable()
+        try:
+            os.makedirs(directory, exist_ok=True)
+            profile.dump_stats(os.path.join(directory, filename))
+            self._rotate(directory)
+        except OSError:
+            self.app.logger.exception('Could not write profile to %s', directory)
+
+    def _rotate(self, directory):
+        names = sorted(name for name in os.listdir(directory) if name.endswith('.prof'))
+        for name in names[:-self.app.config['PROFILE_MAX_FILES']]:
+            try:
+                os.remove(os.path.join(directory, name))
+            except FileNotFoundError:
+                pass  # another worker rotated it already
+
+
+# --- Folded stacks ---
+
+def _frame_name(func, prefixes):
+    filename, line, name = func
+    if filename == '~':
+        return name.replace(';', ',')  # <built-in method ...>
+    # app.py, flask/app.py, jinja2/... instead of absolute paths
+    prefix = next((prefix for prefix in prefixes if filename.startswith(prefix + os.sep)), None)
+    if prefix:
+        filename = filename[len(prefix) + 1:]
+    return f'{name} ({filename}:{line})'.replace(';', ',')
+
+
+def fold(stats, root_path):
+    # cProfile only records caller -> callee edges, not whole stacks: every function's time
+    # is split between its callees in proportion to the time spent through each edge.
+    # -> {'frame;frame;frame': microseconds}
+    callees = defaultdict(dict)
+    for func, (_, _, _, _, callers) in stats.items():
+        for caller, (_, _, _, edge_time) in callers.items():
+            callees[caller][func] = edge_time
+    folded = defaultdict(float)
+    prefixes = [root_path] + sorted((path for path in sys.path if path), key=len, reverse=True)
+
+    def walk(func, budget, stack, on_stack):
+        total_time = stats[func][3]
+        if total_time <= 0:
+            return
+        scale = min(budget / total_time, 1.0)
+        stack = stack + [_frame_name(func, prefixes)]
+        folded[';'.join(stack)] += stats[func][2] * scale * 1e6
+        for callee, edge_time in callees[func].items():
+            if callee in on_stack or edge_time * scale * 1e6 < MIN_STACK_MICROSECONDS:
+                continue
+            walk(callee, edge_time * scale, stack, on_stack | {callee})
+
+    for func, (_, _, _, total_time, callers) in stats.items():
+        if not callers:
+            walk(func, total_time, [], {func})
+    return {stack: round(value) for stack, value in folded.items() if round(value) > 0}
+
+
+def profile_files(directory, endpoint, lang_code=None):
+    root = os.path.join(directory, endpoint)
+    langs = [lang_code] if lang_code else sorted(os.listdir(root))
+    files = []
+    for lang in langs:
+        lang_dir = os.path.join(root, lang)
+        if os.path.isdir(lang_dir):
+            files += [os.path.join(lang_dir, name) for name in sorted(os.listdir(lang_dir)) if name.endswith('.prof')]
+    return files
+
+
+@profile_cli.command('token')
+@click.option('--ttl', default=3600, show_default=True, help='Seconds the token stays valid.')
+def token_command(ttl):
+    """Print a signed value for the X-Profile request header."""
+    secret = current_app.config['PROFILE_SECRET']
+    if not secret:
+        raise click.UsageError('Set PROFILE_SECRET (FLASK_PROFILE_SECRET) first')
+    click.echo(make_token(secret, ttl))
+
+
+@profile_cli.command('merge')
+@click.argument('endpoints', nargs=-1)
+@click.option('--lang', 'lang_code', help='Only profiles of this lang_code.')
+@click.option('--output', default='.', show_default=True, type=click.Path(file_okay=False),
+              help='Directory for the <endpoint>.folded files.')
+def merge_command(endpoints, lang_code, output):
+    """Merge the profiles of each endpoint into folded stacks (all endpoints by default)."""
+    directory = current_app.config['PROFILE_DIR']
+    if not os.path.isdir(directory):
+        raise click.ClickException(f'No profiles in {directory}')
+    os.makedirs(output, exist_ok=True)
+    for endpoint in endpoints or sorted(os.listdir(directory)):
+        files = profile_files(directory, endpoint, lang_code) if os.path.isdir(os.path.join(directory, endpoint)) else []
+        if not files:
+            click.echo(f'{endpoint}: no profiles', err=True)
+            continue
+        stats = pstats.Stats(*files).stats
+        stacks = fold(stats, current_app.root_path)
+        path = os.path.join(output, f'{endpoint}.folded')
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, microseconds in sorted(stacks.items()):
+                f.write(f'{stack} {microseconds}\n')
+        total = sum(stacks.values()) / 1000
+        click.echo(f'{endpoint}: {len(files)} profiles, {total / len(files):.1f} ms/request -> {path}')
@@ -0,0 +1,293 @@
+import fcntl
+import hashlib
+import math
+import mmap
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, request
+from werkzeug.wsgi import ClosingIterator
+
+
+# --- Per-client rate limiting + load shedding ---
+# WSGI middleware, so a refused request costs a dict lookup and a 60-byte response: no
+# request context, no URL routing, no 404 -> 302 round trip. In order:
+#   1. queue time (X-Request-Start from Heroku's router / nginx) over
+#      RATELIMIT_MAX_QUEUE_SECONDS -> 503, the client has most likely given up already
+#   2. more than RATELIMIT_MAX_CONCURRENT requests in this process (gthread workers) -> 503
+#   3. token bucket per (client IP, budget) -> 429 with Retry-After
+# Budgets are matched by longest path prefix (RATELIMIT_BUDGETS). Budgets without a
+# prefix are only charged by the app itself: page_not_found charges `not_found`, so a bot
+# walking random URLs runs out long before the page budget does.
+#
+# RATELIMIT_STORAGE = 'memory' keeps the buckets per process; 'shared' keeps them in an
+# mmap'd file (RATELIMIT_SHARED_PATH) so all gunicorn workers see the same budget.
+# Bucket times are wall-clock (time.time()), the file can outlive the processes that wrote
+# it; a clock step backwards only delays the refill, it never hands out extra tokens.
+# Decisions are counted in /metrics (gpa_ratelimit_decisions_total). The limiter only
+# acts after start() - gunicorn.conf.py calls it once a worker is up - so boot probes,
+# the test client and `flask` commands are never limited.
+
+# budget name -> (path prefix or None, tokens per second, burst)
+DEFAULT_BUDGETS = {
+    'api': ('/api/', 20.0, 200),
+    'pages': ('/', 10.0, 100),
+    'not_found': (None, 1.0, 30),
+}
+DEFAULT_EXEMPT = ('/static/', '/readyz', '/metrics')
+TOO_MANY_MESSAGE = 'Too many requests, slow down.\n'
+BUSY_MESSAGE = 'Server busy, try again.\n'
+
+SLOT = struct.Struct('<Qdd')  # key hash, tokens, last refill (time.time())
+GROUP_SLOTS = 8  # a key lives in one group of slots, locked together
+
+
+def parse_request_start(value, now):
+    # "t=1697040000.123" (nginx, seconds), "1697040000123" (Heroku, ms) or microseconds
+    try:
+        start = float(value.strip().removeprefix('t='))
+    except ValueError:
+        return None
+    if start > 1e14:
+        start /= 1e6
+    elif start > 1e11:
+        start /= 1e3
+    return max(now - start, 0.0)
+
+
+def _refill(tokens, last, now, rate, burst):
+    return min(burst, tokens + max(now - last, 0.0) * rate)
+
+
+class MemoryBuckets:
+    def __init__(self, max_keys):
+        self.max_keys = max_keys
+        self._buckets = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key, rate, burst, now):
+        # -> 0.0 when a token was taken, else seconds until the next one
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = [float(burst), now]
+                while len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+            tokens = _refill(bucket[0], bucket[1], now, rate, burst)
+            bucket[1] = now
+            if tokens >= 1.0:
+                bucket[0] = tokens - 1.0
+                return 0.0
+            bucket[0] = tokens
+            return (1.0 - tokens) / rate
+
+    def after_fork(self):
+        pass
+
+
+class SharedBuckets:
+    # Fixed-size hash table in a file every worker maps. A key hashes to a group of
+    # GROUP_SLOTS slots; the group is locked with fcntl (between processes) and a
+    # threading.Lock (between threads of one worker). A full group reuses its stalest slot.
+    def __init__(self, path, slots):
+        self.path = path
+        self.groups = max(slots // GROUP_SLOTS, 1)
+        self.size = self.groups * GROUP_SLOTS * SLOT.size
+        self._lock = threading.Lock()
+        self._open()
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < self.size:
+            os.ftruncate(self._fd, self.size)
+        self._map = mmap.mmap(self._fd, self.size)
+
+    def after_fork(self):
+        # fcntl locks belong to a process; the worker needs its own descriptor
+        self._lock = threading.Lock()
+        self._open()
+
+    def take(self, key, rate, burst, now):
+        digest = int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), 'little') or 1
+        start = (digest % self.groups) * GROUP_SLOTS * SLOT.size
+        length = GROUP_SLOTS * SLOT.size
+        with self._lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, length, start)
+            try:
+                offset = stalest = None
+                oldest = None
+                for i in range(GROUP_SLOTS):
+                    slot = start + i * SLOT.size
+                    slot_key, tokens, last = SLOT.unpack_from(self._map, slot)
+                    if slot_key == digest:
+                        offset = slot
+                        break
+                    if oldest is None or slot_key == 0 or last < oldest:
+                        stalest, oldest = slot, (-1.0 if slot_key == 0 else last)
+                if offset is None:
+                    offset, tokens, last = stalest, float(burst), now
+                tokens = _refill(tokens, last, now, rate, burst)
+                wait = 0.0
+                if tokens >= 1.0:
+                    tokens -= 1.0
+                else:
+                    wait = (1.0 - tokens) / rate
+                SLOT.pack_into(self._map, offset, digest, tokens, now)
+                return wait
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, length, start)
+
+
+class RateLimiter:
+    def __init__(self, app=None):
+        self.app = None
+        self.active = False
+        self.buckets = None
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        config.setdefault('RATELIMIT_ENABLED', True)
+        config.setdefault('RATELIMIT_BUDGETS', DEFAULT_BUDGETS)
+        config.setdefault('RATELIMIT_EXEMPT', DEFAULT_EXEMPT)
+        config.setdefault('RATELIMIT_STORAGE', 'memory')
+        config.setdefault('RATELIMIT_SHARED_PATH', os.path.join(app.instance_path, 'ratelimit.bin'))
+        config.setdefault('RATELIMIT_MAX_CLIENTS', 65536)
+        # Client IP from the last X-Forwarded-For entry (what Heroku's router / nginx saw).
+        # Behind a proxy REMOTE_ADDR is the proxy: every visitor would share one bucket
+        config.setdefault('RATELIMIT_TRUST_FORWARDED', False)
+        config.setdefault('RATELIMIT_MAX_QUEUE_SECONDS', 10.0)
+        config.setdefault('RATELIMIT_MAX_CONCURRENT', None)
+        self.app = app
+        app.extensions['rate_limiter'] = self
+        app.wsgi_app = RateLimitMiddleware(app.wsgi_app, self)
+
+    def start(self):
+        config = self.app.config
+        if not config['RATELIMIT_ENABLED']:
+            return
+        if config['RATELIMIT_STORAGE'] == 'shared':
+            os.makedirs(os.path.dirname(config['RATELIMIT_SHARED_PATH']), exist_ok=True)
+            self.buckets = SharedBuckets(config['RATELIMIT_SHARED_PATH'], config['RATELIMIT_MAX_CLIENTS'])
+        else:
+            self.buckets = MemoryBuckets(config['RATELIMIT_MAX_CLIENTS'])
+        self.active = True
+
+    def after_fork(self):
+        self._in_flight = 0
+        self._in_flight_lock = threading.Lock()
+        if self.buckets is not None:
+            self.buckets.after_fork()
+
+    def _count(self, budget, decision):
+        metrics = self.app.extensions.get('metrics')
+        if metrics is not None and metrics.recording:
+            metrics.inc('gpa_ratelimit_decisions_total', (('budget', budget), ('decision', decision)))
+
+    def _release(self):
+        with self._in_flight_lock:
+            self._in_flight -= 1
+
+    def client_key(self, environ):
+        if self.app.config['RATELIMIT_TRUST_FORWARDED']:
+            forwarded = environ.get('HTTP_X_FORWARDED_FOR')
+            if forwarded:
+                return forwarded.rsplit(',', 1)[-1].strip()
+        return environ.get('REMOTE_ADDR') or '-'
+
+    def budget_for(self, path):
+        config = self.app.config
+        if path.startswith(config['RATELIMIT_EXEMPT']):
+            return None
+        best = None
+        for name, (prefix, _, _) in config['RATELIMIT_BUDGETS'].items():
+            if prefix is not None and path.startswith(prefix) and (best is None or len(prefix) > len(best[1])):
+                best = (name, prefix)
+        return best and best[0]
+
+    def hit(self, budget, environ):
+        # -> seconds to wait (0.0 = allowed); counts the decision
+        if not self.active:
+            return 0.0
+        _, rate, burst = self.app.config['RATELIMIT_BUDGETS'][budget]
+        wait = self.buckets.take(f'{budget}:{self.client_key(environ)}', rate, burst, time.time())
+        self._count(budget, 'limited' if wait else 'allowed')
+        return wait
+
+    def limit(self, budget):
+        # For views: charge `budget` for the current request -> 429 response, or None
+        wait = self.hit(budget, request.environ)
+        if not wait:
+            return None
+        resp = Response(TOO_MANY_MESSAGE, 429, mimetype='text/plain')
+        resp.headers.update(_refusal_headers(wait))
+        return resp
+
+
+def _refusal_headers(retry_after):
+    return [('Retry-After', str(max(math.ceil(retry_after), 1))), ('Cache-Control', 'no-store')]
+
+
+def _plain_response(start_response, status, message, retry_after):
+    body = message.encode()
+    start_response(status, [
+        ('Content-Type', 'text/plain; charset=utf-8'),
+        ('Content-Length', str(len(body))),
+    ] + _refusal_headers(retry_after))
+    return [body]
+
+
+class RateLimitMiddleware:
+    def __init__(self, wsgi_app, limiter):
+        self.wsgi_app = wsgi_app
+        self.limiter = limiter
+
+    def __call__(self, environ, start_response):
+        limiter = self.limiter
+        if not limiter.active:
+            return self.wsgi_app(environ, start_response)
+        config = limiter.app.config
+        budget = limiter.budget_for(environ.get('PATH_INFO') or '/')
+        if budget is None:
+            return self.wsgi_app(environ, start_response)
+
+        max_queue = config['RATELIMIT_MAX_QUEUE_SECONDS']
+        request_start = environ.get('HTTP_X_REQUEST_START')
+        if max_queue and request_start:
+            queued = parse_request_start(request_start, time.time())
+            if queued is not None and queued > max_queue:
+                limiter._count(budget, 'shed_queue')
+                return _plain_response(start_response, '503 Service Unavailable', BUSY_MESSAGE, 1)
+
+        wait = limiter.hit(budget, environ)
+        if wait:
+            return _plain_response(start_response, '429 Too Many Requests', TOO_MANY_MESSAGE, wait)
+
+        max_concurrent = config['RATELIMIT_MAX_CONCURRENT']
+        if not max_concurrent:
+            return self.wsgi_app(environ, start_response)
+        with limiter._in_flight_lock:
+            if limiter._in_flight >= max_concurrent:
+                shed = True
+            else:
+                shed = False
+                limiter._in_flight += 1
+        if shed:
+            limiter._count(budget, 'shed_concurrency')
+            return _plain_response(start_response, '503 Service Unavailable', BUSY_MESSAGE, 1)
+        try:
+            response = self.wsgi_app(environ, start_response)
+        except BaseException:
+            limiter._release()
+            raise
+        # Streamed bodies (export_courses, NDJSON batch_gpa) are still being produced after
+        # this returns: the slot is held until the server closes the iterable
+        return ClosingIterator(response, limiter._release)
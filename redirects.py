@@ -0,0 +1,115 @@
+import sys
+
+import click
+from flask import current_app, redirect, request
+
+from freeze import iter_urls
+
+
+# --- Precompiled redirect table ---
+# At startup every page/redirect URL (and its trailing-slash twin) is probed once with the
+# test client, redirect chains are followed to the final page, and the result is kept as
+# {source path: final target}. A before_request hook answers those paths with a single
+# 301, so e.g. /en/gpa-calculator/ goes straight to /gpa-calculator.
+
+MAX_HOPS = 10
+REDIRECT_CODES = (301, 302, 307, 308)
+
+
+class RedirectLoopError(Exception):
+    pass
+
+
+class RedirectTable:
+    def __init__(self, app=None):
+        self.app = None
+        self.table = {}
+        self.compiled = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.app = app
+        app.extensions['redirect_table'] = self
+        app.before_request(self._redirect)
+        app.cli.add_command(check_redirects_command)
+
+    def __len__(self):
+        return len(self.table)
+
+    def resolve(self, path):
+        return self.table.get(path, path)
+
+    def _redirect(self):
+        if not self.compiled:
+            return None
+        target = self.table.get(request.path)
+        if target is None:
+            return None
+        if request.query_string:
+            target = f'{target}?{request.query_string.decode("latin-1")}'
+        return redirect(target, code=301)
+
+    def follow(self, client, url):
+        # Returns (first status, final url, final status, hops)
+        response = client.get(url)
+        first_status = response.status_code
+        seen = {url}
+        hops = 0
+        while response.status_code in REDIRECT_CODES:
+            url = response.headers['Location']
+            if url in seen:
+                raise RedirectLoopError(' -> '.join(list(seen) + [url]))
+            if hops >= MAX_HOPS:
+                raise RedirectLoopError(f'more than {MAX_HOPS} hops from {url}')
+            seen.add(url)
+            hops += 1
+            response = client.get(url)
+        return first_status, url, response.status_code, hops
+
+    def candidate_urls(self):
+        for url in iter_urls(self.app):
+            yield url
+            if url.endswith('/'):
+                if url != '/':
+                    yield url.rstrip('/')
+            elif '.' not in url.rsplit('/', 1)[-1]:
+                yield url + '/'
+
+    def compile(self):
+        self.compiled = False
+        table = {}
+        client = self.app.test_client()
+        for url in self.candidate_urls():
+            first_status, target, final_status, _ = self.follow(client, url)
+            # Only permanent redirects that end on a real page are collapsed
+            if first_status == 301 and final_status == 200 and target != url:
+                table[url] = target
+        self.table = table
+        self.compiled = True
+        return table
+
+
+@click.command('check-redirects')
+def check_redirects_command():
+    """Fail if any known URL needs more than one redirect hop or loops."""
+    table = current_app.extensions['redirect_table']
+    client = current_app.test_client()
+    failures = []
+    checked = 0
+    for url in sorted(set(table.candidate_urls()) | set(table.table)):
+        checked += 1
+        try:
+            _, target, final_status, hops = table.follow(client, url)
+        except RedirectLoopError as e:
+            failures.append(f'{url}: redirect loop ({e})')
+            continue
+        if hops > 1:
+            failures.append(f'{url}: {hops} hops to {target}')
+        elif hops == 1 and final_status != 200:
+            failures.append(f'{url}: redirects to {target} which returns {final_status}')
+    for failure in failures:
+        click.echo(failure, err=True)
+    click.echo(f'Checked {checked} URLs, {len(table)} compiled redirects, {len(failures)} problems')
+    if failures:
+        sys.exit(1)
@@ -0,0 +1,215 @@
+import gzip
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape, quoteattr
+
+from flask import Response, abort, request
+
+try:
+    import brotli
+except ImportError:  # gzip only
+    brotli = None
+
+
+# --- Generated sitemap ---
+# The URL list comes from the app (a @sitemap.source function yielding SitemapUrl), so it
+# can't drift from the routes. lastmod is the template file's mtime, every language
+# version lists all of its hreflang alternates plus x-default. The XML is built once
+# (at boot warm-up or on the first request) and kept in memory together with gzip/brotli
+# variants and an ETag - a crawler hit is a dict lookup, a 304 costs even less.
+#
+# Pages whose template says <meta name="robots" content="noindex"> are left out, and so
+# are they from the hreflang alternates of the pages that stay.
+#
+# More than SITEMAP_MAX_URLS urls (or SITEMAP_MAX_BYTES of XML) are split into
+# /sitemap-1.xml, /sitemap-2.xml, ... and /sitemap.xml becomes the sitemap index.
+
+URLSET_OPEN = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+               '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+               'xmlns:xhtml="http://www.w3.org/1999/xhtml">\n')
+URLSET_CLOSE = '</urlset>\n'
+INDEX_OPEN = ('<?xml version="1.0" encoding="UTF-8"?>\n'
+              '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+INDEX_CLOSE = '</sitemapindex>\n'
+NOINDEX_RE = re.compile(r'<meta\s+name=["\']robots["\']\s+content=["\'][^"\']*\bnoindex\b', re.I)
+
+
+def _w3c_datetime(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).replace(microsecond=0).isoformat()
+
+
+class SitemapUrl:
+    __slots__ = ('path', 'template', 'alternates', 'priority')
+
+    def __init__(self, path, template, alternates=None, priority=0.8):
+        self.path = path
+        # lastmod comes from this template's mtime
+        self.template = template
+        # {hreflang: path} of every language version (including this one), or None
+        self.alternates = alternates
+        self.priority = priority
+
+
+class SitemapDocument:
+    __slots__ = ('body', 'encoded', 'etag', 'last_modified')
+
+    def __init__(self, text, last_modified):
+        self.body = text.encode('utf-8')
+        self.etag = hashlib.sha1(self.body).hexdigest()
+        self.last_modified = last_modified
+        # Compressed once at the highest level, it's served many thousand times
+        self.encoded = {'gzip': gzip.compress(self.body, 9, mtime=0)}
+        if brotli is not None:
+            self.encoded['br'] = brotli.compress(self.body, quality=11)
+
+
+class Sitemap:
+    def __init__(self, app=None):
+        self.app = None
+        self._source = None
+        # [index or urlset, part 1, part 2, ...]
+        self.documents = None
+        # Part numbers of the current build; the same list object is handed to
+        # `flask freeze` as the values of <part>, so it's updated in place
+        self.parts = []
+        self._sources = []
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('SITE_URL', 'https://gpacalculatorcollege.com')
+        # Protocol limits for a single sitemap file
+        app.config.setdefault('SITEMAP_MAX_URLS', 50000)
+        app.config.setdefault('SITEMAP_MAX_BYTES', 50 * 1024 * 1024)
+        app.config.setdefault('SITEMAP_MAX_AGE', 3600)
+        self.app = app
+        app.extensions['sitemap'] = self
+        app.add_url_rule('/sitemap.xml', endpoint='sitemap', view_func=self.view, strict_slashes=False)
+        app.add_url_rule('/sitemap-<int:part>.xml', endpoint='sitemap_part', view_func=self.part_view)
+
+    def source(self, func):
+        # Decorator: func() yields SitemapUrl, called inside a request context (url_for works)
+        self._source = func
+        return func
+
+    # --- Building ---
+
+    def _template_source(self, template_name):
+        env = self.app.jinja_env
+        source, filename, _ = env.loader.get_source(env, template_name)
+        return source, filename
+
+    def _url_xml(self, entry, site_url, lastmod, excluded):
+        lines = [f'<url>\n<loc>{escape(site_url + entry.path)}</loc>\n']
+        if entry.alternates:
+            for hreflang, path in entry.alternates.items():
+                if path in excluded:
+                    continue
+                lines.append(f'<xhtml:link rel="alternate" hreflang={quoteattr(hreflang)} '
+                             f'href={quoteattr(site_url + path)}/>\n')
+        lines.append(f'<lastmod>{_w3c_datetime(lastmod)}</lastmod>\n'
+                     f'<priority>{entry.priority:.2f}</priority>\n</url>\n')
+        return ''.join(lines)
+
+    def _split(self, fragments):
+        # fragments: [(xml, mtime)] -> [[(xml, mtime), ...], ...] within both size limits
+        config = self.app.config
+        max_urls = config['SITEMAP_MAX_URLS']
+        max_bytes = config['SITEMAP_MAX_BYTES'] - len(URLSET_OPEN) - len(URLSET_CLOSE)
+        parts = [[]]
+        size = 0
+        for xml, mtime in fragments:
+            length = len(xml.encode('utf-8'))
+            if parts[-1] and (len(parts[-1]) >= max_urls or size + length > max_bytes):
+                parts.append([])
+                size = 0
+            parts[-1].append((xml, mtime))
+            size += length
+        return parts
+
+    def _urlset(self, fragments):
+        text = URLSET_OPEN + ''.join(xml for xml, _ in fragments) + URLSET_CLOSE
+        return SitemapDocument(text, max((mtime for _, mtime in fragments), default=None))
+
+    def build(self):
+        site_url = self.app.config['SITE_URL'].rstrip('/')
+        sources = []
+        fragments = []
+        entries = []
+        excluded = set()
+        with self.app.test_request_context('/'):
+            for entry in self._source():
+                source, filename = self._template_source(entry.template)
+                mtime = os.path.getmtime(filename)
+                sources.append((filename, mtime))
+                if NOINDEX_RE.search(source):
+                    excluded.add(entry.path)
+                else:
+                    entries.append((entry, mtime))
+        for entry, mtime in entries:
+            fragments.append((self._url_xml(entry, site_url, mtime, excluded), mtime))
+        parts = self._split(fragments)
+        if len(parts) == 1:
+            documents = [self._urlset(parts[0])]
+        else:
+            documents = [None] + [self._urlset(part) for part in parts]
+            lines = [INDEX_OPEN]
+            for number, document in enumerate(documents[1:], 1):
+                lines.append(f'<sitemap>\n<loc>{escape(f"{site_url}/sitemap-{number}.xml")}</loc>\n'
+                             f'<lastmod>{_w3c_datetime(document.last_modified)}</lastmod>\n</sitemap>\n')
+            lines.append(INDEX_CLOSE)
+            documents[0] = SitemapDocument(''.join(lines), max(d.last_modified for d in documents[1:]))
+        with self._lock:
+            self.documents = documents
+            self._sources = sources
+            self.parts[:] = range(1, len(documents))
+        self.app.logger.info('Sitemap built: %d urls in %d file(s)', len(fragments), len(parts))
+        return documents
+
+    def _is_stale(self):
+        for filename, mtime in self._sources:
+            try:
+                if os.path.getmtime(filename) != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def get(self, number):
+        documents = self.documents
+        if documents is None or (self.app.jinja_env.auto_reload and self._is_stale()):
+            documents = self.build()
+        if number >= len(documents):
+            abort(404)
+        return documents[number]
+
+    # --- Serving ---
+
+    def _respond(self, document):
+        accept = request.accept_encodings
+        encoding = next((name for name in ('br', 'gzip') if name in document.encoded and accept[name]), None)
+        resp = Response(document.encoded[encoding] if encoding else document.body, mimetype='application/xml')
+        if encoding:
+            # Already encoded, the Compressor leaves it alone
+            resp.headers['Content-Encoding'] = encoding
+        resp.vary.add('Accept-Encoding')
+        # Same weak-ETag convention as the Compressor for encoded variants
+        resp.set_etag(document.etag, weak=bool(encoding))
+        if document.last_modified is not None:
+            resp.last_modified = document.last_modified
+        resp.cache_control.public = True
+        resp.cache_control.max_age = self.app.config['SITEMAP_MAX_AGE']
+        return resp.make_conditional(request)
+
+    def view(self):
+        return self._respond(self.get(0))
+
+    def part_view(self, part):
+        # Parts only exist while the sitemap is split (404 otherwise, see get())
+        if part < 1:
+            abort(404)
+        return self._respond(self.get(part))
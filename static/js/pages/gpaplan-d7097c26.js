@@ -0,0 +1,82 @@
+document.addEventListener('DOMContentLoaded', function() {
+        const calculateBtn = document.getElementById('calculateRequiredGpaBtn');
+        const clearBtn = document.getElementById('clearPlanningBtn');
+        const resultDiv = document.getElementById('requiredGpaResult');
+
+        calculateBtn.addEventListener('click', async function() {
+            const goalGpa = document.getElementById('goalGpa').value;
+            const currentGpa = document.getElementById('currentGpa').value;
+            const currentTotalCredits = document.getElementById('currentTotalCredits').value;
+            const nextSemesterCredits = document.getElementById('nextSemesterCredits').value;
+
+            if (!goalGpa || !currentGpa || !currentTotalCredits || !nextSemesterCredits) {
+                resultDiv.innerHTML = '<p class="error">Please fill in all the fields.</p>';
+                resultDiv.style.display = 'block';
+                return;
+            }
+
+            try {
+                const response = await fetch('/api/calculate_required_gpa', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({
+                        goalGpa: goalGpa,
+                        currentGpa: currentGpa,
+                        currentTotalCredits: currentTotalCredits,
+                        nextSemesterCredits: nextSemesterCredits
+                    })
+                });
+
+                const result = await response.json();
+
+                if (result.status === 'success') {
+                    if (result.requiredGpa > 4.0 || result.requiredGpa < 0) {
+                        resultDiv.innerHTML = `<p class="result-message error">${result.message}</p>
+                                               <p class="result-gpa">${result.requiredGpa}</p>`;
+                    } else {
+                        resultDiv.innerHTML = `<p class="result-message">To achieve your goal GPA, you need to get a GPA of:</p>
+                                               <p class="result-gpa">${result.requiredGpa}</p>`;
+                    }
+                    resultDiv.style.display = 'block';
+                } else {
+                    resultDiv.innerHTML = `<p class="error">${result.message}</p>`;
+                    resultDiv.style.display = 'block';
+                }
+
+            } catch (error) {
+                console.error('Error:', error);
+                resultDiv.innerHTML = '<p class="error">An error occurred while calculating GPA. Please try again.</p>';
+                resultDiv.style.display = 'block';
+            }
+        });
+
+        clearBtn.addEventListener('click', function() {
+            document.getElementById('goalGpa').value = '';
+            document.getElementById('currentGpa').value = '';
+            document.getElementById('currentTotalCredits').value = '';
+            document.getElementById('nextSemesterCredits').value = '';
+            resultDiv.style.display = 'none';
+            resultDiv.innerHTML = '';
+        });
+
+        // Toggle functionality for FAQ items
+            const faqItems = document.querySelectorAll('.faq-item');
+
+            faqItems.forEach(item => {
+                const header = item.querySelector('h3');
+                const paragraph = item.querySelector('p');
+
+                // Set initial state to open
+                paragraph.style.maxHeight = paragraph.scrollHeight + 'px';
+
+                header.addEventListener('click', () => {
+                    if (paragraph.style.maxHeight === '0px') {
+                        paragraph.style.maxHeight = paragraph.scrollHeight + 'px';
+                    } else {
+                        paragraph.style.maxHeight = '0';
+                    }
+                });
+            });
+    });
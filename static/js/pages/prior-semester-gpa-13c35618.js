@@ -0,0 +1,76 @@
+document.addEventListener('DOMContentLoaded', function() {
+        const calculateBtn = document.getElementById('calculateCombinedGpaBtn');
+        const clearBtn = document.getElementById('clearCombinedBtn');
+        const resultDiv = document.getElementById('combinedGpaResult');
+
+        calculateBtn.addEventListener('click', async function() {
+            const oldTotalCredits = document.getElementById('oldTotalCredits').value;
+            const oldGpa = document.getElementById('oldGpa').value;
+            const newSemesterCredits = document.getElementById('newSemesterCredits').value;
+            const newSemesterGpa = document.getElementById('newSemesterGpa').value;
+
+            if (!oldTotalCredits || !oldGpa || !newSemesterCredits || !newSemesterGpa) {
+                resultDiv.innerHTML = '<p class="error">Please fill in all the fields.</p>';
+                resultDiv.style.display = 'block';
+                return;
+            }
+
+            try {
+                const response = await fetch('/calculate_combined_gpa', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({
+                        oldTotalCredits: oldTotalCredits,
+                        oldGpa: oldGpa,
+                        newSemesterCredits: newSemesterCredits,
+                        newSemesterGpa: newSemesterGpa
+                    })
+                });
+
+                const result = await response.json();
+
+                if (result.status === 'success') {
+                    resultDiv.innerHTML = `<p class="result-message">Your new combined cumulative GPA is:</p>
+                                           <p class="result-gpa">${result.combinedGpa}</p>`;
+                    resultDiv.style.display = 'block';
+                } else {
+                    resultDiv.innerHTML = `<p class="error">${result.message}</p>`;
+                    resultDiv.style.display = 'block';
+                }
+            } catch (error) {
+                console.error('Error:', error);
+                resultDiv.innerHTML = '<p class="error">An error occurred while calculating GPA. Please try again.</p>';
+                resultDiv.style.display = 'block';
+            }
+        });
+
+        clearBtn.addEventListener('click', function() {
+            document.getElementById('oldTotalCredits').value = '';
+            document.getElementById('oldGpa').value = '';
+            document.getElementById('newSemesterCredits').value = '';
+            document.getElementById('newSemesterGpa').value = '';
+            resultDiv.style.display = 'none';
+            resultDiv.innerHTML = '';
+        });
+
+        // Toggle functionality for FAQ items
+            const faqItems = document.querySelectorAll('.faq-item');
+
+            faqItems.forEach(item => {
+                const header = item.querySelector('h3');
+                const paragraph = item.querySelector('p');
+
+                // Set initial state to open
+                paragraph.style.maxHeight = paragraph.scrollHeight + 'px';
+
+                header.addEventListener('click', () => {
+                    if (paragraph.style.maxHeight === '0px') {
+                        paragraph.style.maxHeight = paragraph.scrollHeight + 'px';
+                    } else {
+                        paragraph.style.maxHeight = '0';
+                    }
+                });
+            });
+    });
@@ -0,0 +1,131 @@
+document.addEventListener('DOMContentLoaded', () => {
+            const methodButtons = document.querySelectorAll('.method-switch button');
+            const methods = document.querySelectorAll('.method');
+            const percentageDisplay = document.getElementById('percentageDisplay');
+            const cgpaDisplay = document.getElementById('cgpaDisplay');
+            const semestersDiv = document.getElementById('semesters');
+
+            function showError(message) {
+                const errorNotification = document.createElement('div');
+                errorNotification.style.position = 'fixed';
+                errorNotification.style.top = '20px';
+                errorNotification.style.right = '20px';
+                errorNotification.style.padding = '12px 20px';
+                errorNotification.style.backgroundColor = 'var(--accent-color)';
+                errorNotification.style.color = 'white';
+                errorNotification.style.borderRadius = '5px';
+                errorNotification.style.boxShadow = 'var(--box-shadow)';
+                errorNotification.style.zIndex = '1000';
+                errorNotification.style.fontFamily = 'Poppins, sans-serif';
+                errorNotification.textContent = message;
+                document.body.appendChild(errorNotification);
+                setTimeout(() => {
+                    errorNotification.remove();
+                }, 3000);
+            }
+
+            function updateResults(cgpa, percentage) {
+                cgpaDisplay.textContent = cgpa.toFixed(2);
+                percentageDisplay.textContent = percentage.toFixed(2) + '%';
+            }
+
+            function clearAllFields() {
+                const activeMethod = document.querySelector('.method.active');
+                if (activeMethod.id === 'method1') {
+                    document.getElementById('sgpa').value = '';
+                } else if (activeMethod.id === 'method2') {
+                    semestersDiv.innerHTML = '';
+                    addSemesterRow();
+                    addSemesterRow();
+                }
+                updateResults(0.00, 0.00);
+            }
+
+            function calculatePercentage1() {
+                const sgpa = parseFloat(document.getElementById('sgpa').value);
+                if (isNaN(sgpa) || sgpa < 0 || sgpa > 10) {
+                    showError('Error: Please enter a valid SGPA (0-10).');
+                    return;
+                }
+                const percentage = (sgpa * 10) - 7.5;
+                updateResults(sgpa, percentage);
+            }
+
+            function calculatePercentage2() {
+                const inputs = document.querySelectorAll('#semesters input');
+                let sum = 0;
+                let count = 0;
+                let isValid = true;
+                inputs.forEach(input => {
+                    const sgpa = parseFloat(input.value);
+                    if (!isNaN(sgpa) && sgpa >= 0 && sgpa <= 10) {
+                        sum += sgpa;
+                        count++;
+                    } else {
+                        isValid = false;
+                    }
+                });
+
+                if (!isValid) {
+                    showError('Error: Please enter valid SGPA values (0-10) for all semesters.');
+                    return;
+                }
+                
+                if (count === 0) {
+                    showError('Error: Please enter at least one SGPA.');
+                    return;
+                }
+
+                const cgpa = sum / count;
+                const percentage = (cgpa * 10) - 7.5;
+                updateResults(cgpa, percentage);
+            }
+
+            function addSemesterRow() {
+                const newSemester = document.createElement('div');
+                newSemester.className = 'semester-item';
+                newSemester.innerHTML = `
+                    <input type="number" placeholder="Enter Semester SGPA" step="0.1" min="0" max="10">
+                    <button class="remove-btn"><i class="fa-solid fa-trash"></i></button>
+                `;
+                semestersDiv.appendChild(newSemester);
+                newSemester.querySelector('.remove-btn').addEventListener('click', () => {
+                    newSemester.remove();
+                });
+            }
+
+            methodButtons.forEach(button => {
+                button.addEventListener('click', () => {
+                    methodButtons.forEach(b => b.classList.remove('active'));
+                    button.classList.add('active');
+                    methods.forEach(method => method.classList.remove('active'));
+                    document.getElementById(button.dataset.method).classList.add('active');
+                    updateResults(0.00, 0.00);
+                });
+            });
+
+            document.getElementById('calculate1').addEventListener('click', calculatePercentage1);
+            document.getElementById('calculate2').addEventListener('click', calculatePercentage2);
+            document.getElementById('addSemester').addEventListener('click', addSemesterRow);
+            document.getElementById('resetButton').addEventListener('click', clearAllFields);
+
+            // Initial two semesters for 'Advance' mode
+            addSemesterRow();
+            addSemesterRow();
+            
+            // Toggle functionality for FAQ items
+            const faqItems = document.querySelectorAll('.faq-item');
+            faqItems.forEach(item => {
+                const header = item.querySelector('h3');
+                const paragraph = item.querySelector('p');
+                // Set initial state to open
+                paragraph.style.maxHeight = paragraph.scrollHeight + 'px';
+                header.addEventListener('click', () => {
+                    if (paragraph.style.maxHeight === '0px') {
+                        paragraph.style.maxHeight = paragraph.scrollHeight + 'px';
+                    } else {
+                        paragraph.style.maxHeight = '0';
+                    }
+                });
+            });
+        });
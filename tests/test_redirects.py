@@ -0,0 +1,46 @@
+import pytest
+
+from redirects import RedirectLoopError
+
+
+@pytest.fixture(scope='module')
+def table():
+    from app import app, redirect_table
+    # Boot warm-up compiles it; compile again in case warm-up runs in the background
+    redirect_table.compile()
+    return app, redirect_table
+
+
+def test_table_is_not_empty(table):
+    _, redirect_table = table
+    assert len(redirect_table) > 0
+
+
+def test_every_target_is_a_page(table):
+    app, redirect_table = table
+    client = app.test_client()
+    for source, target in redirect_table.table.items():
+        response = client.get(target)
+        assert response.status_code == 200, f'{source} -> {target} returns {response.status_code}'
+
+
+def test_every_redirect_is_one_hop(table):
+    app, redirect_table = table
+    client = app.test_client()
+    for url in sorted(set(redirect_table.candidate_urls()) | set(redirect_table.table)):
+        try:
+            _, target, final_status, hops = redirect_table.follow(client, url)
+        except RedirectLoopError as e:
+            pytest.fail(f'{url}: redirect loop ({e})')
+        assert hops <= 1, f'{url}: {hops} hops to {target}'
+        if hops == 1:
+            assert final_status == 200, f'{url} redirects to {target} which returns {final_status}'
+
+
+def test_compiled_source_answers_with_single_301(table):
+    app, redirect_table = table
+    client = app.test_client()
+    for source, target in redirect_table.table.items():
+        response = client.get(source)
+        assert response.status_code == 301
+        assert response.headers['Location'] == target
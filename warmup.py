@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+
+from flask import jsonify
+from jinja2 import FileSystemBytecodeCache, TemplateError
+
+
+# --- Template precompilation + readiness ---
+# Opt-in (TEMPLATE_PRECOMPILE): every template under templates/ is compiled at boot, with
+# Jinja's compiled bytecode kept on disk (TEMPLATE_CACHE_DIR), so a fresh worker loads
+# marshalled code instead of parsing ~118 large templates on its first requests.
+#   TEMPLATE_PRECOMPILE = True          compile during boot, before the app serves
+#   TEMPLATE_PRECOMPILE = 'background'  compile in a thread, the worker serves meanwhile
+# GET /readyz answers 503 until every warm-up step is finished, then 200 - point the
+# load balancer / k8s readiness probe at it.
+
+TEMPLATE_EXTENSIONS = ('.html', '.xml', '.txt')
+
+
+class CountingBytecodeCache(FileSystemBytecodeCache):
+    def __init__(self, directory):
+        super().__init__(directory)
+        self.hits = 0
+        self.misses = 0
+
+    def load_bytecode(self, bucket):
+        super().load_bytecode(bucket)
+        if bucket.code is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+
+
+class Warmup:
+    def __init__(self, app=None):
+        self.app = None
+        self.ready = False
+        self.bytecode_cache = None
+        self.stats = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('TEMPLATE_PRECOMPILE', False)
+        app.config.setdefault('TEMPLATE_CACHE_DIR', os.path.join(app.instance_path, 'jinja-cache'))
+        self.app = app
+        app.extensions['warmup'] = self
+        app.add_url_rule('/readyz', endpoint='readyz', view_func=self.readyz)
+        # Has to be in place before the first template is loaded
+        if app.config['TEMPLATE_PRECOMPILE']:
+            self._install_bytecode_cache()
+
+    def _install_bytecode_cache(self):
+        directory = self.app.config['TEMPLATE_CACHE_DIR']
+        try:
+            os.makedirs(directory, exist_ok=True)
+        except OSError as e:
+            # Read-only deploys still precompile, just without the disk cache
+            self.app.logger.warning('Template bytecode cache disabled: %s', e)
+            return
+        self.bytecode_cache = CountingBytecodeCache(directory)
+        self.app.jinja_env.bytecode_cache = self.bytecode_cache
+
+    def precompile(self):
+        env = self.app.jinja_env
+        start = time.perf_counter()
+        names = env.list_templates(filter_func=lambda name: name.endswith(TEMPLATE_EXTENSIONS))
+        errors = 0
+        for name in names:
+            try:
+                env.get_template(name)
+            except TemplateError as e:
+                errors += 1
+                self.app.logger.error('Template %s failed to compile: %s', name, e)
+        elapsed = time.perf_counter() - start
+        cache = self.bytecode_cache
+        self.stats = {
+            'templates': len(names),
+            'errors': errors,
+            'compileSeconds': round(elapsed, 3),
+            'bytecodeHits': cache.hits if cache else 0,
+            'bytecodeMisses': cache.misses if cache else 0,
+        }
+        self.app.logger.info('Templates precompiled: %d in %.2fs (%d from bytecode cache)',
+                             len(names), elapsed, self.stats['bytecodeHits'])
+        return self.stats
+
+    def _run(self, steps):
+        for step in steps:
+            step()
+        self.ready = True
+
+    def start(self, *steps):
+        # steps: extra warm-up callables (page cache, ...) that run after precompilation
+        mode = self.app.config['TEMPLATE_PRECOMPILE']
+        if mode:
+            steps = (self.precompile,) + steps
+        if mode == 'background':
+            threading.Thread(target=self._run, args=(steps,), name='warmup', daemon=True).start()
+        else:
+            self._run(steps)
+
+    def readyz(self):
+        response = jsonify({'status': 'ready' if self.ready else 'warming', **self.stats})
+        response.status_code = 200 if self.ready else 503
+        response.cache_control.no_store = True
+        return response